@@ -0,0 +1,83 @@
+"""
+Author: Plantius (https://github.com/Plantius)
+Filename: ./benchmarks/bench_network.py
+Last Edited: 2026-10-19
+
+This module is part of the MC Modpack Creator project. For more details, visit:
+https://github.com/Plantius/mc_modpack_creator
+"""
+from argparse import ArgumentParser
+from benchmarks.mock_modrinth import MockModrinth
+from mc_mp.modpack.modpack import Modpack
+from mc_mp.modpack.project import Project
+from mc_mp.modpack.project_api import ProjectAPI
+from mc_mp.metrics import REGISTRY
+import mc_mp.standard as std
+import asyncio
+import os
+import tempfile
+import time
+
+# Game version and loader of the benchmarked pack
+MC_VERSION = "1.20.1"
+LOADER = "fabric"
+
+def build_project(server: MockModrinth, mods: int) -> Project:
+    """
+    Builds a project holding the oldest fabric 1.20.1 version of the first mock projects that have one.
+
+    Mock versions list a few random game versions, so projects without a matching version are skipped.
+    """
+    project = Project()
+    project.modpack = Modpack(title="Network benchmark", mc_version=MC_VERSION, mod_loader=LOADER)
+    project.metadata.update({"loaded": True, "saved": False, "project_id": std.generate_project_id()})
+    for info in server.projects.values():
+        matching = [server.versions[id] for id in info["versions"]
+                    if LOADER in server.versions[id]["loaders"] and MC_VERSION in server.versions[id]["game_versions"]]
+        if matching:
+            project.add_mod(info["title"], matching[0], info)
+        if len(project.modpack.mod_data) == mods:
+            break
+    return project
+
+async def bench(name: str, coro) -> None:
+    start = time.perf_counter()
+    await coro
+    print(f"{name:<24} {(time.perf_counter() - start) * 1000:10.2f} ms")
+
+async def run(args) -> None:
+    async with MockModrinth(projects=args.mods * 4, latency=args.latency, jitter=args.jitter,
+                            bandwidth=args.bandwidth, rate_limit=args.rate_limit,
+                            failure_rate=args.failure_rate, jar_size=args.jar_size) as server:
+        ProjectAPI.api_base = server.api_base
+        project = build_project(server, args.mods)
+        ids = [m.project_id for m in project.modpack.mod_data]
+        print(f"{len(ids)} mods against {server.api_base}")
+
+        await ProjectAPI.clear_caches()
+        await bench("fetch_mods_by_ids", project.fetch_mods_by_ids(ids))
+        await ProjectAPI.clear_caches()
+        await bench("update_mods_to_latest", project.update_mods_to_latest())
+        with tempfile.TemporaryDirectory(prefix="mc_mp_bench_") as tmp:
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            try:
+                await bench("download_mods", project.download_mods("mods"))
+            finally:
+                os.chdir(cwd)
+        await ProjectAPI.close_session()
+        print(f"Server requests: {dict(server.requests)}")
+    if args.metrics:
+        print(REGISTRY.summary())
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Benchmarks network bound project operations against a local mock of Modrinth.")
+    parser.add_argument("--mods", type=int, default=100, help="Mods in the benchmarked pack")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Maximum random seconds added to the latency")
+    parser.add_argument("--bandwidth", type=float, default=None, help="Download cap in bytes per second")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--jar-size", type=int, default=256 * 1024, help="Size of every jar in bytes")
+    parser.add_argument("--metrics", action="store_true", help="Print the collected metrics")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,199 @@
+"""
+Author: Plantius (https://github.com/Plantius)
+Filename: ./benchmarks/bench_project.py
+Last Edited: 2026-10-19
+
+This module is part of the MC Modpack Creator project. For more details, visit:
+https://github.com/Plantius/mc_modpack_creator
+"""
+from argparse import ArgumentParser
+from benchmarks.packs import generate_project
+from mc_mp.constants import FINGERPRINT_EXT
+from mc_mp.modpack.project import Project
+from typing import Callable, Dict, Optional, Tuple
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import tempfile
+import time
+
+SIZES = (100, 1000, 10000)
+REPEAT = 5
+# Mod IDs looked up per is_mod_installed measurement
+LOOKUPS = 100
+# Slowdown against the baseline reported as a regression, after scaling by the calibration case
+THRESHOLD = 1.25
+# Cases whose baseline is faster than this are compared but never reported, timer noise dominates them
+MIN_COMPARED = 0.005
+# Items of the calibration workload, sized to take tens of milliseconds
+CALIBRATION_ITEMS = 20000
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+def case_load_project(ctx: dict) -> None:
+    ctx["loop"].run_until_complete(Project().load_project(ctx["file"]))
+
+def case_save_project(ctx: dict) -> None:
+    ctx["loop"].run_until_complete(ctx["project"].save_project(os.path.join(ctx["dir"], "save")))
+
+def case_export_json(ctx: dict) -> None:
+    ctx["project"].modpack.export_json()
+
+def setup_sort_mods(ctx: dict) -> None:
+    ctx["rng"].shuffle(ctx["project"].modpack.mod_data)
+
+def case_sort_mods(ctx: dict) -> None:
+    ctx["project"].modpack.sort_mods()
+
+def case_is_mod_installed(ctx: dict) -> None:
+    for project_id in ctx["lookups"]:
+        ctx["project"].is_mod_installed(project_id)
+
+def setup_list_mods(ctx: dict) -> None:
+    # Listing after a change is the common case, so the cached views are rebuilt
+    ctx["project"].modpack.mark_changed()
+
+def case_list_mods(ctx: dict) -> None:
+    ctx["project"].list_mods()
+
+def setup_export_modpack(ctx: dict) -> None:
+    # Without the fingerprint the archive is rebuilt instead of reused
+    path = os.path.join(ctx["dir"], f"export.mrpack{FINGERPRINT_EXT}")
+    if os.path.exists(path):
+        os.remove(path)
+
+def case_export_modpack(ctx: dict) -> None:
+    ctx["loop"].run_until_complete(ctx["project"].export_modpack(os.path.join(ctx["dir"], "export")))
+
+def setup_calibration(ctx: dict) -> None:
+    if "calibration_items" not in ctx:
+        rng = random.Random(0)
+        ctx["calibration_items"] = [{"id": f"{rng.getrandbits(32):08x}", "title": f"Mod {i}",
+                                     "versions": ["1.20.1", "1.21"]} for i in range(CALIBRATION_ITEMS)]
+
+def case_calibration(ctx: dict) -> None:
+    # Fixed work that does not touch this project: serializing, parsing and sorting plain dictionaries
+    sorted(json.loads(json.dumps(ctx["calibration_items"])), key=lambda item: item["id"])
+
+# Case name to (setup run before every measurement, measured function)
+CASES: Dict[str, Tuple[Optional[Callable[[dict], None]], Callable[[dict], None]]] = {
+    # Runs first for every size, results are compared relative to its fastest run
+    "calibration": (setup_calibration, case_calibration),
+    "load_project": (None, case_load_project),
+    "save_project": (None, case_save_project),
+    "export_json": (None, case_export_json),
+    "sort_mods": (setup_sort_mods, case_sort_mods),
+    "is_mod_installed": (None, case_is_mod_installed),
+    "list_mods": (setup_list_mods, case_list_mods),
+    "export_modpack": (setup_export_modpack, case_export_modpack),
+    "export_modpack_unchanged": (None, case_export_modpack)
+}
+
+def measure(ctx: dict, setup: Optional[Callable[[dict], None]], run: Callable[[dict], None],
+            repeat: int) -> Dict[str, float]:
+    """
+    Times a case several times after one warm-up run, excluding its setup.
+
+    Returns:
+        Dict[str, float]: The fastest and the median duration in seconds.
+    """
+    durations = []
+    for _ in range(repeat + 1):
+        if setup is not None:
+            setup(ctx)
+        start = time.perf_counter()
+        run(ctx)
+        durations.append(time.perf_counter() - start)
+    durations = durations[1:]
+    return {"min": round(min(durations), 6), "median": round(statistics.median(durations), 6)}
+
+def run_benchmarks(sizes=SIZES, cases=tuple(CASES), repeat: int = REPEAT) -> Dict[str, Dict[str, float]]:
+    """
+    Runs the calibration case and the selected cases on a synthetic pack of every size.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Results keyed by "case[size]".
+    """
+    results = {}
+    loop = asyncio.new_event_loop()
+    try:
+        for size in sizes:
+            with tempfile.TemporaryDirectory(prefix="mc_mp_bench_") as tmp:
+                project = generate_project(size)
+                loop.run_until_complete(project.save_project(os.path.join(tmp, "pack")))
+                rng = random.Random(size)
+                ctx = {
+                    "loop": loop,
+                    "dir": tmp,
+                    "file": os.path.join(tmp, "pack.modpack"),
+                    "project": project,
+                    "rng": rng,
+                    "lookups": [m.project_id for m in rng.choices(project.modpack.mod_data, k=LOOKUPS)]
+                }
+                for name in ["calibration"] + [case for case in cases if case != "calibration"]:
+                    setup, run = CASES[name]
+                    key = f"{name}[{size}]"
+                    results[key] = measure(ctx, setup, run, repeat)
+                    print(f"{key:<28} min {results[key]['min'] * 1000:10.2f} ms  "
+                          f"median {results[key]['median'] * 1000:10.2f} ms")
+    finally:
+        loop.close()
+    return results
+
+def calibration_speed(results: Dict[str, Dict[str, float]]) -> Optional[float]:
+    """Returns the fastest calibration run over all sizes, spread over the run so a busy moment does not skew it."""
+    durations = [result["min"] for key, result in results.items() if key.startswith("calibration[")]
+    return min(durations) if durations else None
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            threshold: float = THRESHOLD) -> list[str]:
+    """
+    Compares the fastest durations against a baseline, scaled by the calibration case of both runs so
+    a baseline from another machine stays comparable.
+
+    Cases whose baseline is under MIN_COMPARED are printed but never counted.
+
+    Returns:
+        list[str]: The cases that got slower than the threshold allows.
+    """
+    # Baselines without a calibration are compared in raw seconds
+    current, previous = calibration_speed(results), calibration_speed(baseline)
+    scale = previous / current if current and previous else 1.0
+    regressions = []
+    for key, result in results.items():
+        if key.startswith("calibration[") or key not in baseline or not baseline[key]["min"]:
+            continue
+        ratio = result["min"] * scale / baseline[key]["min"]
+        regressed = ratio > threshold and baseline[key]["min"] >= MIN_COMPARED
+        print(f"{key:<28} {ratio:6.2f}x baseline{'  REGRESSION' if regressed else ''}")
+        if regressed:
+            regressions.append(key)
+    return regressions
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Benchmarks project operations on synthetic packs.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="Pack sizes in mods")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES), help="Cases to run")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="Measurements per case")
+    parser.add_argument("--save", action="store_true", help=f"Store the results as the baseline in {BASELINE_FILE}")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Baseline file to compare against")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="Exit with an error if a case regressed, the comparison is only printed otherwise")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, args.cases, args.repeat)
+    if args.save:
+        with open(BASELINE_FILE, "w") as file:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), "results": results},
+                      file, indent=4, sort_keys=True)
+            file.write("\n")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file)["results"])
+        if regressions:
+            message = f"{len(regressions)} benchmark(s) slower than {THRESHOLD}x the baseline"
+            if args.fail_on_regression:
+                raise SystemExit(message)
+            print(message)
@@ -0,0 +1,65 @@
+"""
+Author: Plantius (https://github.com/Plantius)
+Filename: ./benchmarks/bench_version_index.py
+Last Edited: 2026-10-19
+
+This module is part of the MC Modpack Creator project. For more details, visit:
+https://github.com/Plantius/mc_modpack_creator
+"""
+from datetime import datetime, timedelta, timezone
+from dateutil import parser
+from mc_mp.modpack.version_index import VersionIndex
+import mc_mp.standard as std
+import random
+import time
+
+MODS = 500
+VERSIONS_PER_MOD = 20
+
+def generate_versions(mods: int = MODS, per_mod: int = VERSIONS_PER_MOD) -> list[dict]:
+    """Generates synthetic Modrinth version payloads in random order."""
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    versions = []
+    for m in range(mods):
+        for v in range(per_mod):
+            published = start + timedelta(days=random.randint(0, 1500), seconds=random.randint(0, 86400))
+            versions.append({
+                "id": f"V{m:04d}{v:03d}",
+                "project_id": f"P{m:04d}",
+                "version_number": f"{v // 10}.{v % 10}.{random.randint(0, 9)}",
+                "version_type": random.choice(["release", "release", "beta", "alpha"]),
+                "date_published": published.isoformat().replace("+00:00", "Z"),
+                "loaders": ["fabric"],
+                "game_versions": ["1.20.1"]
+            })
+    random.shuffle(versions)
+    return versions
+
+def latest_with_parser(versions: list[dict]) -> dict:
+    """Finds the newest version per project by parsing dates on every comparison."""
+    latest: dict = {}
+    for version in versions:
+        current = latest.get(version["project_id"])
+        if current is None or parser.parse(version["date_published"]) > parser.parse(current["date_published"]):
+            latest[version["project_id"]] = version
+    return latest
+
+def latest_with_index(index: VersionIndex) -> dict:
+    """Finds the newest version per project using the pre-parsed index."""
+    return {f"P{m:04d}": index.latest(f"P{m:04d}", min_type="alpha").data for m in range(MODS)}
+
+def bench(name: str, func, *args) -> float:
+    start = time.perf_counter()
+    result = func(*args)
+    duration = time.perf_counter() - start
+    print(f"{name:<24} {duration * 1000:10.2f} ms")
+    return result
+
+if __name__ == "__main__":
+    versions = generate_versions()
+    print(f"{len(versions)} versions over {MODS} projects")
+    expected = bench("dateutil parser", latest_with_parser, versions)
+    std.parse_timestamp.cache_clear()
+    index = bench("version index ingest", VersionIndex, versions)
+    result = bench("version index query", latest_with_index, index)
+    assert {k: v["id"] for k, v in expected.items()} == {k: v["id"] for k, v in result.items()}
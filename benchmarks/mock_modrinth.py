@@ -0,0 +1,338 @@
+"""
+Author: Plantius (https://github.com/Plantius)
+Filename: ./benchmarks/mock_modrinth.py
+Last Edited: 2026-10-19
+
+This module is part of the MC Modpack Creator project. For more details, visit:
+https://github.com/Plantius/mc_modpack_creator
+"""
+from aiohttp import web
+from argparse import ArgumentParser
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, List, Tuple
+import asyncio
+import hashlib
+import json
+import random
+import string
+
+LOADERS = ["fabric", "quilt", "forge", "neoforge"]
+GAME_VERSIONS = ["1.19.2", "1.19.4", "1.20", "1.20.1", "1.20.4", "1.21"]
+# Size of the chunks downloads are written in when the bandwidth is capped
+CHUNK_SIZE = 16 * 1024
+
+def random_id(rng: random.Random, length: int = 8) -> str:
+    """Returns a random Modrinth style base62 ID."""
+    return "".join(rng.choices(string.ascii_letters + string.digits, k=length))
+
+def jar_bytes(seed: int, size: int) -> bytes:
+    """Returns the deterministic content of a generated jar file."""
+    return random.Random(seed).randbytes(size)
+
+def json_query(request: web.Request, key: str, default=None):
+    """Reads a JSON encoded query argument, e.g. ids=["a","b"]."""
+    value = request.query.get(key)
+    if value is None:
+        return default
+    try:
+        return json.loads(value)
+    except ValueError:
+        raise web.HTTPBadRequest(text=f"Invalid JSON in query argument {key}")
+
+
+class MockModrinth:
+    """
+    A local stand-in for the Modrinth API serving generated projects, versions and jar files,
+    with injectable latency, bandwidth caps, rate limiting and failures.
+    """
+
+    def __init__(self, projects: int = 200, versions_per_project: int = 5, jar_size: int = 64 * 1024,
+                 latency: float = 0.0, jitter: float = 0.0, bandwidth: Optional[float] = None,
+                 rate_limit: float = 0.0, failure_rate: float = 0.0, seed: int = 0) -> None:
+        """
+        Initializes the server, fixtures are generated when it starts.
+
+        Args:
+            projects (int): Number of generated projects.
+            versions_per_project (int): Versions generated per project.
+            jar_size (int): Size of every generated jar in bytes.
+            latency (float): Seconds added to every response.
+            jitter (float): Maximum random seconds added on top of the latency.
+            bandwidth (Optional[float]): Download speed cap in bytes per second, unlimited when None.
+            rate_limit (float): Fraction of API requests answered with 429.
+            failure_rate (float): Fraction of API requests answered with 500.
+            seed (int): Random seed for the fixtures and the injected faults.
+        """
+        self.project_count = projects
+        self.versions_per_project = versions_per_project
+        self.jar_size = jar_size
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self.rate_limit = rate_limit
+        self.failure_rate = failure_rate
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self.requests: Counter = Counter()
+        self.projects: Dict[str, dict] = {}
+        self.versions: Dict[str, dict] = {}
+        self.files: Dict[str, Tuple[int, int]] = {}
+        self.hashes: Dict[str, Dict[str, str]] = {"sha1": {}, "sha512": {}}
+        self.base_url = ""
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def api_base(self) -> str:
+        """The URL to use as ProjectAPI.api_base."""
+        return f"{self.base_url}/v2"
+
+    def generate(self) -> None:
+        """
+        Generates the projects, versions and jar files served by the mock.
+        """
+        rng = random.Random(self.seed)
+        start = datetime(2021, 1, 1, tzinfo=timezone.utc)
+        for p in range(self.project_count):
+            project_id = random_id(rng)
+            slug = f"mock-mod-{p}"
+            loaders = rng.sample(LOADERS, k=rng.randint(1, 2))
+            versions = []
+            for v in range(self.versions_per_project):
+                version_id = random_id(rng)
+                version_number = f"{v // 10}.{v % 10}.{rng.randint(0, 9)}"
+                filename = f"{slug}-{version_number}.jar"
+                file_seed = rng.getrandbits(32)
+                content = jar_bytes(file_seed, self.jar_size)
+                hashes = {"sha1": hashlib.sha1(content).hexdigest(), "sha512": hashlib.sha512(content).hexdigest()}
+                self.files[f"{version_id}/{filename}"] = (file_seed, self.jar_size)
+                version = {
+                    "id": version_id,
+                    "project_id": project_id,
+                    "author_id": "mockauth",
+                    "name": f"{slug} {version_number}",
+                    "version_number": version_number,
+                    "changelog": f"Release {version_number} of {slug}",
+                    "dependencies": [],
+                    "game_versions": rng.sample(GAME_VERSIONS, k=rng.randint(1, 3)),
+                    "version_type": rng.choice(["release", "release", "beta", "alpha"]),
+                    "loaders": loaders,
+                    "featured": False,
+                    "status": "listed",
+                    "downloads": rng.randint(0, 100000),
+                    "date_published": (start + timedelta(days=30 * v, seconds=rng.randint(0, 86400))).isoformat().replace("+00:00", "Z"),
+                    "files": [{
+                        "hashes": hashes,
+                        "url": f"{self.base_url}/data/{project_id}/versions/{version_id}/{filename}",
+                        "filename": filename,
+                        "primary": True,
+                        "size": self.jar_size,
+                        "file_type": None
+                    }]
+                }
+                self.versions[version_id] = version
+                for algorithm, value in hashes.items():
+                    self.hashes[algorithm][value] = version_id
+                versions.append(version)
+            self.projects[project_id] = {
+                "id": project_id,
+                "slug": slug,
+                "project_type": "mod",
+                "title": f"Mock Mod {p}",
+                "description": f"Generated mod number {p} for offline benchmarks",
+                "categories": loaders,
+                "loaders": loaders,
+                "client_side": rng.choice(["required", "optional", "unsupported"]),
+                "server_side": rng.choice(["required", "optional", "unsupported"]),
+                "downloads": rng.randint(0, 1000000),
+                "game_versions": sorted({g for version in versions for g in version["game_versions"]}),
+                "versions": [version["id"] for version in versions],
+                "published": versions[0]["date_published"],
+                "updated": versions[-1]["date_published"]
+            }
+
+    def find_project(self, id_or_slug: str) -> dict:
+        """Returns a project by ID or slug, or answers 404."""
+        project = self.projects.get(id_or_slug)
+        if project is None:
+            project = next((p for p in self.projects.values() if p["slug"] == id_or_slug), None)
+        if project is None:
+            raise web.HTTPNotFound()
+        return project
+
+    @web.middleware
+    async def faults(self, request: web.Request, handler):
+        """Counts requests and injects latency, rate limiting and failures."""
+        resource = request.match_info.route.resource
+        self.requests[resource.canonical if resource is not None else request.path] += 1
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        if request.path.startswith("/v2/"):
+            if self.rate_limit and self._rng.random() < self.rate_limit:
+                self.requests["429"] += 1
+                return web.json_response({"error": "ratelimited"}, status=429,
+                                         headers={"Retry-After": "0", "X-Ratelimit-Remaining": "0"})
+            if self.failure_rate and self._rng.random() < self.failure_rate:
+                self.requests["500"] += 1
+                return web.json_response({"error": "injected failure"}, status=500)
+        return await handler(request)
+
+    async def get_project(self, request: web.Request) -> web.Response:
+        return web.json_response(self.find_project(request.match_info["id"]))
+
+    async def check_project(self, request: web.Request) -> web.Response:
+        return web.json_response({"id": self.find_project(request.match_info["id"])["id"]})
+
+    async def get_projects(self, request: web.Request) -> web.Response:
+        ids = json_query(request, "ids", [])
+        return web.json_response([self.projects[i] for i in ids if i in self.projects])
+
+    async def list_versions(self, request: web.Request) -> web.Response:
+        project = self.find_project(request.match_info["id"])
+        loaders = set(json_query(request, "loaders", []))
+        game_versions = set(json_query(request, "game_versions", []))
+        versions = [self.versions[v] for v in reversed(project["versions"])]
+        versions = [v for v in versions
+                    if (not loaders or loaders & set(v["loaders"]))
+                    and (not game_versions or game_versions & set(v["game_versions"]))]
+        return web.json_response(versions)
+
+    async def get_version(self, request: web.Request) -> web.Response:
+        version = self.versions.get(request.match_info["id"])
+        if version is None:
+            raise web.HTTPNotFound()
+        return web.json_response(version)
+
+    async def get_versions(self, request: web.Request) -> web.Response:
+        ids = json_query(request, "ids", [])
+        return web.json_response([self.versions[i] for i in ids if i in self.versions])
+
+    async def search(self, request: web.Request) -> web.Response:
+        query = request.query.get("query", "").lower()
+        facets: List[List[str]] = json_query(request, "facets", [])
+        offset = int(request.query.get("offset", 0))
+        limit = min(int(request.query.get("limit", 10)), 100)
+
+        def matches(project: dict) -> bool:
+            if query and query not in project["title"].lower() and query not in project["description"].lower():
+                return False
+            values = {"categories": project["categories"], "versions": project["game_versions"],
+                      "project_type": [project["project_type"]], "project_id": [project["id"]]}
+            # Facets are AND-ed lists of OR-ed "key:value" filters
+            return all(any(value in values.get(key, []) for key, _, value in (f.partition(":") for f in group))
+                       for group in facets)
+
+        found = [p for p in self.projects.values() if matches(p)]
+        hits = [{
+            "project_id": p["id"],
+            "slug": p["slug"],
+            "title": p["title"],
+            "description": p["description"],
+            "categories": p["categories"],
+            "versions": p["game_versions"],
+            "downloads": p["downloads"],
+            "project_type": p["project_type"],
+            "client_side": p["client_side"],
+            "server_side": p["server_side"],
+            "latest_version": p["versions"][-1],
+            "date_modified": p["updated"]
+        } for p in found[offset:offset + limit]]
+        return web.json_response({"hits": hits, "offset": offset, "limit": limit, "total_hits": len(found)})
+
+    async def version_files(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        index = self.hashes.get(data.get("algorithm", "sha1"), {})
+        return web.json_response({h: self.versions[index[h]] for h in data.get("hashes", []) if h in index})
+
+    async def download(self, request: web.Request) -> web.StreamResponse:
+        key = f'{request.match_info["version"]}/{request.match_info["filename"]}'
+        if key not in self.files:
+            raise web.HTTPNotFound()
+        content = jar_bytes(*self.files[key])
+        if not self.bandwidth:
+            return web.Response(body=content, content_type="application/java-archive")
+
+        response = web.StreamResponse(headers={"Content-Type": "application/java-archive"})
+        response.content_length = len(content)
+        await response.prepare(request)
+        for offset in range(0, len(content), CHUNK_SIZE):
+            chunk = content[offset:offset + CHUNK_SIZE]
+            await response.write(chunk)
+            await asyncio.sleep(len(chunk) / self.bandwidth)
+        await response.write_eof()
+        return response
+
+    def create_app(self) -> web.Application:
+        """Builds the aiohttp application with the Modrinth routes used by ProjectAPI."""
+        app = web.Application(middlewares=[self.faults])
+        app.router.add_get("/v2/project/{id}", self.get_project)
+        app.router.add_get("/v2/project/{id}/check", self.check_project)
+        app.router.add_get("/v2/project/{id}/version", self.list_versions)
+        app.router.add_get("/v2/projects", self.get_projects)
+        app.router.add_get("/v2/version/{id}", self.get_version)
+        app.router.add_get("/v2/versions", self.get_versions)
+        app.router.add_get("/v2/search", self.search)
+        app.router.add_post("/v2/version_files", self.version_files)
+        app.router.add_get("/data/{project}/versions/{version}/{filename}", self.download)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Starts serving and generates the fixtures.
+
+        Args:
+            host (str): Interface to bind to.
+            port (int): Port to listen on, 0 picks a free port.
+
+        Returns:
+            str: The API base URL.
+        """
+        self._runner = web.AppRunner(self.create_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_host, bound_port = self._runner.addresses[0][:2]
+        self.base_url = f"http://{bound_host}:{bound_port}"
+        self.generate()
+        return self.api_base
+
+    async def stop(self) -> None:
+        """Stops serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "MockModrinth":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+async def serve(args) -> None:
+    server = MockModrinth(projects=args.projects, latency=args.latency, jitter=args.jitter,
+                          bandwidth=args.bandwidth, rate_limit=args.rate_limit,
+                          failure_rate=args.failure_rate, seed=args.seed)
+    api_base = await server.start(args.host, args.port)
+    print(f"Serving {len(server.projects)} mock projects, run with MC_MP_API_BASE={api_base}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Serves a local mock of the Modrinth API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--projects", type=int, default=200, help="Number of generated projects")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum random seconds added to the latency")
+    parser.add_argument("--bandwidth", type=float, default=None, help="Download cap in bytes per second")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--seed", type=int, default=0)
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
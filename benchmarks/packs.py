@@ -0,0 +1,105 @@
+"""
+Author: Plantius (https://github.com/Plantius)
+Filename: ./benchmarks/packs.py
+Last Edited: 2026-10-19
+
+This module is part of the MC Modpack Creator project. For more details, visit:
+https://github.com/Plantius/mc_modpack_creator
+"""
+from datetime import datetime, timedelta, timezone
+from mc_mp.modpack.modpack import Modpack
+from mc_mp.modpack.project import Project
+import mc_mp.standard as std
+import random
+import string
+
+# Changelog lines of a typical Modrinth release, repeated to a realistic size
+CHANGELOG_LINES = [
+    "## Changes",
+    "- Fixed a crash when opening the config screen without a world loaded",
+    "- Improved chunk loading performance on servers with many players",
+    "- Updated translations (de_de, fr_fr, ja_jp, pt_br, zh_cn)",
+    "- Compatibility with the latest loader release",
+    "## Known issues",
+    "- Rendering glitches with some shader packs, see the issue tracker for details"
+]
+LOADERS = ["fabric", "quilt", "forge", "neoforge"]
+GAME_VERSIONS = ["1.19.2", "1.19.4", "1.20", "1.20.1", "1.20.4", "1.21"]
+
+def random_id(rng: random.Random, length: int = 8) -> str:
+    """Returns a random Modrinth style base62 ID."""
+    return "".join(rng.choices(string.ascii_letters + string.digits, k=length))
+
+def generate_mod_data(count: int, seed: int = 0) -> list[dict]:
+    """
+    Generates synthetic mods in the project file format with realistic payload sizes.
+
+    Args:
+        count (int): Number of mods.
+        seed (int): Random seed, the same seed always gives the same mods.
+
+    Returns:
+        list[dict]: The mods as stored in a project file.
+    """
+    rng = random.Random(seed)
+    start = datetime(2021, 1, 1, tzinfo=timezone.utc)
+    mods = []
+    for i in range(count):
+        project_id = random_id(rng)
+        version_id = random_id(rng)
+        version = f"{rng.randint(0, 5)}.{rng.randint(0, 20)}.{rng.randint(0, 9)}"
+        slug = f"mod-{i}"
+        files = [{
+            "hashes": {
+                "sha1": "%040x" % rng.getrandbits(160),
+                "sha512": "%0128x" % rng.getrandbits(512)
+            },
+            "url": f"https://cdn.modrinth.com/data/{project_id}/versions/{version_id}/{slug}-{version}.jar",
+            "filename": f"{slug}-{version}.jar",
+            "primary": primary,
+            "size": rng.randint(20_000, 5_000_000),
+            "file_type": None
+        } for primary in ([True, False] if rng.random() < 0.2 else [True])]
+        mods.append({
+            "title": f"Mod {i} {random_id(rng, 4)}",
+            "description": f"Adds {rng.randint(2, 200)} new blocks, items and mechanics to the game.",
+            "name": f"{slug} {version}",
+            "changelog": "\n".join(rng.choices(CHANGELOG_LINES, k=rng.randint(5, 40))),
+            "version_number": version,
+            "dependencies": [{
+                "version_id": None,
+                "project_id": random_id(rng),
+                "file_name": None,
+                "dependency_type": rng.choice(["required", "optional", "incompatible"])
+            } for _ in range(rng.randint(0, 3))],
+            "mc_versions": rng.sample(GAME_VERSIONS, k=rng.randint(1, 3)),
+            "version_type": rng.choice(["release", "release", "release", "beta", "alpha"]),
+            "mod_loaders": rng.sample(LOADERS, k=rng.randint(1, 2)),
+            "id": version_id,
+            "project_id": project_id,
+            "date_published": (start + timedelta(seconds=rng.randint(0, 4 * 365 * 86400))).isoformat().replace("+00:00", "Z"),
+            "files": files
+        })
+    return mods
+
+def generate_project(count: int, seed: int = 0) -> Project:
+    """
+    Builds a loaded project holding a synthetic pack.
+
+    Args:
+        count (int): Number of mods.
+        seed (int): Random seed.
+
+    Returns:
+        Project: The project, not saved to disk.
+    """
+    project = Project()
+    project.modpack = Modpack(title=f"Synthetic pack {count}", description="Benchmark modpack",
+                              mc_version="1.20.1", mod_loader="fabric", loader_version="0.16.0",
+                              mod_data=generate_mod_data(count, seed))
+    project.metadata.update({
+        "loaded": True,
+        "saved": False,
+        "project_id": std.generate_project_id()
+    })
+    return project
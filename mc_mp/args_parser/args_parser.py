@@ -7,6 +7,7 @@ This module is part of the MC Modpack Creator project. For more details, visit:
 https://github.com/Plantius/mc_modpack_creator
 """
 from argparse import ArgumentParser, Namespace
+from mc_mp.constants import WATCH_INTERVAL, SERVER_DIR
 
 def create_parser() -> ArgumentParser:
     """Creates and configures the ArgumentParser for command-line arguments."""
@@ -55,12 +56,143 @@ def create_parser() -> ArgumentParser:
         help="List all mods in the current project"
     )
     
+    # Update many projects at once
+    parser.add_argument(
+        "--fleet-update",
+        dest="fleet_update",
+        type=str,
+        nargs="*",
+        required=False,
+        help="Update the given project files, or all project files in the current directory, fetching shared mods once"
+    )
+
+    # Watch projects for new and removed mod versions
+    parser.add_argument(
+        "--watch",
+        dest="watch",
+        type=str,
+        nargs="*",
+        required=False,
+        help="Periodically check the given project files, or all project files in the current directory, for new and removed mod versions"
+    )
+
+    # Seconds between update checks
+    parser.add_argument(
+        "--watch-interval",
+        dest="watch_interval",
+        type=float,
+        default=WATCH_INTERVAL,
+        help=f"Seconds between update checks in watch mode (Default {WATCH_INTERVAL})"
+    )
+
+    # Apply new versions found while watching
+    parser.add_argument(
+        "--watch-apply",
+        dest="watch_apply",
+        action="store_true",
+        help="Update and save the watched projects when new versions are found"
+    )
+
+    # Export the loaded project
+    parser.add_argument(
+        "--export",
+        dest="export",
+        type=str,
+        required=False,
+        help="Export the loaded project, each target adds its own suffix and extension to this name"
+    )
+
+    # Formats to export to
+    parser.add_argument(
+        "--export-targets",
+        dest="export_targets",
+        type=str,
+        nargs="+",
+        choices=["mrpack", "packwiz", "curseforge", "server"],
+        default=["mrpack"],
+        help="Formats written by --export in one pass (Default mrpack)"
+    )
+
+    # Compare two packs
+    parser.add_argument(
+        "--diff",
+        dest="diff",
+        type=str,
+        nargs=2,
+        metavar=("OLD", "NEW"),
+        required=False,
+        help="Print the mods added, removed, updated and downgraded between two project files or .mrpack files"
+    )
+    parser.add_argument(
+        "--changelog",
+        dest="changelog",
+        action="store_true",
+        help="Include the changelogs of updated mods in the --diff output"
+    )
+
+    # Build dedicated server directories
+    parser.add_argument(
+        "--build-server",
+        dest="build_server",
+        type=str,
+        nargs="*",
+        required=False,
+        help="Build a server directory for the given project files, or all project files in the current directory"
+    )
+
+    # Directory the servers are built in
+    parser.add_argument(
+        "--server-dir",
+        dest="server_dir",
+        type=str,
+        default=SERVER_DIR,
+        help=f"Directory server directories are built in (Default {SERVER_DIR})"
+    )
+
+    # Check an install against a lockfile
+    parser.add_argument(
+        "--verify",
+        dest="verify",
+        type=str,
+        required=False,
+        help="Check the mod files of an install directory against the lockfile of the project loaded with -o, or of --lockfile"
+    )
+    parser.add_argument(
+        "--lockfile",
+        dest="lockfile",
+        type=str,
+        required=False,
+        help="Lockfile used by --verify instead of the loaded project"
+    )
+    parser.add_argument(
+        "--verify-server",
+        dest="verify_server",
+        action="store_true",
+        help="Skip client-only mods in --verify, for dedicated server installs"
+    )
+
     # Choose which UI to use
     parser.add_argument(
         "--ui",
         dest="ui",
         type=str,
-        help="User interface for Minecraft Modpack Creator. Options: none, cli, web (Default cli)"
+        help="User interface for Minecraft Modpack Creator. Options: none, cli, web, asgi (Default cli)"
+    )
+    
+    # Address the asgi server listens on
+    parser.add_argument(
+        "--host",
+        dest="host",
+        type=str,
+        default="127.0.0.1",
+        help="Host the asgi web server binds to (Default 127.0.0.1)"
+    )
+    parser.add_argument(
+        "--port",
+        dest="port",
+        type=int,
+        default=5000,
+        help="Port the asgi web server listens on (Default 5000)"
     )
     
     # Enable debug mode
@@ -71,6 +203,71 @@ def create_parser() -> ArgumentParser:
         help="Enables debug mode to display additional information."
     )
 
+    # Trace timed functions into a file
+    parser.add_argument(
+        "--profile",
+        dest="profile",
+        type=str,
+        required=False,
+        help="Trace function calls and write them to the given file, as JSONL if it ends in .jsonl, otherwise as a Chrome trace."
+    )
+
+    # Run under cProfile and write pstats output
+    parser.add_argument(
+        "--profile-cpu",
+        dest="profile_cpu",
+        type=str,
+        required=False,
+        help="Profile the whole run with cProfile, worker threads included, and write the pstats output to the given file."
+    )
+
+    # Run under tracemalloc
+    parser.add_argument(
+        "--profile-mem",
+        dest="profile_mem",
+        action="store_true",
+        help="Trace memory allocations and print the top allocation sites and peak memory on exit."
+    )
+
+    # Print collected metrics on exit
+    parser.add_argument(
+        "--metrics",
+        dest="metrics",
+        action="store_true",
+        help="Print a summary of request latencies, cache hit rates and downloads on exit."
+    )
+
+    # Record or replay Modrinth traffic
+    parser.add_argument(
+        "--record",
+        dest="record",
+        type=str,
+        required=False,
+        help="Record every Modrinth request and response to the given cassette archive."
+    )
+    parser.add_argument(
+        "--replay",
+        dest="replay",
+        type=str,
+        required=False,
+        help="Serve Modrinth requests from the given cassette archive instead of the network."
+    )
+    parser.add_argument(
+        "--replay-speed",
+        dest="replay_speed",
+        type=float,
+        default=1.0,
+        help="Replay timing factor, 1 keeps the recorded timing, 0 replays without delays (Default 1)."
+    )
+
+    # Work without network access
+    parser.add_argument(
+        "--offline",
+        dest="offline",
+        action="store_true",
+        help="Skip Modrinth requests and search the local index of previously fetched mods."
+    )
+
     return parser
 
 def parse_arguments() -> Namespace:
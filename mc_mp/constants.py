@@ -6,13 +6,32 @@ Last Edited: 2024-09-07
 This module is part of the MC Modpack Creator project. For more details, visit:
 https://github.com/Plantius/mc_modpack_creator
 """
+import os
+
 BUF_SIZE = 2 << 15
 MAX_WORKERS = 16
+# Maximum number of projects the web app keeps in memory
+MAX_LOADED_PROJECTS = 32
+# Background jobs run at the same time, and finished jobs kept for status queries
+MAX_JOB_WORKERS = 4
+MAX_KEPT_JOBS = 256
+# Requests the asgi server handles at the same time, each holds a thread while its view runs
+MAX_REQUEST_WORKERS = 32
 
 ALLOWED_CATEGORIES = ["forge", "fabric", "neoforge", "quilt", "liteloader"]
 
-# Base URL for Modrinth API
-API_BASE = 'https://api.modrinth.com/v2'
+# Base URL for Modrinth API, overridable to point at a mirror or a local mock server
+API_BASE = os.environ.get("MC_MP_API_BASE", 'https://api.modrinth.com/v2')
+# Retries of a rate limited (429) request, and the longest wait between them in seconds
+MAX_RETRIES = 3
+MAX_RETRY_DELAY = 60
+# Connections kept open by the shared HTTP session, and how long DNS lookups are reused
+MAX_CONNECTIONS = 32
+DNS_CACHE_TTL = 300
+# Number of hits requested per search page
+SEARCH_PAGE_SIZE = 100
+# Project IDs requested per /projects call
+PROJECTS_BATCH_SIZE = 100
 # Default request headers
 HEADERS = {
     'User-Agent': 'Plantius/mc_modpack_creator'
@@ -21,6 +40,16 @@ HEADERS = {
 DEF_FILENAME = "project_1.json"
 DEF_EXT = "modpack"
 PROJECT_DIR = "./mp"
+# Persistent cache directory and the offline search index inside it
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mc_mp")
+LOCAL_INDEX_FILE = "search_index.sqlite"
+# Update watch: state file, seconds between checks and the random spread of that interval
+WATCH_STATE_FILE = os.path.join(CACHE_DIR, "watch_state.json")
+WATCH_INTERVAL = 3600
+WATCH_JITTER = 0.1
+# Content addressed store of downloaded jars shared by all server builds, and where servers are built
+ARTIFACT_DIR = os.path.join(CACHE_DIR, "artifacts")
+SERVER_DIR = "./servers"
 
 # Indicates acceptance of a prompt
 ACCEPT = 'y'
@@ -32,9 +61,46 @@ FORMAT_VERSION = 1
 GAME = "minecraft"
 MOD_PATH = 'mods/'
 MR_INDEX = "modrinth.index.json"
+# Other export formats: packwiz pack format, CurseForge manifest and the folder non-CurseForge files ship in
+PACKWIZ_FORMAT = "packwiz:1.1.0"
+CF_MANIFEST = "manifest.json"
+OVERRIDES = "overrides"
+# Manifest kept next to an exported archive for incremental repacking, and threads compressing its files
+PACK_MANIFEST_EXT = ".manifest.json"
+PACK_WORKERS = os.cpu_count() or 4
+# Oldest and newest Python whose zipfile internals packing.write_raw is tested against, others recompress
+RAW_ZIP_VERSIONS = ((3, 9), (3, 13))
+# Timestamp of every archive entry so equal inputs give equal bytes, and the export input fingerprint
+# file kept next to an artifact (bump the version when the output of a writer changes)
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+FINGERPRINT_EXT = ".fingerprint.json"
+FINGERPRINT_VERSION = 1
+
+# Loader version manifests, cached on disk and revalidated once they are older than LOADER_META_TTL seconds
+LOADER_META_DIR = os.path.join(CACHE_DIR, "loader_meta")
+LOADER_META_TTL = 6 * 3600
+LOADER_MANIFESTS = {
+    "fabric": "https://meta.fabricmc.net/v2/versions",
+    "quilt": "https://meta.quiltmc.org/v3/versions",
+    "forge": "https://files.minecraftforge.net/net/minecraftforge/forge/promotions_slim.json",
+    "neoforge": "https://maven.neoforged.net/api/maven/versions/releases/net/neoforged/neoforge"
+}
+# Dependency names of the loaders in modrinth.index.json
+MRPACK_LOADERS = {
+    "fabric": "fabric-loader",
+    "quilt": "quilt-loader",
+    "forge": "forge",
+    "neoforge": "neoforge"
+}
+# Fabric server launcher, it downloads the vanilla server itself on first start
+FABRIC_SERVER_URL = "https://meta.fabricmc.net/v2/versions/loader/{mc_version}/{loader_version}/{installer_version}/server/jar"
+FABRIC_SERVER_JAR = "fabric-server-launch.jar"
 
-# Loader versions
-FABRIC_V = "0.16.0"
+# Lockfile written next to a saved project, and the file in a verified install that keeps the size,
+# mtime and SHA-512 of its mod files so unchanged files are not hashed again
+LOCK_EXT = ".lock.json"
+LOCK_VERSION = 1
+VERIFY_STATE = ".verify_state.json"
 
 # Clear screen
 CLEAR_SCREEN = False
@@ -7,11 +7,25 @@ This module is part of the MC Modpack Creator project. For more details, visit:
 https://github.com/Plantius/mc_modpack_creator
 """
 from mc_mp.modpack.project import Project
+from mc_mp.modpack.project_api import ProjectAPI
+from mc_mp.modpack.cassette import Cassette, RECORD, REPLAY
+from mc_mp.modpack.fleet import Fleet
+from mc_mp.modpack.watch import UpdateWatcher
+from mc_mp.modpack.server_pack import ServerPackBuilder
+from mc_mp.modpack.export import Exporter
+from mc_mp.modpack.diff import diff_packs, format_diff
+from mc_mp.modpack.lockfile import build_lock, load_lock, verify
+from mc_mp.constants import CACHE_DIR, LOCAL_INDEX_FILE
 from mc_mp.args_parser import args_parser
 from mc_mp.menu import main_menu
+from mc_mp.metrics import REGISTRY
+from mc_mp.tracing import TRACER
+from mc_mp import profiling
 import asyncio
+import os
 import mc_mp.standard as std
 from web_app.app import create_app, db
+from web_app.app.storage import upgrade_schema
 
 async def main():
     # Initialize project and flags
@@ -23,34 +37,116 @@ async def main():
     # Handle CLI commands
     if args.debug:
         std.set_debug_flag(args.debug)
-    if args.create_project and args.create_project:
-        p.create_project(args.create_project)
-        p.save_project()
-    if args.list_project and args.list_project:
-        print(*p.list_projects(), sep='\n')
-    if args.load_project and args.load_project:
-        await p.load_project(args.load_project)
-    if args.list_mods and args.list_mods:
-        print(*p.list_mods(), sep='\n')
-    if args.delete_project and args.delete_project:
-        p.delete_project(args.delete_project)
-        
-    # Initialize and display ui
-    if args.ui and args.ui == "cli":
-        menu = main_menu.Menu(p)
-        menu.status_bar = menu.get_entry_help
-        await menu.display()
-    elif args.ui and args.ui == "web":
-        app = create_app(project=p)
-        with app.app_context():
-            db.create_all()
-        app.run(debug=args.debug if args.debug else False)
-    elif args.ui and args.ui == "none":
-        pass 
-    else:
-        menu = main_menu.Menu(p)
-        menu.status_bar = menu.get_entry_help
-        await menu.display()
+    if args.profile:
+        TRACER.enable()
+    # Opened on first use, commands that never search or fetch do not touch the cache directory
+    ProjectAPI.local_index_path = os.path.join(CACHE_DIR, LOCAL_INDEX_FILE)
+    ProjectAPI.offline = args.offline
+    if args.replay:
+        ProjectAPI.cassette = Cassette(args.replay, REPLAY, speed=args.replay_speed)
+    elif args.record:
+        ProjectAPI.cassette = Cassette(args.record, RECORD)
+    # The cassette index is written on every exit, so interrupted recordings can still be replayed
+    try:
+        if args.create_project and args.create_project:
+            p.create_project(args.create_project)
+            p.save_project()
+        if args.list_project and args.list_project:
+            print(*p.list_projects(), sep='\n')
+        loaded = False
+        if args.load_project and args.load_project:
+            loaded = await p.load_project(args.load_project)
+        if args.list_mods and args.list_mods:
+            print(*p.list_mods(), sep='\n')
+        if args.delete_project and args.delete_project:
+            p.delete_project(args.delete_project)
+        if args.fleet_update is not None:
+            for filename, changes in (await Fleet(args.fleet_update).update()).items():
+                print(f"{filename}: {len(changes)} update(s)")
+                for change in changes:
+                    print(f"\t{change['title']}: {change['from']} -> {change['to']}")
+        if args.export:
+            for target, output in (await Exporter().export(p, args.export, args.export_targets)).items():
+                print(f"{target}: {output if output else 'failed'}")
+        if args.diff:
+            diff = await diff_packs(*args.diff, changelogs=args.changelog)
+            if diff is not None:
+                print(format_diff(diff, changelogs=args.changelog))
+        if args.build_server is not None:
+            for filename, built in (await ServerPackBuilder().build_many(args.build_server, args.server_dir)).items():
+                print(f"{filename}: {'built' if built else 'failed'}")
+        if args.verify and not (args.lockfile or loaded):
+            # Without a source the lock would be built from the empty default project
+            std.eprint("[ERROR] --verify needs a loaded project (-o) or a --lockfile.")
+        elif args.verify:
+            lock = load_lock(args.lockfile) if args.lockfile else build_lock(p.modpack)
+            if lock is not None:
+                report = verify(lock, args.verify, server=args.verify_server)
+                for label, names in (("missing", report.missing), ("mismatched", report.mismatched), ("extra", report.extra)):
+                    for name in names:
+                        print(f"{label}: {name}")
+                print(f"{len(report.ok)} ok, {report.hashed} file(s) hashed")
+        if args.watch is not None:
+            watcher = UpdateWatcher(args.watch, interval=args.watch_interval, apply=args.watch_apply)
+            try:
+                await watcher.run()
+            except asyncio.CancelledError:
+                # Ctrl-C ends the whole run instead of falling through to the menu
+                print("[INFO] Stopped watching.")
+                raise
+
+        # Initialize and display ui
+        if args.ui and args.ui == "cli":
+            menu = main_menu.Menu(p)
+            menu.status_bar = menu.get_entry_help
+            await menu.display()
+        elif args.ui and args.ui == "web":
+            app = create_app(project=p)
+            with app.app_context():
+                # Also adds the columns and indexes an existing database is missing
+                upgrade_schema(db.engine)
+            app.run(debug=args.debug if args.debug else False)
+            app.extensions['job_queue'].run_coroutine(ProjectAPI.close_session()).result()
+            app.extensions['job_queue'].shutdown()
+            await app.extensions['project_pool'].save_all()
+        elif args.ui and args.ui == "asgi":
+            # Serve through an ASGI server, async views share the job queue's loop and HTTP session
+            import uvicorn
+            from web_app.app.asgi import ThreadedWsgiToAsgi
+            app = create_app(project=p)
+            with app.app_context():
+                # Also adds the columns and indexes an existing database is missing
+                upgrade_schema(db.engine)
+            asgi_app = ThreadedWsgiToAsgi(app)
+            config = uvicorn.Config(asgi_app, host=args.host, port=args.port,
+                                    log_level="debug" if args.debug else "info")
+            await uvicorn.Server(config).serve()
+            asgi_app.shutdown()
+            app.extensions['job_queue'].run_coroutine(ProjectAPI.close_session()).result()
+            app.extensions['job_queue'].shutdown()
+            await app.extensions['project_pool'].save_all()
+        elif args.ui and args.ui == "none":
+            pass 
+        else:
+            menu = main_menu.Menu(p)
+            menu.status_bar = menu.get_entry_help
+            await menu.display()
+    finally:
+        await ProjectAPI.close_session()
+        if ProjectAPI.cassette is not None:
+            ProjectAPI.cassette.close()
+    if args.metrics:
+        print(REGISTRY.summary())
+    if args.profile:
+        TRACER.write(args.profile)
+    if TRACER.enabled:
+        print(TRACER.summary())
     
+def run():
+    # Profile the whole run, including the event loop, when asked to
+    args = args_parser.parse_arguments()
+    with profiling.capture(cpu_file=args.profile_cpu, memory=args.profile_mem):
+        asyncio.run(main())
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run()
\ No newline at end of file
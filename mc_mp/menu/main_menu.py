@@ -37,6 +37,7 @@ class Menu:
         self.help: list = help or []
         self.parent_menu: Menu = parent_menu
         self.menu_active = True
+        self._main_entries_loaded: Optional[bool] = None
         
         # Set this instance as the main menu instance if none exists
         if Menu.main_menu_instance is None:
@@ -65,8 +66,11 @@ class Menu:
     
     def get_main_menu_entries(self) -> None:
         """
-        Populate the main menu with available options.
+        Populate the main menu with available options, only rebuilding them when the loaded state changes.
         """
+        if self._main_entries_loaded == self.project.metadata["loaded"]:
+            return
+        self._main_entries_loaded = self.project.metadata["loaded"]
         self.menu_entries.clear()
         self.actions.clear()
         self.help.clear()
@@ -79,6 +83,7 @@ class Menu:
             self.add_option("List current mods", self.list_mods_action, "List all mods in the current project")
             self.add_option("Remove mod(s)", self.remove_mods_action, "Remove mods from the current project")
             self.add_option("Update mod(s)", self.update_mods_action, "Update mods in the current project")
+            self.add_option("Check compatibility", self.check_compatibility_action, "Show which Minecraft versions and loaders the current mods support")
             self.add_option("Export modpack", self.export_modpack_action, "Export the modpack into a mrpack file")
             self.add_option("Download mods", self.download_modpack_action, "Download all mods currently in the project")
             self.add_option("Change project settings", self.change_settings_menu, "Change the project's title, description, etc.")
@@ -89,7 +94,7 @@ class Menu:
         """
         Get description of a specific mod entry.
         """
-        index = std.get_index(self.project.modpack.get_mods_name_ver(), entry)
+        index = self.project.modpack.get_mod_index(entry)
         if index == -1:
             std.eprint("Could not find entry.")
             return entry
@@ -119,7 +124,8 @@ class Menu:
                 cursor_index=self.cursor_index,
                 status_bar=self.status_bar
             )
-            selected_index = terminal_menu.show()
+            # Shown from a thread so tasks on the loop, like search prefetches, run while the user browses
+            selected_index = await asyncio.to_thread(terminal_menu.show)
             if selected_index is not None:
                 await self.handle_selection(selected_index)
             else:
@@ -306,8 +312,7 @@ class Menu:
             "facets": [
                 [f"categories:{self.project.modpack.mod_loader}"],
                 [f"versions:{self.project.modpack.mc_version}"]
-            ],
-            "limit": 100
+            ]
         }
         inp = std.get_input("Do you want to enter additional facets? y/n: ") or 'n'
         if inp == ACCEPT:
@@ -321,34 +326,51 @@ class Menu:
             kwargs["facets"] = [[item] for facet in temp for item in facet] + [["project_type:mod"]]
         elif inp == QUIT:
             return OPEN
-        results = await self.project.search_mods(**kwargs)
+        pager = self.project.search_mods_paged(**kwargs)
+        # Pending prefetches are cancelled however the search ends
+        try:
+            if await pager.next_page():
+                await self.browse_search_results(pager)
+        finally:
+            pager.close()
+        return OPEN
+
+    async def browse_search_results(self, pager) -> None:
+        """
+        Show the results of a search page by page, adding the selected mods to the project.
+        """
+        def get_menu_entries():
+            # Offer the next page while the search has more results
+            return ["Select all"] + [f'{mod["title"]}: ' for mod in pager.hits] + (["[Load more results]"] if pager.has_more else [])
 
-        if not results:
-            return OPEN
         submenu = Menu(
                 project=self.project, 
                 title="Which entries do you want to add? Select one option to see its details.",
-                menu_entries=["Select all"]+[f'{mod["title"]}: ' for mod in results["hits"]],
+                menu_entries=get_menu_entries,  # Updatable
                 multi_select=True
             )
           
         async def handle_selection(selected_index):
             submenu.cursor_index = selected_index[0]
+            load_more = len(pager.hits) + 1
+            if load_more in selected_index:
+                await pager.next_page()
+                return
             if 0 in selected_index:
-                selected_index = np.arange(len(submenu.menu_entries)-1)
+                selected_index = np.arange(len(pager.hits))
             else:
                 selected_index = [i-1 for i in selected_index]
-            selected_mod_ids = [results["hits"][i]["project_id"] for i in selected_index if self.project.is_mod_installed(results["hits"][i]["project_id"]) == -1]
+            selected_mod_ids = [pager.hits[i]["project_id"] for i in selected_index if self.project.is_mod_installed(pager.hits[i]["project_id"]) == -1]
             if len(selected_index) == 1:
-                selected_mod = results["hits"][selected_index[0]]
-                if input(f'''{selected_mod["title"]} \nClient side: {selected_mod["client_side"]}\nServer side: {selected_mod["server_side"]}\n\n{selected_mod["description"]}\nLink to mod https://modrinth.com/mod/{selected_mod["slug"]}\n\tDo you want to add this mod to the current project? y/n ''') != ACCEPT:
+                selected_mod = pager.hits[selected_index[0]]
+                if await asyncio.to_thread(input, f'''{selected_mod["title"]} \nClient side: {selected_mod["client_side"]}\nServer side: {selected_mod["server_side"]}\n\n{selected_mod["description"]}\nLink to mod https://modrinth.com/mod/{selected_mod["slug"]}\n\tDo you want to add this mod to the current project? y/n ''') != ACCEPT:
                     return
 
+            await pager.wait_versions(selected_mod_ids)
             await self.add_mods_action(selected_mod_ids)
 
         submenu.handle_selection = handle_selection
         await submenu.display()
-        return OPEN
     
     async def update_mods_action(self) -> bool:
         """
@@ -398,10 +420,12 @@ class Menu:
                     continue
 
                 info_dict = info_dict_by_id[mod_id]
-                latest_version = info_dict.get("versions", [])[0]
+                latest_record = self.project.versions.latest(mod_id, self.project.modpack.mod_loader,
+                                                             self.project.modpack.mc_version, min_type="alpha")
+                latest_version = latest_record.data if latest_record else None
                 
                 if latest_version:
-                    if self.project.is_date_newer(latest_version["date_published"], mod_data.date_published):
+                    if self.project.versions.is_newer(latest_record, mod_data.date_published):
                         inp = std.get_input(f"New version available for {mod_data.title}. Upgrade? y/n {mod_data.version_number} -> {latest_version['version_number']} ") or 'y'
                         if inp == ACCEPT:
                             print(f"Updated {mod_data.project_id} - {mod_data.title}: {mod_data.version_number} -> {latest_version['version_number']}")
@@ -418,6 +442,30 @@ class Menu:
         return OPEN
 
     
+    async def check_compatibility_action(self) -> bool:
+        """
+        Show the best supported Minecraft version, per-loader coverage and blocking mods.
+        """
+        if not self.project.modpack.mod_data or not self.project.api.require_online("check compatibility"):
+            return OPEN  # Keep main menu open
+
+        matrix = await self.project.build_compatibility_matrix()
+        loader = self.project.modpack.mod_loader
+        print(f"Newest version supported by all mods ({loader}): {matrix.best_version(1.0, loader)}")
+        print(f"Newest version supported by 95% of mods ({loader}): {matrix.best_version(0.95, loader)}")
+
+        target = std.get_input("Enter a Minecraft version to check (empty to skip): ")
+        if not target or target == QUIT:
+            return OPEN
+        for name, fraction in matrix.loader_coverage(target).items():
+            print(f"{name}: {fraction:.1%}")
+        titles = {mod.project_id: mod.title for mod in self.project.modpack.mod_data}
+        blocking = matrix.blocking_mods(target, loader)
+        print(f"Mods blocking {target} ({loader}): {len(blocking)}")
+        print(*[f"\t{titles.get(id, id)}" for id in blocking], sep='\n')
+        std.get_input("Press enter to continue...")
+        return OPEN
+
     async def remove_mods_action(self) -> bool:
         """
         Display submenu for removing mods from the current project.
@@ -0,0 +1,336 @@
+"""
+Author: Plantius (https://github.com/Plantius)
+Filename: ./mc_mp/metrics.py
+Last Edited: 2026-10-19
+
+This module is part of the MC Modpack Creator project. For more details, visit:
+https://github.com/Plantius/mc_modpack_creator
+"""
+from typing import Dict, Tuple, List, Optional, Callable
+import bisect
+import functools
+import inspect
+import threading
+import time
+
+# Latency buckets in seconds, from a fast cache hit to a slow download
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def escape_label(value: str) -> str:
+    """Escapes a label value for the Prometheus text format."""
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    """Formats label names and values as a Prometheus label set, e.g. {endpoint="/search"}."""
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def format_value(value: float) -> str:
+    """Formats a sample value, whole numbers without a decimal point."""
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric:
+    """
+    Base class of a named metric with one time series per combination of label values.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()) -> None:
+        """
+        Initializes the metric.
+
+        Args:
+            name (str): Metric name, e.g. mc_mp_api_requests_total.
+            help (str): One line description.
+            labels (Tuple[str, ...]): Label names every sample is recorded with.
+        """
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        """Returns the label values in declaration order, missing labels are empty."""
+        return tuple(str(labels.get(name, "")) for name in self.labels)
+
+    def header(self) -> List[str]:
+        """Returns the HELP and TYPE lines of the metric."""
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    """A value that only goes up, e.g. the number of requests."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()) -> None:
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """
+        Increments the counter.
+
+        Args:
+            amount (float): Amount to add, must not be negative.
+            **labels: Label values of the series.
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        """Returns the current value of a series."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[Tuple[Tuple[str, ...], float]]:
+        """Returns (label values, value) for every series."""
+        with self._lock:
+            return sorted(self._values.items())
+
+    def render(self) -> List[str]:
+        """Returns the metric in Prometheus text format."""
+        return self.header() + [f"{self.name}{format_labels(self.labels, key)} {format_value(value)}"
+                                for key, value in self.samples()]
+
+    def summary(self) -> List[str]:
+        """Returns one human readable line per series."""
+        return [f"{self.name}{format_labels(self.labels, key)}: {format_value(value)}"
+                for key, value in self.samples()]
+
+
+class Gauge(Counter):
+    """A value that can go up and down, e.g. the number of loaded projects."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        """Sets a series to the given value."""
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        """Decrements a series."""
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """Counts observations, e.g. latencies, into cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per series: bucket counts (last one is +Inf), sum and count
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        """
+        Records an observation.
+
+        Args:
+            value (float): The observed value, e.g. seconds.
+            **labels: Label values of the series.
+        """
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def get(self, **labels) -> Tuple[float, int]:
+        """Returns the sum and count of a series."""
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return (series[1], series[2]) if series else (0.0, 0)
+
+    def quantile(self, q: float, **labels) -> float:
+        """
+        Estimates a quantile from the buckets, returning the upper bound of the bucket it falls in.
+
+        Args:
+            q (float): The quantile between 0 and 1.
+            **labels: Label values of the series.
+
+        Returns:
+            float: The estimated quantile, or 0.0 without observations.
+        """
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            if not series or not series[2]:
+                return 0.0
+            counts, total = list(series[0]), series[2]
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            seen += count
+            if seen >= q * total:
+                return bound
+        return float("inf")
+
+    def render(self) -> List[str]:
+        """Returns the metric in Prometheus text format."""
+        lines = self.header()
+        with self._lock:
+            series = sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self._series.items())
+        for key, (counts, total, count) in series:
+            cumulative = 0
+            for bound, bucket in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket
+                le = format_labels(self.labels, key, f'le="{format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(self.labels, key)} {format_value(total)}")
+            lines.append(f"{self.name}_count{format_labels(self.labels, key)} {count}")
+        return lines
+
+    def summary(self) -> List[str]:
+        """Returns one human readable line per series with count, mean and p95."""
+        with self._lock:
+            series = sorted((key, total, count) for key, (_, total, count) in self._series.items())
+        return [f"{self.name}{format_labels(self.labels, key)}: count={count} mean={total / count:.4f} "
+                f"p95<={format_value(self.quantile(0.95, **dict(zip(self.labels, key))))}"
+                for key, total, count in series if count]
+
+
+class MetricsRegistry:
+    """
+    Holds named metrics and exports them in Prometheus text format or as a summary.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, help: str, labels: Tuple[str, ...], **kwargs) -> Metric:
+        """Returns the metric with this name, creating it on first use."""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, labels, **kwargs)
+            elif type(metric) is not cls:
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help: str, labels: Tuple[str, ...] = ()) -> Counter:
+        """Returns the counter with this name, creating it on first use."""
+        return self._register(Counter, name, help, labels)
+
+    def gauge(self, name: str, help: str, labels: Tuple[str, ...] = ()) -> Gauge:
+        """Returns the gauge with this name, creating it on first use."""
+        return self._register(Gauge, name, help, labels)
+
+    def histogram(self, name: str, help: str, labels: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        """Returns the histogram with this name, creating it on first use."""
+        return self._register(Histogram, name, help, labels, buckets=buckets)
+
+    def get(self, name: str) -> Optional[Metric]:
+        """Returns a registered metric by name, or None."""
+        with self._lock:
+            return self._metrics.get(name)
+
+    def render(self) -> str:
+        """
+        Exports every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics, one sample per line.
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """
+        Returns a human readable dump of every metric that has samples.
+
+        Returns:
+            str: One line per series.
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines += metric.summary()
+        return "\n".join(lines)
+
+
+REGISTRY = MetricsRegistry()
+
+API_REQUESTS = REGISTRY.counter("mc_mp_api_requests_total", "Modrinth API requests by endpoint and status code.",
+                                ("endpoint", "status"))
+API_LATENCY = REGISTRY.histogram("mc_mp_api_request_seconds", "Modrinth API request latency by endpoint.",
+                                 ("endpoint",))
+API_RETRIES = REGISTRY.counter("mc_mp_api_retries_total", "Rate limited Modrinth API requests that were retried.",
+                               ("endpoint",))
+CACHE_LOOKUPS = REGISTRY.counter("mc_mp_cache_lookups_total", "Cache lookups by cache and result (hit or miss).",
+                                 ("cache", "result"))
+CACHE_EVICTIONS = REGISTRY.counter("mc_mp_cache_evictions_total", "Entries evicted from a cache.", ("cache",))
+LOADED_PROJECTS = REGISTRY.gauge("mc_mp_loaded_projects", "Projects kept in memory by the project pool.")
+DOWNLOAD_BYTES = REGISTRY.counter("mc_mp_download_bytes_total", "Bytes downloaded from mod file URLs.")
+DOWNLOAD_LATENCY = REGISTRY.histogram("mc_mp_download_seconds", "Duration of a single file download.")
+DOWNLOAD_THROUGHPUT = REGISTRY.gauge("mc_mp_download_throughput_bytes_per_second",
+                                     "Throughput of the most recent file download.")
+OPERATIONS = REGISTRY.histogram("mc_mp_project_operation_seconds", "Duration of project operations.",
+                                ("operation",))
+OPERATION_FAILURES = REGISTRY.counter("mc_mp_project_operation_failures_total",
+                                      "Project operations that raised or returned False.", ("operation",))
+
+def timed(operation: Optional[str] = None) -> Callable:
+    """
+    Decorator recording the duration and failures of a sync or async function as a project operation.
+
+    Args:
+        operation (Optional[str]): Operation label, defaults to the function name.
+
+    Returns:
+        Callable: The decorator.
+    """
+    def decorator(func):
+        name = operation or func.__name__
+
+        def record(start: float, failed: bool) -> None:
+            OPERATIONS.observe(time.perf_counter() - start, operation=name)
+            if failed:
+                OPERATION_FAILURES.inc(operation=name)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    result = await func(*args, **kwargs)
+                except BaseException:
+                    record(start, True)
+                    raise
+                record(start, result is False)
+                return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                record(start, True)
+                raise
+            record(start, result is False)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,137 @@
+"""
+Author: Plantius (https://github.com/Plantius)
+Filename: ./mc_mp/modpack/artifacts.py
+Last Edited: 2026-10-19
+
+This module is part of the MC Modpack Creator project. For more details, visit:
+https://github.com/Plantius/mc_modpack_creator
+"""
+from mc_mp.constants import ARTIFACT_DIR, MAX_WORKERS
+from mc_mp.metrics import CACHE_LOOKUPS, DOWNLOAD_BYTES, DOWNLOAD_LATENCY, DOWNLOAD_THROUGHPUT
+from mc_mp.modpack.project_api import ProjectAPI
+import mc_mp.standard as std
+from typing import Dict, Optional
+import asyncio
+import hashlib
+import os
+import shutil
+import time
+
+# Hash algorithms checked when the metadata provides them
+HASH_ALGORITHMS = ("sha1", "sha512")
+
+def verify(data: bytes, hashes: Dict[str, str]) -> bool:
+    """Checks downloaded data against every known hash, at least one must be given."""
+    known = {algo: value for algo, value in hashes.items() if algo in HASH_ALGORITHMS}
+    return bool(known) and all(hashlib.new(algo, data).hexdigest() == value for algo, value in known.items())
+
+def link(source: str, dest: str) -> None:
+    """
+    Hard links a cached artifact into place, copying when the file system cannot link.
+
+    Args:
+        source (str): The cached artifact.
+        dest (str): The path to place it at, replaced if it exists.
+    """
+    if os.path.lexists(dest):
+        os.remove(dest)
+    try:
+        os.link(source, dest)
+    except OSError:
+        shutil.copy2(source, dest)
+
+
+class ArtifactStore:
+    """
+    Content addressed cache of downloaded files shared by every build.
+
+    Files with known hashes are stored by their SHA-1, so a jar used by many packs is
+    downloaded and stored once. Concurrent requests for the same artifact share one download.
+    """
+
+    def __init__(self, root: str = ARTIFACT_DIR, max_workers: int = MAX_WORKERS) -> None:
+        """
+        Initializes the store.
+
+        Args:
+            root (str): Directory the artifacts are stored in.
+            max_workers (int): Downloads running at the same time.
+        """
+        self.root = root
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._pending: Dict[str, asyncio.Task] = {}
+
+    def path(self, key: str) -> str:
+        """Returns the storage path of an artifact key."""
+        return os.path.join(self.root, key[:2], key)
+
+    @staticmethod
+    def key(url: str, hashes: Optional[Dict[str, str]] = None) -> str:
+        """
+        Returns the key an artifact is stored under.
+
+        Args:
+            url (str): The download URL.
+            hashes (Optional[Dict[str, str]]): Known hashes of the file.
+
+        Returns:
+            str: The SHA-1 of the content if known, otherwise the SHA-1 of the URL.
+        """
+        if hashes and "sha1" in hashes:
+            return hashes["sha1"]
+        # Without hashes the URL must identify an immutable file, like a versioned loader jar
+        return f"url-{hashlib.sha1(url.encode('utf8')).hexdigest()}"
+
+    async def fetch(self, url: str, hashes: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """
+        Returns the cached path of an artifact, downloading and verifying it first if needed.
+
+        Args:
+            url (str): The download URL.
+            hashes (Optional[Dict[str, str]]): Known hashes of the file, checked before it is stored.
+
+        Returns:
+            Optional[str]: The path of the artifact, or None if it could not be downloaded or verified.
+        """
+        key = self.key(url, hashes)
+        path = self.path(key)
+        if os.path.exists(path):
+            CACHE_LOOKUPS.inc(cache="artifacts", result="hit")
+            return path
+        task = self._pending.get(key)
+        if task is None:
+            CACHE_LOOKUPS.inc(cache="artifacts", result="miss")
+            task = asyncio.ensure_future(self._download(url, hashes, path))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _download(self, url: str, hashes: Optional[Dict[str, str]], path: str) -> Optional[str]:
+        """Downloads an artifact and moves it into the store once verified."""
+        async with self._semaphore:
+            try:
+                start = time.perf_counter()
+                async with ProjectAPI.get_session().get(url) as response:
+                    if response.status != 200:
+                        std.eprint(f"[ERROR] Failed to download {url}: Status code {response.status}")
+                        return None
+                    data = await response.read()
+                duration = time.perf_counter() - start
+            except Exception as e:
+                std.eprint(f"[ERROR] Could not download {url}: {e}")
+                return None
+
+        DOWNLOAD_BYTES.inc(len(data))
+        DOWNLOAD_LATENCY.observe(duration)
+        DOWNLOAD_THROUGHPUT.set(len(data) / duration if duration > 0 else 0)
+        if hashes and not verify(data, hashes):
+            std.eprint(f"[ERROR] Wrong hash for file: {url}")
+            return None
+
+        # Written next to its final path and renamed, so the store never holds a partial file
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as file:
+            file.write(data)
+        os.replace(tmp, path)
+        return path
@@ -0,0 +1,245 @@
+"""
+Author: Plantius (https://github.com/Plantius)
+Filename: ./mc_mp/modpack/cassette.py
+Last Edited: 2026-10-19
+
+This module is part of the MC Modpack Creator project. For more details, visit:
+https://github.com/Plantius/mc_modpack_creator
+"""
+from aiohttp import ClientError
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Optional, Dict, Any, Deque, Tuple
+import asyncio
+import hashlib
+import json
+import threading
+import time
+import zipfile
+
+RECORD = "record"
+REPLAY = "replay"
+# Archive members: one JSON line per interaction, response bodies stored once per content hash
+INDEX_FILE = "interactions.jsonl"
+BODY_DIR = "bodies/"
+
+def request_key(method: str, url: str, params: Any) -> Tuple[str, str, str]:
+    """Returns the key a request is recorded and looked up under."""
+    if isinstance(params, dict):
+        params = json.dumps(params, sort_keys=True)
+    return method.upper(), url, str(params or "")
+
+
+@dataclass
+class Interaction:
+    """
+    A recorded request and its response, the body is stored separately by hash.
+    """
+
+    method: str
+    url: str
+    params: str
+    status: int
+    headers: Dict[str, str]
+    body: str
+    started: float
+    elapsed: float
+
+
+class ReplayResponse:
+    """
+    Stands in for an aiohttp response, serving a recorded body.
+    """
+
+    def __init__(self, interaction: Interaction, body: bytes) -> None:
+        self.interaction = interaction
+        self.status = interaction.status
+        self.headers = interaction.headers
+        self._body = body
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise ClientError(f"{self.status}, recorded response for {self.interaction.url}")
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self) -> str:
+        return self._body.decode("utf8")
+
+    async def json(self) -> Any:
+        return json.loads(self._body)
+
+
+class _ReplayContext:
+    """Async context manager returned by `Cassette.get` in replay mode."""
+
+    def __init__(self, cassette: "Cassette", method: str, url: str, params: Any) -> None:
+        self.cassette = cassette
+        self.key = request_key(method, url, params)
+
+    async def __aenter__(self) -> ReplayResponse:
+        interaction, body = self.cassette.next_interaction(self.key)
+        if interaction is None:
+            raise ClientError(f"No recorded response for {self.key[0]} {self.key[1]} {self.key[2]}")
+        if self.cassette.speed > 0:
+            await asyncio.sleep(interaction.elapsed / self.cassette.speed)
+        return ReplayResponse(interaction, body)
+
+    async def __aexit__(self, *exc) -> bool:
+        return False
+
+
+class _RecordContext:
+    """Async context manager wrapping a real request and recording its response."""
+
+    def __init__(self, cassette: "Cassette", context, method: str, url: str, params: Any) -> None:
+        self.cassette = cassette
+        self.context = context
+        self.method = method
+        self.url = url
+        self.params = params
+
+    async def __aenter__(self):
+        start = time.perf_counter()
+        response = await self.context.__aenter__()
+        # aiohttp keeps the body after read(), so callers can still use json() or read()
+        body = await response.read()
+        self.cassette.record(self.method, self.url, self.params, response.status,
+                             dict(response.headers), body, start, time.perf_counter() - start)
+        return response
+
+    async def __aexit__(self, *exc) -> bool:
+        return await self.context.__aexit__(*exc)
+
+
+class RecordingSession:
+    """
+    Wraps a ClientSession so every GET request made through it is recorded.
+    """
+
+    def __init__(self, session, cassette: "Cassette") -> None:
+        self.session = session
+        self.cassette = cassette
+
+    def get(self, url: str, params: Any = None, **kwargs) -> _RecordContext:
+        return _RecordContext(self.cassette, self.session.get(url, params=params, **kwargs), "GET", url, params)
+
+    @property
+    def closed(self) -> bool:
+        return self.session.closed
+
+
+class Cassette:
+    """
+    Records Modrinth API traffic to a compressed archive, or replays it without network access.
+    """
+
+    def __init__(self, path: str, mode: str = REPLAY, speed: float = 1.0) -> None:
+        """
+        Opens a cassette archive.
+
+        Args:
+            path (str): The archive file.
+            mode (str): RECORD to write a new archive, REPLAY to serve an existing one.
+            speed (float): Replay speed factor, 1.0 keeps the recorded timing and 0 replays without delays.
+        """
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.speed = speed
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._interactions: list = []
+        self._bodies: set = set()
+        self._replay: Dict[Tuple[str, str, str], Deque[Interaction]] = {}
+        if mode == RECORD:
+            self._archive = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+        else:
+            self._archive = zipfile.ZipFile(path, "r")
+            with self._archive.open(INDEX_FILE) as index:
+                for line in index:
+                    interaction = Interaction(**json.loads(line))
+                    key = request_key(interaction.method, interaction.url, interaction.params)
+                    self._replay.setdefault(key, deque()).append(interaction)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._interactions) if self.mode == RECORD else sum(len(q) for q in self._replay.values())
+
+    def wrap(self, session) -> RecordingSession:
+        """
+        Wraps a real session so its requests are recorded.
+
+        Args:
+            session (ClientSession): The session doing the requests.
+
+        Returns:
+            RecordingSession: The wrapping session.
+        """
+        return RecordingSession(session, self)
+
+    def get(self, url: str, params: Any = None, **kwargs) -> _ReplayContext:
+        """Replays a GET request, usable in place of ClientSession.get."""
+        return _ReplayContext(self, "GET", url, params)
+
+    @property
+    def closed(self) -> bool:
+        return self._archive.fp is None
+
+    def record(self, method: str, url: str, params: Any, status: int, headers: Dict[str, str],
+               body: bytes, start: float, elapsed: float) -> None:
+        """
+        Adds an interaction to the archive, storing its body once per content hash.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The requested URL.
+            params (Any): The query parameters.
+            status (int): The response status.
+            headers (Dict[str, str]): The response headers.
+            body (bytes): The response body.
+            start (float): perf_counter value when the request was sent.
+            elapsed (float): Seconds until the body was received.
+        """
+        digest = hashlib.sha1(body).hexdigest()
+        _, _, params = request_key(method, url, params)
+        with self._lock:
+            if digest not in self._bodies:
+                self._archive.writestr(f"{BODY_DIR}{digest}", body)
+                self._bodies.add(digest)
+            self._interactions.append(Interaction(method.upper(), url, params, status, headers, digest,
+                                                  round(start - self._origin, 6), round(elapsed, 6)))
+
+    def next_interaction(self, key: Tuple[str, str, str]) -> Tuple[Optional[Interaction], bytes]:
+        """
+        Returns the next recorded response for a request, repeating the last one once all were served.
+
+        Args:
+            key (Tuple[str, str, str]): The request key from `request_key`.
+
+        Returns:
+            Tuple[Optional[Interaction], bytes]: The interaction and its body, or (None, b"") if never recorded.
+        """
+        with self._lock:
+            queue = self._replay.get(key)
+            if not queue:
+                return None, b""
+            interaction = queue.popleft() if len(queue) > 1 else queue[0]
+            return interaction, self._archive.read(f"{BODY_DIR}{interaction.body}")
+
+    def close(self) -> None:
+        """
+        Writes the interaction index of a recording and closes the archive.
+        """
+        with self._lock:
+            if self._archive.fp is None:
+                return
+            if self.mode == RECORD:
+                self._archive.writestr(INDEX_FILE, "".join(json.dumps(asdict(i)) + "\n" for i in self._interactions))
+            self._archive.close()
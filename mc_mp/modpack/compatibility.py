@@ -0,0 +1,135 @@
+"""
+Author: Plantius (https://github.com/Plantius)
+Filename: ./mc_mp/modpack/compatibility.py
+Last Edited: 2026-10-19
+
+This module is part of the MC Modpack Creator project. For more details, visit:
+https://github.com/Plantius/mc_modpack_creator
+"""
+import re
+import numpy as np
+from typing import Dict, List, Optional
+import mc_mp.standard as std
+
+# Matches full Minecraft releases (e.g. 1.20 or 1.20.1), excluding snapshots and pre-releases
+RELEASE_PATTERN = re.compile(r"^\d+\.\d+(\.\d+)?$")
+
+class CompatibilityMatrix:
+    """
+    Boolean matrix of mods x game versions x loaders, built once from the version lists of all mods.
+    """
+
+    def __init__(self, versions_by_mod: Dict[str, List[dict]]) -> None:
+        """
+        Builds the matrix from the unfiltered version lists of every mod.
+
+        Args:
+            versions_by_mod (Dict[str, List[dict]]): Version lists keyed by project ID.
+        """
+        self.mod_ids: List[str] = list(versions_by_mod.keys())
+        game_versions = {gv for versions in versions_by_mod.values() for v in versions for gv in v.get("game_versions", [])}
+        loaders = {ld for versions in versions_by_mod.values() for v in versions for ld in v.get("loaders", [])}
+        self.game_versions: List[str] = sorted(game_versions, key=std.version_key)
+        self.loaders: List[str] = sorted(loaders)
+
+        self._mod_index = {mod_id: i for i, mod_id in enumerate(self.mod_ids)}
+        self._gv_index = {gv: i for i, gv in enumerate(self.game_versions)}
+        self._loader_index = {ld: i for i, ld in enumerate(self.loaders)}
+
+        rows, cols, depths = [], [], []
+        for mod_id, versions in versions_by_mod.items():
+            row = self._mod_index[mod_id]
+            for version in versions:
+                gv_idx = [self._gv_index[gv] for gv in version.get("game_versions", [])]
+                ld_idx = [self._loader_index[ld] for ld in version.get("loaders", [])]
+                for g in gv_idx:
+                    rows.extend([row] * len(ld_idx))
+                    cols.extend([g] * len(ld_idx))
+                    depths.extend(ld_idx)
+
+        self.matrix = np.zeros((len(self.mod_ids), len(self.game_versions), len(self.loaders)), dtype=bool)
+        if rows:
+            self.matrix[np.array(rows), np.array(cols), np.array(depths)] = True
+
+    def _support(self, loader: Optional[str] = None) -> np.ndarray:
+        """
+        Returns the mods x game versions support matrix for one loader, or any loader if None.
+        """
+        if loader is None:
+            return self.matrix.any(axis=2)
+        if loader not in self._loader_index:
+            return np.zeros((len(self.mod_ids), len(self.game_versions)), dtype=bool)
+        return self.matrix[:, :, self._loader_index[loader]]
+
+    @std.sync_timing
+    def coverage(self, loader: Optional[str] = None) -> Dict[str, float]:
+        """
+        Computes the fraction of mods supporting each game version.
+
+        Args:
+            loader (Optional[str]): Only count versions for this loader.
+
+        Returns:
+            Dict[str, float]: Fraction of supported mods keyed by game version.
+        """
+        if not self.mod_ids:
+            return {gv: 1.0 for gv in self.game_versions}
+        fractions = self._support(loader).mean(axis=0)
+        return dict(zip(self.game_versions, fractions.tolist()))
+
+    @std.sync_timing
+    def best_version(self, threshold: float = 1.0, loader: Optional[str] = None, releases_only: bool = True) -> Optional[str]:
+        """
+        Finds the newest game version supported by at least `threshold` of the mods.
+
+        Args:
+            threshold (float): Minimum fraction of mods that must support the version.
+            loader (Optional[str]): Only count versions for this loader.
+            releases_only (bool): Skip snapshots and pre-releases.
+
+        Returns:
+            Optional[str]: The newest matching game version, or None if none qualifies.
+        """
+        if not self.mod_ids:
+            return None
+        fractions = self._support(loader).mean(axis=0)
+        candidates = fractions >= threshold
+        if releases_only:
+            candidates &= np.array([bool(RELEASE_PATTERN.match(gv)) for gv in self.game_versions], dtype=bool)
+        indices = np.flatnonzero(candidates)
+        if indices.size == 0:
+            return None
+        return self.game_versions[indices[-1]]
+
+    @std.sync_timing
+    def blocking_mods(self, game_version: str, loader: Optional[str] = None) -> List[str]:
+        """
+        Lists the mods that have no version for the given game version.
+
+        Args:
+            game_version (str): The Minecraft version to check.
+            loader (Optional[str]): Only count versions for this loader.
+
+        Returns:
+            List[str]: Project IDs of the mods without a compatible version.
+        """
+        if game_version not in self._gv_index:
+            return list(self.mod_ids)
+        supported = self._support(loader)[:, self._gv_index[game_version]]
+        return [self.mod_ids[i] for i in np.flatnonzero(~supported)]
+
+    @std.sync_timing
+    def loader_coverage(self, game_version: str) -> Dict[str, float]:
+        """
+        Computes the fraction of mods supporting the given game version per loader.
+
+        Args:
+            game_version (str): The Minecraft version to check.
+
+        Returns:
+            Dict[str, float]: Fraction of supported mods keyed by loader.
+        """
+        if game_version not in self._gv_index or not self.mod_ids:
+            return {ld: 0.0 for ld in self.loaders}
+        fractions = self.matrix[:, self._gv_index[game_version], :].mean(axis=0)
+        return dict(zip(self.loaders, fractions.tolist()))
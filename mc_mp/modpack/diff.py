@@ -0,0 +1,256 @@
+"""
+Author: Plantius (https://github.com/Plantius)
+Filename: ./mc_mp/modpack/diff.py
+Last Edited: 2026-10-19
+
+This module is part of the MC Modpack Creator project. For more details, visit:
+https://github.com/Plantius/mc_modpack_creator
+"""
+from mc_mp.constants import DEF_EXT, MR_INDEX, PROJECTS_BATCH_SIZE
+from mc_mp.modpack.project import Project
+from mc_mp.modpack.project_api import ProjectAPI
+import mc_mp.metrics as metrics
+import mc_mp.standard as std
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import asyncio
+import json
+import os
+import re
+import zipfile
+
+# Modrinth CDN downloads carry the project and version ID: /data/{project_id}/versions/{version_id}/{file}
+CDN_PATTERN = re.compile(r"/data/([A-Za-z0-9]+)/versions/([A-Za-z0-9]+)/")
+
+
+@dataclass
+class PackEntry:
+    """A mod of a pack as far as a diff needs it."""
+
+    project_id: str
+    version_id: str
+    title: str = ""
+    file_name: str = ""
+    version_number: str = ""
+    date_published: str = ""
+    changelog: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        """The mod title, or its file name for mods of a .mrpack."""
+        return self.title or self.file_name or self.project_id
+
+
+@dataclass
+class ModChange:
+    """A mod that differs between two packs, old or new is None for added or removed mods."""
+
+    project_id: str
+    old: Optional[PackEntry] = None
+    new: Optional[PackEntry] = None
+
+    @property
+    def title(self) -> str:
+        """The title of the mod, preferring a side that knows the project title."""
+        for entry in (self.new, self.old):
+            if entry is not None and entry.title:
+                return entry.title
+        return (self.new or self.old).label
+
+
+@dataclass
+class PackDiff:
+    """The mods added, removed, upgraded and downgraded between two packs."""
+
+    added: List[ModChange] = field(default_factory=list)
+    removed: List[ModChange] = field(default_factory=list)
+    upgraded: List[ModChange] = field(default_factory=list)
+    downgraded: List[ModChange] = field(default_factory=list)
+    unchanged: int = 0
+
+def entries_from_project(project: Project) -> Dict[str, PackEntry]:
+    """
+    Indexes the mods of a project by project ID.
+
+    Args:
+        project (Project): A loaded project.
+
+    Returns:
+        Dict[str, PackEntry]: The mods by project ID.
+    """
+    return {mod.project_id: PackEntry(mod.project_id, mod.id, mod.title, "", mod.version_number,
+                                      mod.date_published, mod.changelog)
+            for mod in project.modpack.mod_data}
+
+def entries_from_mrpack(index: dict) -> Dict[str, PackEntry]:
+    """
+    Indexes the files of a modrinth.index.json by project ID.
+
+    The IDs are taken from the Modrinth download URL, files hosted elsewhere are keyed by their path
+    and compared by their SHA-1.
+
+    Args:
+        index (dict): The parsed modrinth.index.json.
+
+    Returns:
+        Dict[str, PackEntry]: The mods by project ID.
+    """
+    entries = {}
+    for file in index.get("files", []):
+        name = file["path"].rsplit("/", 1)[-1]
+        match = next((m for m in (CDN_PATTERN.search(url) for url in file.get("downloads", [])) if m), None)
+        if match:
+            entries[match.group(1)] = PackEntry(match.group(1), match.group(2), file_name=name)
+        else:
+            entries[file["path"]] = PackEntry(file["path"], file.get("hashes", {}).get("sha1", ""), file_name=name)
+    return entries
+
+@std.async_timing
+async def load_entries(source: str) -> Optional[Dict[str, PackEntry]]:
+    """
+    Loads the mods of a project file or a .mrpack.
+
+    Args:
+        source (str): Path of a project file (the extension may be left out) or a .mrpack.
+
+    Returns:
+        Optional[Dict[str, PackEntry]]: The mods by project ID, or None if the pack could not be read.
+    """
+    if source.endswith(".mrpack"):
+        try:
+            with zipfile.ZipFile(source) as archive:
+                return entries_from_mrpack(json.loads(archive.read(MR_INDEX)))
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+            std.eprint(f"[ERROR] Could not read {source}: {e}")
+            return None
+    project = Project()
+    filename = source if os.path.exists(source) else f"{source}.{DEF_EXT}"
+    if not await project.load_project(filename):
+        std.eprint(f"[ERROR] Could not load project {source}.")
+        return None
+    return entries_from_project(project)
+
+def is_newer(new: PackEntry, old: PackEntry) -> bool:
+    """
+    Checks if a version is newer than another, by publication date when both are known
+    and by version number otherwise. Undecidable changes count as upgrades.
+    """
+    new_date, old_date = std.parse_timestamp(new.date_published), std.parse_timestamp(old.date_published)
+    if new_date and old_date and new_date != old_date:
+        return new_date > old_date
+    return std.version_key(new.version_number) >= std.version_key(old.version_number)
+
+@std.sync_timing
+def diff_entries(old: Dict[str, PackEntry], new: Dict[str, PackEntry]) -> PackDiff:
+    """
+    Compares two indexed packs in a single pass over each.
+
+    Args:
+        old (Dict[str, PackEntry]): Mods of the old pack by project ID.
+        new (Dict[str, PackEntry]): Mods of the new pack by project ID.
+
+    Returns:
+        PackDiff: The changes, each list sorted by title.
+    """
+    diff = PackDiff()
+    for project_id, entry in new.items():
+        previous = old.get(project_id)
+        if previous is None:
+            diff.added.append(ModChange(project_id, new=entry))
+        elif previous.version_id == entry.version_id:
+            diff.unchanged += 1
+        elif is_newer(entry, previous):
+            diff.upgraded.append(ModChange(project_id, previous, entry))
+        else:
+            diff.downgraded.append(ModChange(project_id, previous, entry))
+    diff.removed = [ModChange(project_id, old=entry) for project_id, entry in old.items() if project_id not in new]
+    for changes in (diff.added, diff.removed, diff.upgraded, diff.downgraded):
+        changes.sort(key=lambda change: change.title.lower())
+    return diff
+
+@std.async_timing
+async def fetch_versions(ids: List[str]) -> Dict[str, dict]:
+    """
+    Fetches versions by ID through the bulk versions endpoint, batches are sent concurrently.
+
+    Args:
+        ids (List[str]): Version IDs.
+
+    Returns:
+        Dict[str, dict]: The versions by ID, versions that could not be fetched are left out.
+    """
+    batches = [ids[i:i + PROJECTS_BATCH_SIZE] for i in range(0, len(ids), PROJECTS_BATCH_SIZE)]
+    results = await asyncio.gather(*[ProjectAPI.get_versions(ids=json.dumps(batch, separators=(",", ":")))
+                                     for batch in batches])
+    return {version["id"]: version for versions in results for version in (versions or []) if "id" in version}
+
+@std.async_timing
+@metrics.timed()
+async def diff_packs(old_source: str, new_source: str, changelogs: bool = False) -> Optional[PackDiff]:
+    """
+    Compares two packs, each a project file or a .mrpack.
+
+    Mods of a .mrpack only carry their version ID, so the versions of changed mods that lack a version
+    number or date are fetched in bulk. With changelogs, the changelogs of the new versions that are not
+    in the project file are part of that same fetch.
+
+    Args:
+        old_source (str): The old pack.
+        new_source (str): The new pack.
+        changelogs (bool): Fill in the changelog of every upgraded mod.
+
+    Returns:
+        Optional[PackDiff]: The changes, or None if a pack could not be read.
+    """
+    old, new = await asyncio.gather(load_entries(old_source), load_entries(new_source))
+    if old is None or new is None:
+        return None
+
+    # Only mods whose version changed need metadata, unchanged and added or removed mods are never fetched
+    missing = {}
+    for project_id, entry in new.items():
+        previous = old.get(project_id)
+        # Files hosted outside Modrinth are keyed by path and have no version to fetch
+        if previous is None or previous.version_id == entry.version_id or "/" in project_id:
+            continue
+        for side in (previous, entry):
+            if not side.version_number or (changelogs and side is entry and side.changelog is None):
+                missing.setdefault(side.version_id, []).append(side)
+    if missing:
+        versions = await fetch_versions(sorted(missing))
+        for version_id, version in versions.items():
+            for side in missing[version_id]:
+                side.version_number = side.version_number or version.get("version_number", "")
+                side.date_published = side.date_published or version.get("date_published", "")
+                if side.changelog is None:
+                    side.changelog = version.get("changelog")
+    return diff_entries(old, new)
+
+def format_diff(diff: PackDiff, changelogs: bool = False) -> str:
+    """
+    Formats a diff as Markdown release notes.
+
+    Args:
+        diff (PackDiff): The changes.
+        changelogs (bool): Include the changelog of every upgraded mod.
+
+    Returns:
+        str: The release notes.
+    """
+    lines = []
+    def section(name: str, changes: List[ModChange], describe) -> None:
+        if not changes:
+            return
+        lines.extend(["", f"### {name}"])
+        for change in changes:
+            lines.append(f"- {change.title} {describe(change)}".rstrip())
+            if changelogs and name == "Updated" and change.new.changelog:
+                lines.extend(f"  {line}".rstrip() for line in change.new.changelog.strip().splitlines())
+
+    section("Added", diff.added, lambda c: c.new.version_number)
+    section("Removed", diff.removed, lambda c: c.old.version_number)
+    section("Updated", diff.upgraded, lambda c: f"{c.old.version_number} -> {c.new.version_number}")
+    section("Downgraded", diff.downgraded, lambda c: f"{c.old.version_number} -> {c.new.version_number}")
+    summary = (f"{len(diff.added)} added, {len(diff.removed)} removed, {len(diff.upgraded)} updated, "
+               f"{len(diff.downgraded)} downgraded, {diff.unchanged} unchanged")
+    return "\n".join(["## Changes", summary] + lines)
@@ -0,0 +1,480 @@
+"""
+Author: Plantius (https://github.com/Plantius)
+Filename: ./mc_mp/modpack/export.py
+Last Edited: 2026-10-19
+
+This module is part of the MC Modpack Creator project. For more details, visit:
+https://github.com/Plantius/mc_modpack_creator
+"""
+from mc_mp.constants import (FORMAT_VERSION, GAME, MOD_PATH, MR_INDEX, MRPACK_LOADERS, PACKWIZ_FORMAT,
+                             CF_MANIFEST, OVERRIDES, FINGERPRINT_EXT, FINGERPRINT_VERSION)
+from mc_mp.modpack.artifacts import ArtifactStore
+from mc_mp.modpack.loader_meta import LOADER_META
+from mc_mp.modpack.packing import pack_zip, scan_tree
+import mc_mp.metrics as metrics
+import mc_mp.standard as std
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import html
+import json
+import os
+import re
+import shutil
+
+# Values of the client and server side of a mod
+SIDES = ("required", "optional", "unsupported")
+
+@dataclass
+class ExportFile:
+    """
+    The primary file of a mod, resolved once and shared by every export target.
+    """
+
+    project_id: str
+    version_id: str
+    title: str
+    filename: str
+    url: str
+    size: int
+    hashes: Dict[str, str]
+    client: str
+    server: str
+
+    @property
+    def path(self) -> str:
+        """Path of the file inside the instance."""
+        return f"{MOD_PATH}{self.filename}"
+
+
+@dataclass
+class ExportPlan:
+    """
+    Everything the export writers need, resolved from a project in one pass.
+    """
+
+    title: str
+    description: str
+    version: str
+    mc_version: str
+    mod_loader: str
+    loader_version: str
+    files: List[ExportFile] = field(default_factory=list)
+    # Override file path by archive name, under OVERRIDES
+    overrides: Dict[str, str] = field(default_factory=dict)
+
+    def server_files(self) -> List[ExportFile]:
+        """Returns the files a dedicated server needs."""
+        return [file for file in self.files if file.server != "unsupported"]
+
+
+@std.async_timing
+async def resolve_plan(project) -> Optional[ExportPlan]:
+    """
+    Resolves the loader version and the primary file of every mod of a project.
+
+    Args:
+        project (Project): The project to export.
+
+    Returns:
+        Optional[ExportPlan]: The plan, or None if no loader version is known for the pack.
+    """
+    modpack = project.modpack
+    loader_version = await project.get_loader_version()
+    if modpack.mod_loader not in MRPACK_LOADERS or loader_version is None:
+        std.eprint(f"[ERROR] No {modpack.mod_loader} version found for Minecraft {modpack.mc_version}")
+        return None
+
+    plan = ExportPlan(modpack.title, modpack.description, modpack.build_version, modpack.mc_version,
+                      modpack.mod_loader, loader_version)
+    if modpack.overrides:
+        plan.overrides = scan_tree(modpack.overrides, OVERRIDES)
+    for mod in modpack.mod_data:
+        primary = mod.primary_file()
+        if primary is None:
+            std.eprint(f"[ERROR] No primary file for mod: {mod.title}")
+            continue
+        # Per mod sides come from Modrinth, mods added before they were stored use the pack's sides
+        plan.files.append(ExportFile(
+            project_id=mod.project_id,
+            version_id=mod.id,
+            title=mod.title,
+            filename=primary["filename"],
+            url=primary["url"],
+            size=primary.get("size", 0),
+            hashes=primary["hashes"],
+            client=mod.client_side if mod.client_side in SIDES else modpack.client_side,
+            server=mod.server_side if mod.server_side in SIDES else modpack.server_side
+        ))
+    # Every writer follows this order, so equal packs give equal outputs
+    plan.files.sort(key=lambda file: file.path)
+    return plan
+
+def fingerprint(plan: ExportPlan) -> str:
+    """
+    Hashes every input of an export: the pack settings, the hashes of the mod files and the
+    size and mtime of the overrides.
+
+    Args:
+        plan (ExportPlan): The resolved export.
+
+    Returns:
+        str: The SHA-256 of the inputs.
+    """
+    # Field values are listed directly, asdict deep copies and is several times slower on large packs
+    inputs = {
+        "version": FINGERPRINT_VERSION,
+        "settings": [plan.title, plan.description, plan.version, plan.mc_version, plan.mod_loader, plan.loader_version],
+        "files": [list(vars(file).values()) for file in plan.files],
+        "overrides": {}
+    }
+    for name, path in plan.overrides.items():
+        stat = os.stat(path)
+        inputs["overrides"][name] = [stat.st_size, stat.st_mtime_ns]
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode("utf8")).hexdigest()
+
+def tree_state(directory: str) -> Dict[str, List[int]]:
+    """Returns the size and mtime of every file under a directory, by relative path."""
+    state = {}
+    for name, path in scan_tree(directory, ".").items():
+        stat = os.stat(path)
+        state[name] = [stat.st_size, stat.st_mtime_ns]
+    return state
+
+def is_current(output: str, digest: str) -> bool:
+    """
+    Checks if an output was built from inputs with the given fingerprint and was not changed since.
+    Archives are compared by size and mtime, directories by the size and mtime of every file in them.
+
+    Args:
+        output (str): The archive or directory.
+        digest (str): Fingerprint of the current inputs.
+
+    Returns:
+        bool: True if the output can be reused as is.
+    """
+    try:
+        with open(f"{output}{FINGERPRINT_EXT}", "r") as file:
+            recorded = json.load(file)
+        stat = os.stat(output)
+    except (OSError, ValueError):
+        return False
+    if recorded.get("fingerprint") != digest:
+        return False
+    if os.path.isdir(output):
+        return recorded.get("files") == tree_state(output)
+    return (recorded.get("size"), recorded.get("mtime_ns")) == (stat.st_size, stat.st_mtime_ns)
+
+def record_fingerprint(output: str, digest: str) -> None:
+    """
+    Stores the input fingerprint next to an output, with the SHA-256 of an archive for deduplication
+    or the state of every file of a directory.
+
+    Args:
+        output (str): The archive or directory.
+        digest (str): Fingerprint of the inputs it was built from.
+    """
+    record = {"fingerprint": digest}
+    if os.path.isfile(output):
+        stat = os.stat(output)
+        sha256 = hashlib.sha256()
+        with open(output, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                sha256.update(chunk)
+        record.update({"sha256": sha256.hexdigest(), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns})
+    elif os.path.isdir(output):
+        record["files"] = tree_state(output)
+    with open(f"{output}{FINGERPRINT_EXT}", "w") as file:
+        json.dump(record, file, indent=1, sort_keys=True)
+
+def mrpack_index(plan: ExportPlan) -> dict:
+    """Builds the modrinth.index.json of a plan."""
+    return {
+        "formatVersion": FORMAT_VERSION,
+        "game": GAME,
+        "versionId": plan.mc_version,
+        "name": plan.title,
+        "summary": plan.description,
+        "files": [{
+            "path": file.path,
+            "hashes": file.hashes,
+            "env": {"client": file.client, "server": file.server},
+            "downloads": [file.url],
+            "fileSize": file.size
+        } for file in plan.files],
+        "dependencies": {
+            "minecraft": plan.mc_version,
+            MRPACK_LOADERS[plan.mod_loader]: plan.loader_version
+        }
+    }
+
+def write_mrpack(plan: ExportPlan, filename: str) -> str:
+    """
+    Writes a Modrinth modpack with the overrides of the plan.
+
+    Args:
+        plan (ExportPlan): The resolved export.
+        filename (str): The output file without extension.
+
+    Returns:
+        str: The written file.
+    """
+    output = f"{filename}.mrpack"
+    # Without indent json uses its C encoder, several times faster on large packs
+    index = json.dumps(mrpack_index(plan), ensure_ascii=False, sort_keys=True).encode("utf8")
+    pack_zip(output, {MR_INDEX: index}, plan.overrides)
+    return output
+
+def toml_value(value) -> str:
+    """Formats a string, number or boolean as a TOML value, JSON string escapes are valid TOML."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return json.dumps(value)
+
+def toml_table(name: Optional[str], values: dict) -> str:
+    """Formats a TOML table, or top level keys if name is None."""
+    lines = [f"[{name}]"] if name else []
+    lines += [f"{key} = {toml_value(value)}" for key, value in values.items() if value is not None]
+    return "\n".join(lines) + "\n"
+
+def packwiz_side(file: ExportFile) -> str:
+    """Returns the packwiz side of a file."""
+    if file.server == "unsupported":
+        return "client"
+    if file.client == "unsupported":
+        return "server"
+    return "both"
+
+def slugify(title: str, fallback: str) -> str:
+    """Turns a title into a file name safe slug."""
+    return re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-") or fallback.lower()
+
+def write_packwiz(plan: ExportPlan, dest: str) -> str:
+    """
+    Writes a packwiz pack, one metadata file per mod plus the index and pack files.
+
+    Args:
+        plan (ExportPlan): The resolved export.
+        dest (str): The pack directory, created if needed.
+
+    Returns:
+        str: The pack directory.
+    """
+    os.makedirs(os.path.join(dest, MOD_PATH), exist_ok=True)
+    entries, files, used = [], [], set()
+    for file in plan.files:
+        slug = slugify(file.title, file.project_id)
+        while slug in used:
+            slug = f"{slug}-{file.project_id.lower()}"
+        used.add(slug)
+        metafile = f"{MOD_PATH}{slug}.pw.toml"
+        hash_format = "sha512" if "sha512" in file.hashes else "sha1"
+        content = "\n".join([
+            toml_table(None, {"name": file.title, "filename": file.filename, "side": packwiz_side(file)}),
+            toml_table("download", {"url": file.url, "hash-format": hash_format, "hash": file.hashes[hash_format]}),
+            toml_table("update.modrinth", {"mod-id": file.project_id, "version": file.version_id})
+        ])
+        with open(os.path.join(dest, metafile), "w", encoding="utf8") as out:
+            out.write(content)
+        entries.append((metafile, hashlib.sha256(content.encode("utf8")).hexdigest()))
+
+    # Overrides are placed in the pack itself, packwiz has no overrides folder. They are copied, not
+    # linked, so editing the exported pack never edits the project's files
+    for name, source in sorted(plan.overrides.items()):
+        path = name.split("/", 1)[1]
+        os.makedirs(os.path.dirname(os.path.join(dest, path)), exist_ok=True)
+        # A file linked by an earlier export is removed first, copying onto it would write through the link
+        if os.path.lexists(os.path.join(dest, path)):
+            os.remove(os.path.join(dest, path))
+        shutil.copy2(source, os.path.join(dest, path))
+        with open(source, "rb") as file:
+            files.append((path, hashlib.sha256(file.read()).hexdigest()))
+
+    index = toml_table(None, {"hash-format": "sha256"})
+    for path, digest in files:
+        index += "\n[[files]]\n" + toml_table(None, {"file": path, "hash": digest})
+    for path, digest in entries:
+        index += "\n[[files]]\n" + toml_table(None, {"file": path, "hash": digest, "metafile": True})
+    with open(os.path.join(dest, "index.toml"), "w", encoding="utf8") as out:
+        out.write(index)
+
+    pack = "\n".join([
+        toml_table(None, {"name": plan.title, "version": plan.version, "pack-format": PACKWIZ_FORMAT}),
+        toml_table("index", {"file": "index.toml", "hash-format": "sha256",
+                             "hash": hashlib.sha256(index.encode("utf8")).hexdigest()}),
+        toml_table("versions", {"minecraft": plan.mc_version, plan.mod_loader: plan.loader_version})
+    ])
+    with open(os.path.join(dest, "pack.toml"), "w", encoding="utf8") as out:
+        out.write(pack)
+    return dest
+
+def write_curseforge(plan: ExportPlan, filename: str, paths: Dict[str, str]) -> str:
+    """
+    Writes a CurseForge style modpack.
+
+    Modrinth files have no CurseForge project and file IDs, so the jars ship in the overrides
+    folder and the manifest only describes the game and loader.
+
+    Args:
+        plan (ExportPlan): The resolved export.
+        filename (str): The output file without extension.
+        paths (Dict[str, str]): Downloaded jar per file name.
+
+    Returns:
+        str: The written file.
+    """
+    manifest = {
+        "minecraft": {
+            "version": plan.mc_version,
+            "modLoaders": [{"id": f"{plan.mod_loader}-{plan.loader_version}", "primary": True}]
+        },
+        "manifestType": "minecraftModpack",
+        "manifestVersion": 1,
+        "name": plan.title,
+        "version": plan.version,
+        "author": "",
+        "files": [],
+        "overrides": OVERRIDES
+    }
+    modlist = "<ul>\n" + "".join(f"<li>{html.escape(file.title)}</li>\n" for file in plan.files) + "</ul>\n"
+    output = f"{filename}.zip"
+    members = {CF_MANIFEST: json.dumps(manifest, indent=3, ensure_ascii=False, sort_keys=True).encode("utf8"),
+               "modlist.html": modlist.encode("utf8")}
+    pack_zip(output, members, {**plan.overrides,
+                               **{f"{OVERRIDES}/{file.path}": paths[file.filename] for file in plan.files}})
+    return output
+
+def write_server_zip(plan: ExportPlan, filename: str, paths: Dict[str, str],
+                     launcher: Optional[Tuple[str, str]]) -> str:
+    """
+    Writes a zipped dedicated server with the server side mods and the loader launcher if there is one.
+
+    Args:
+        plan (ExportPlan): The resolved export.
+        filename (str): The output file without extension.
+        paths (Dict[str, str]): Downloaded jar per file name.
+        launcher (Optional[Tuple[str, str]]): Downloaded server launcher and its name in the server.
+
+    Returns:
+        str: The written file.
+    """
+    output = f"{filename}.zip"
+    files = {file.path: paths[file.filename] for file in plan.server_files()}
+    if launcher is not None:
+        files[launcher[1]] = launcher[0]
+    pack_zip(output, {}, files)
+    return output
+
+
+class Exporter:
+    """
+    Exports a project to several formats at once, resolving its files once and writing every target concurrently.
+    """
+
+    # Target name to the suffix and extension of its output
+    TARGETS = {
+        "mrpack": ("", ".mrpack"),
+        "packwiz": ("-packwiz", ""),
+        "curseforge": ("-curseforge", ".zip"),
+        "server": ("-server", ".zip")
+    }
+
+    def __init__(self, store: Optional[ArtifactStore] = None) -> None:
+        """
+        Initializes the exporter.
+
+        Args:
+            store (Optional[ArtifactStore]): Store jars are downloaded through for the targets that bundle them.
+        """
+        self.store = store if store is not None else ArtifactStore()
+
+    async def _download(self, files: List[ExportFile]) -> Optional[Dict[str, str]]:
+        """Downloads the given files once through the store, None if any fails."""
+        paths = await asyncio.gather(*[self.store.fetch(file.url, file.hashes) for file in files])
+        if any(path is None for path in paths):
+            return None
+        return {file.filename: path for file, path in zip(files, paths)}
+
+    async def _launcher(self, artifact: Optional[Tuple[str, str]]) -> Optional[Tuple[str, str]]:
+        """Downloads a resolved server launcher, None if the loader has none."""
+        if artifact is None:
+            return None
+        path = await self.store.fetch(artifact[0])
+        return (path, artifact[1]) if path is not None else None
+
+    async def _write(self, target: str, plan: ExportPlan, output: str, downloads: Optional[asyncio.Future],
+                     launcher: Optional[Tuple[str, str]] = None) -> Optional[str]:
+        """Writes one target, file writing runs in a thread so targets are written in parallel."""
+        if target == "mrpack":
+            return await asyncio.to_thread(write_mrpack, plan, output)
+        if target == "packwiz":
+            return await asyncio.to_thread(write_packwiz, plan, output)
+        paths = await downloads
+        if paths is None:
+            std.eprint(f"[ERROR] Could not download the files for the {target} export")
+            return None
+        if target == "curseforge":
+            return await asyncio.to_thread(write_curseforge, plan, output, paths)
+        return await asyncio.to_thread(write_server_zip, plan, output, paths, await self._launcher(launcher))
+
+    @std.async_timing
+    @metrics.timed()
+    async def export(self, project, filename: str, targets: Optional[List[str]] = None,
+                     force: bool = False) -> Dict[str, Optional[str]]:
+        """
+        Exports a project to the given targets, skipping outputs built from the same inputs.
+
+        Args:
+            project (Project): The project to export.
+            filename (str): Base name of the outputs, each target adds its own suffix and extension.
+            targets (Optional[List[str]]): Targets to write, all of them if None.
+            force (bool): Rebuild outputs even if their inputs did not change.
+
+        Returns:
+            Dict[str, Optional[str]]: The output per target, None for targets that failed.
+        """
+        targets = targets if targets else list(self.TARGETS)
+        plan = await resolve_plan(project)
+        if plan is None:
+            return {target: None for target in targets}
+
+        digest = await asyncio.to_thread(fingerprint, plan)
+        digests = {target: f"{digest}-{target}" for target in targets}
+        # The server also bundles the launcher, its URL carries the resolved installer version
+        launcher = None
+        if "server" in targets:
+            launcher = await LOADER_META.server_launcher(plan.mod_loader, plan.mc_version, plan.loader_version)
+            launcher_digest = hashlib.sha256(json.dumps([digest, launcher]).encode("utf8")).hexdigest()
+            digests["server"] = f"{launcher_digest}-server"
+        results: Dict[str, Optional[str]] = {}
+        stale = []
+        for target in targets:
+            suffix, extension = self.TARGETS[target]
+            output = f"{filename}{suffix}{extension}"
+            if not force and is_current(output, digests[target]):
+                results[target] = output
+            else:
+                stale.append(target)
+
+        # Jars are only needed by bundling targets, and downloaded once for all of them
+        downloads = None
+        if "curseforge" in stale:
+            downloads = asyncio.ensure_future(self._download(plan.files))
+        elif "server" in stale:
+            downloads = asyncio.ensure_future(self._download(plan.server_files()))
+
+        async def write(target: str) -> Optional[str]:
+            try:
+                output = await self._write(target, plan, f"{filename}{self.TARGETS[target][0]}", downloads, launcher)
+                if output is not None:
+                    await asyncio.to_thread(record_fingerprint, output, digests[target])
+                return output
+            except Exception as e:
+                std.eprint(f"[ERROR] Could not write the {target} export: {e}")
+                return None
+
+        results.update(zip(stale, await asyncio.gather(*[write(target) for target in stale])))
+        return {target: results[target] for target in targets}
@@ -0,0 +1,145 @@
+"""
+Author: Plantius (https://github.com/Plantius)
+Filename: ./mc_mp/modpack/fleet.py
+Last Edited: 2026-10-19
+
+This module is part of the MC Modpack Creator project. For more details, visit:
+https://github.com/Plantius/mc_modpack_creator
+"""
+from mc_mp.constants import MAX_WORKERS, PROJECTS_BATCH_SIZE
+from mc_mp.modpack.project import Project
+from mc_mp.modpack.project_api import ProjectAPI
+from mc_mp.modpack.version_index import VersionIndex
+import mc_mp.standard as std
+from typing import Dict, List, Optional, Tuple
+import asyncio
+
+class Fleet:
+    """
+    Updates many projects at once, fetching the metadata of every mod only once
+    no matter how many projects contain it.
+    """
+
+    def __init__(self, filenames: Optional[List[str]] = None) -> None:
+        """
+        Initializes the fleet.
+
+        Args:
+            filenames (Optional[List[str]]): Project files to update, all project files in the current directory if None.
+        """
+        self.filenames = filenames if filenames else std.get_project_files()
+        self.projects: Dict[str, Project] = {}
+        self.versions = VersionIndex()
+        self.api = ProjectAPI()
+        self._semaphore = asyncio.Semaphore(MAX_WORKERS)
+
+    @std.async_timing
+    async def load(self) -> Dict[str, Project]:
+        """
+        Loads all project files concurrently, skipping files that cannot be loaded.
+
+        Returns:
+            Dict[str, Project]: The loaded projects by filename.
+        """
+        async def load_one(filename: str) -> Tuple[str, Optional[Project]]:
+            project = Project()
+            if not await project.load_project(filename):
+                std.eprint(f"[ERROR] Could not load project: {filename}")
+                return filename, None
+            return filename, project
+
+        results = await asyncio.gather(*[load_one(filename) for filename in self.filenames])
+        self.projects = {filename: project for filename, project in results if project is not None}
+        return self.projects
+
+    def project_ids(self) -> List[str]:
+        """
+        Returns the union of the mods of all loaded projects.
+
+        Returns:
+            List[str]: Sorted unique project IDs.
+        """
+        return sorted({mod.project_id for project in self.projects.values() for mod in project.modpack.mod_data})
+
+    async def _limited(self, coro):
+        """Runs a request, at most MAX_WORKERS at the same time."""
+        async with self._semaphore:
+            return await coro
+
+    @std.async_timing
+    async def fetch_infos(self, ids: List[str]) -> Dict[str, dict]:
+        """
+        Fetches the project information of the given mods in batches.
+
+        Args:
+            ids (List[str]): Unique project IDs.
+
+        Returns:
+            Dict[str, dict]: Project information by project ID.
+        """
+        results = await asyncio.gather(*[self._limited(self.api.get_projects(ids=ids[i:i + PROJECTS_BATCH_SIZE]))
+                                         for i in range(0, len(ids), PROJECTS_BATCH_SIZE)])
+        return {info["id"]: info for infos in results for info in (infos or []) if "id" in info}
+
+    @std.async_timing
+    async def fetch_versions(self, ids: List[str]) -> None:
+        """
+        Fetches every version of the given mods once and adds them to the fleet's version index.
+
+        Args:
+            ids (List[str]): Unique project IDs.
+        """
+        # Versions are fetched unfiltered so one request serves every loader and Minecraft version in the fleet
+        results = await asyncio.gather(*[self._limited(self.api.list_versions(id=id)) for id in ids])
+        for versions in results:
+            self.versions.add(versions or [])
+
+    @std.async_timing
+    async def fetch(self, ids: List[str]) -> Dict[str, dict]:
+        """
+        Fetches every version and the project information of each mod once and indexes the versions.
+
+        Args:
+            ids (List[str]): Unique project IDs.
+
+        Returns:
+            Dict[str, dict]: Project information by project ID.
+        """
+        info_by_id, _ = await asyncio.gather(self.fetch_infos(ids), self.fetch_versions(ids))
+        return info_by_id
+
+    @std.async_timing
+    async def save(self, filenames: List[str]) -> None:
+        """
+        Saves the given loaded projects concurrently.
+
+        Args:
+            filenames (List[str]): Project files to save.
+        """
+        projects = [self.projects[filename] for filename in filenames]
+        results = await asyncio.gather(*[project.save_project(None) for project in projects])
+        for project, saved in zip(projects, results):
+            if not saved:
+                std.eprint(f"[ERROR] Could not save project: {project.metadata.get('filename')}")
+
+    @std.async_timing
+    async def update(self, save: bool = True) -> Dict[str, List[dict]]:
+        """
+        Loads the projects, updates each one for its own loader and Minecraft version and saves the changed ones.
+
+        Args:
+            save (bool): Save projects with updates concurrently.
+
+        Returns:
+            Dict[str, List[dict]]: The applied updates per project file.
+        """
+        if not self.api.require_online("update projects"):
+            return {}
+        await self.load()
+        info_by_id = await self.fetch(self.project_ids())
+
+        changes = {filename: project.apply_latest_versions(self.versions, info_by_id)
+                   for filename, project in self.projects.items()}
+        if save:
+            await self.save([filename for filename, updates in changes.items() if updates])
+        return changes
@@ -0,0 +1,261 @@
+"""
+Author: Plantius (https://github.com/Plantius)
+Filename: ./mc_mp/modpack/jobs.py
+Last Edited: 2026-10-19
+
+This module is part of the MC Modpack Creator project. For more details, visit:
+https://github.com/Plantius/mc_modpack_creator
+"""
+from mc_mp.constants import MAX_JOB_WORKERS, MAX_KEPT_JOBS
+import mc_mp.standard as std
+from dataclasses import dataclass, field
+from collections import OrderedDict
+from typing import Optional, Any, Callable, Awaitable, Coroutine, List
+from concurrent.futures import Future
+import contextvars
+import threading
+import asyncio
+import time
+import uuid
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+@dataclass
+class Job:
+    """
+    A unit of background work with its status, progress and result.
+    """
+
+    name: str
+    factory: Callable[["Job"], Awaitable[Any]] = field(repr=False)
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = QUEUED
+    progress: float = 0.0
+    result: Any = None
+    error: Optional[str] = None
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    _task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    def set_progress(self, done: int, total: int) -> None:
+        """
+        Records progress as a fraction of work done.
+
+        Args:
+            done (int): Units of work finished.
+            total (int): Total units of work.
+        """
+        self.progress = done / total if total else 1.0
+
+    def export_json(self) -> dict:
+        """
+        Exports the job's public state as a JSON-compatible dictionary.
+
+        Returns:
+            dict: The job's state.
+        """
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "progress": self.progress,
+            "result": self.result,
+            "error": self.error,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished
+        }
+
+
+class JobQueue:
+    """
+    Runs jobs on a bounded pool of workers inside a long-lived event loop on its own thread,
+    so callers from any thread or loop can submit, poll and cancel them.
+    """
+
+    def __init__(self, workers: int = MAX_JOB_WORKERS, max_jobs: int = MAX_KEPT_JOBS) -> None:
+        """
+        Initializes the queue, the worker thread is started on the first submit.
+
+        Args:
+            workers (int): Number of jobs that run at the same time.
+            max_jobs (int): Number of finished jobs kept for status queries.
+        """
+        self.workers = workers
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def start(self) -> None:
+        """
+        Starts the worker thread and its event loop if they are not running.
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            ready = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(ready,), name="mc_mp-jobs", daemon=True)
+            self._thread.start()
+        ready.wait()
+
+    def _run(self, ready: threading.Event) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue()
+        for _ in range(self.workers):
+            self._loop.create_task(self._worker())
+        self._loop.call_soon(ready.set)
+        self._loop.run_forever()
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            if job.status == CANCELLED:
+                continue
+            job.status = RUNNING
+            job.started = time.time()
+            job._task = asyncio.create_task(job.factory(job))
+            try:
+                job.result = await job._task
+                job.status = DONE
+                job.progress = 1.0
+            except asyncio.CancelledError:
+                job.status = CANCELLED
+                if self._stopping:
+                    raise
+            except Exception as e:
+                job.status = FAILED
+                job.error = f"{type(e).__name__}: {e}"
+                std.eprint(f"[ERROR] Job {job.name} ({job.id}) failed: {job.error}")
+            finally:
+                job.finished = time.time()
+                job._task = None
+
+    def _prune(self) -> None:
+        """
+        Drops the oldest finished jobs once more than max_jobs are kept.
+        """
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in FINISHED]
+        for job_id in finished[:max(len(self._jobs) - self.max_jobs, 0)]:
+            del self._jobs[job_id]
+
+    @std.sync_timing
+    def submit(self, name: str, factory: Callable[[Job], Awaitable[Any]]) -> Job:
+        """
+        Queues a job, safe to call from any thread.
+
+        Args:
+            name (str): Human readable job name.
+            factory (Callable[[Job], Awaitable[Any]]): Called with the job to create the coroutine to run.
+
+        Returns:
+            Job: The queued job.
+        """
+        self.start()
+        job = Job(name=name, factory=factory)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, job)
+        return job
+
+    def run_coroutine(self, coro: Coroutine, context: Optional[contextvars.Context] = None) -> Future:
+        """
+        Runs a coroutine on the worker loop next to the jobs, safe to call from any thread.
+
+        Args:
+            coro (Coroutine): The coroutine to run.
+            context (Optional[contextvars.Context]): Context the coroutine runs in, defaults to a copy of the caller's.
+
+        Returns:
+            Future: Resolves to the coroutine's result.
+        """
+        self.start()
+        context = context if context is not None else contextvars.copy_context()
+        future: Future = Future()
+
+        def copy_result(task: asyncio.Task) -> None:
+            if task.cancelled():
+                future.cancel()
+            elif task.exception() is not None:
+                future.set_exception(task.exception())
+            else:
+                future.set_result(task.result())
+
+        # Tasks copy the context that is current when they are created
+        def schedule() -> None:
+            task = context.run(self._loop.create_task, coro)
+            task.add_done_callback(copy_result)
+        self._loop.call_soon_threadsafe(schedule)
+        return future
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Returns a job by ID, or None if it is unknown."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[Job]:
+        """Returns all known jobs, oldest first."""
+        with self._lock:
+            return list(self._jobs.values())
+
+    @std.sync_timing
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancels a queued or running job.
+
+        Args:
+            job_id (str): The job ID.
+
+        Returns:
+            bool: True if the job was cancelled, otherwise False.
+        """
+        job = self.get(job_id)
+        if job is None or job.status in FINISHED:
+            return False
+
+        # Runs on the worker loop so it cannot race with a worker picking the job up
+        def cancel_job():
+            if job.status == QUEUED:
+                job.status = CANCELLED
+                job.finished = time.time()
+            elif job._task is not None:
+                job._task.cancel()
+        self._loop.call_soon_threadsafe(cancel_job)
+        return True
+
+    def shutdown(self) -> None:
+        """
+        Cancels every unfinished job and stops the worker loop.
+        """
+        if self._thread is None:
+            return
+        for job in self.list_jobs():
+            self.cancel(job.id)
+        asyncio.run_coroutine_threadsafe(self._stop(), self._loop)
+        self._thread.join(timeout=5)
+        self._loop.close()
+        self._thread = None
+        self._loop = None
+        self._stopping = False
+
+    async def _stop(self) -> None:
+        """
+        Cancels the workers and running jobs, then stops the loop.
+        """
+        self._stopping = True
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        asyncio.get_running_loop().stop()
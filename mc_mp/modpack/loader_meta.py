@@ -0,0 +1,256 @@
+"""
+Author: Plantius (https://github.com/Plantius)
+Filename: ./mc_mp/modpack/loader_meta.py
+Last Edited: 2026-10-19
+
+This module is part of the MC Modpack Creator project. For more details, visit:
+https://github.com/Plantius/mc_modpack_creator
+"""
+from mc_mp.constants import LOADER_MANIFESTS, LOADER_META_DIR, LOADER_META_TTL, FABRIC_SERVER_URL, FABRIC_SERVER_JAR
+from mc_mp.metrics import CACHE_LOOKUPS
+from mc_mp.modpack.project_api import ProjectAPI
+import mc_mp.standard as std
+from typing import Dict, Optional, Tuple
+import asyncio
+import json
+import os
+import time
+
+def is_stable(entry: dict) -> bool:
+    """Checks a Fabric or Quilt meta entry, Quilt has no stable flag and marks pre-releases in the version."""
+    return entry.get("stable", True) and "-" not in entry.get("version", "")
+
+def latest_version(versions) -> Optional[str]:
+    """Returns the highest of the given version strings, or None if there are none."""
+    return max(versions, key=std.version_key, default=None)
+
+def index_meta(data: dict) -> Dict[str, str]:
+    """
+    Indexes a Fabric or Quilt versions manifest.
+
+    The loader runs on every game version the manifest lists, so each maps to the latest stable loader.
+    """
+    loader = latest_version([entry["version"] for entry in data.get("loader", []) if is_stable(entry)])
+    if loader is None:
+        return {}
+    return {entry["version"]: loader for entry in data.get("game", [])}
+
+def index_forge(data: dict) -> Dict[str, str]:
+    """Indexes the Forge promotions, preferring the recommended build over the latest one."""
+    index: Dict[str, str] = {}
+    for key, version in data.get("promos", {}).items():
+        game, _, kind = key.rpartition("-")
+        if kind == "recommended" or (kind == "latest" and game not in index):
+            index[game] = version
+    return index
+
+def index_neoforge(data: dict) -> Dict[str, str]:
+    """
+    Indexes the NeoForge releases, whose versions encode the game version (21.1.x is 1.21.1, 21.0.x is 1.21).
+    """
+    by_game: Dict[str, list] = {}
+    for version in data.get("versions", []):
+        parts = version.split(".")
+        if "-" in version or len(parts) < 3:
+            continue
+        game = f"1.{parts[0]}" if parts[1] == "0" else f"1.{parts[0]}.{parts[1]}"
+        by_game.setdefault(game, []).append(version)
+    return {game: latest_version(versions) for game, versions in by_game.items()}
+
+# Loaders with a downloadable dedicated server launcher
+SERVER_LAUNCHERS = ("fabric",)
+# Builds the game version to loader version index of a manifest
+INDEXERS = {
+    "fabric": index_meta,
+    "quilt": index_meta,
+    "forge": index_forge,
+    "neoforge": index_neoforge
+}
+
+
+class LoaderMeta:
+    """
+    Loader version manifests cached on disk, revalidated with conditional requests once stale,
+    and indexed in memory by game version.
+    """
+
+    def __init__(self, cache_dir: str = LOADER_META_DIR, ttl: float = LOADER_META_TTL) -> None:
+        """
+        Initializes the metadata cache.
+
+        Args:
+            cache_dir (str): Directory the manifests are cached in.
+            ttl (float): Seconds a manifest is used before it is revalidated.
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self._entries: Dict[str, dict] = {}
+        self._indices: Dict[str, Dict[str, str]] = {}
+        # Last refresh attempt per loader, so an unreachable server is not asked on every export
+        self._checked: Dict[str, float] = {}
+        # Running fetch per loader, concurrent callers wait for it instead of reading a missing cache
+        self._pending: Dict[str, asyncio.Task] = {}
+
+    def path(self, loader: str) -> str:
+        """Returns the cache file of a loader's manifest."""
+        return os.path.join(self.cache_dir, f"{loader}.json")
+
+    def entry(self, loader: str) -> Optional[dict]:
+        """
+        Returns the cached manifest of a loader, reading it from disk the first time.
+
+        Args:
+            loader (str): The mod loader.
+
+        Returns:
+            Optional[dict]: The entry with the manifest under "data", or None if it was never fetched.
+        """
+        if loader not in self._entries:
+            try:
+                with open(self.path(loader), "r") as file:
+                    self._entries[loader] = json.load(file)
+            except (OSError, ValueError):
+                return None
+        return self._entries[loader]
+
+    def _store(self, loader: str, entry: dict) -> None:
+        """Keeps an entry in memory and writes it to disk atomically."""
+        self._entries[loader] = entry
+        self._indices.pop(loader, None)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{self.path(loader)}.tmp"
+            with open(tmp, "w") as file:
+                json.dump(entry, file)
+            os.replace(tmp, self.path(loader))
+        except OSError as e:
+            std.eprint(f"[ERROR] Could not cache {loader} versions: {e}")
+
+    def is_stale(self, loader: str) -> bool:
+        """Checks if a loader's manifest is missing or older than the TTL and was not checked recently."""
+        entry = self.entry(loader)
+        last = max(entry["fetched"] if entry else 0.0, self._checked.get(loader, 0.0))
+        return time.time() - last >= self.ttl
+
+    @std.async_timing
+    async def refresh(self, loader: str, force: bool = False) -> bool:
+        """
+        Revalidates a loader's manifest if it is stale, keeping the cached copy when the server cannot be reached.
+
+        Args:
+            loader (str): The mod loader.
+            force (bool): Revalidate even if the cached manifest is fresh.
+
+        Returns:
+            bool: True if a manifest is available afterwards, otherwise False.
+        """
+        if loader not in LOADER_MANIFESTS:
+            return False
+        task = self._pending.get(loader)
+        if task is None:
+            if not force and not self.is_stale(loader):
+                CACHE_LOOKUPS.inc(cache="loader_meta", result="hit")
+                return self.entry(loader) is not None
+            CACHE_LOOKUPS.inc(cache="loader_meta", result="miss")
+            if ProjectAPI.offline:
+                return self.entry(loader) is not None
+            task = asyncio.ensure_future(self._fetch(loader))
+            self._pending[loader] = task
+            task.add_done_callback(lambda _: self._pending.pop(loader, None))
+        await asyncio.shield(task)
+        return self.entry(loader) is not None
+
+    async def _fetch(self, loader: str) -> None:
+        """Fetches a loader's manifest, conditionally if a cached copy exists."""
+        self._checked[loader] = time.time()
+        entry = self.entry(loader)
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            async with ProjectAPI.get_session().get(LOADER_MANIFESTS[loader], headers=headers) as response:
+                if response.status == 304 and entry:
+                    self._store(loader, {**entry, "fetched": time.time()})
+                elif response.status == 200:
+                    self._store(loader, {
+                        "fetched": time.time(),
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                        "data": json.loads(await response.read())
+                    })
+                else:
+                    std.eprint(f"[ERROR] Could not fetch {loader} versions: Status code {response.status}")
+        except Exception as e:
+            std.eprint(f"[ERROR] Could not fetch {loader} versions: {e}")
+
+    def index(self, loader: str) -> Dict[str, str]:
+        """
+        Returns the latest stable loader version per game version from the cached manifest.
+
+        Args:
+            loader (str): The mod loader.
+
+        Returns:
+            Dict[str, str]: Loader versions by game version, empty if the manifest is not cached.
+        """
+        if loader not in self._indices:
+            entry = self.entry(loader)
+            if entry is None or loader not in INDEXERS:
+                return {}
+            self._indices[loader] = INDEXERS[loader](entry["data"])
+        return self._indices[loader]
+
+    async def latest(self, loader: str, mc_version: str) -> Optional[str]:
+        """
+        Returns the latest stable version of a loader for a Minecraft version.
+
+        Args:
+            loader (str): The mod loader.
+            mc_version (str): The Minecraft version.
+
+        Returns:
+            Optional[str]: The loader version, or None if the loader does not support the Minecraft version.
+        """
+        await self.refresh(loader)
+        return self.index(loader).get(mc_version)
+
+    async def installer(self, loader: str) -> Optional[str]:
+        """
+        Returns the latest stable installer version of Fabric or Quilt.
+
+        Args:
+            loader (str): The mod loader.
+
+        Returns:
+            Optional[str]: The installer version, or None if unknown.
+        """
+        await self.refresh(loader)
+        entry = self.entry(loader)
+        if entry is None:
+            return None
+        return latest_version([item["version"] for item in entry["data"].get("installer", []) if is_stable(item)])
+
+    async def server_launcher(self, loader: str, mc_version: str, loader_version: str) -> Optional[Tuple[str, str]]:
+        """
+        Returns the download URL and file name of a loader's dedicated server launcher.
+
+        Args:
+            loader (str): The mod loader.
+            mc_version (str): The Minecraft version.
+            loader_version (str): The loader version.
+
+        Returns:
+            Optional[Tuple[str, str]]: The URL and file name, or None if the loader has no downloadable server launcher.
+        """
+        if loader not in SERVER_LAUNCHERS:
+            return None
+        installer_version = await self.installer(loader)
+        if installer_version is None:
+            return None
+        return FABRIC_SERVER_URL.format(mc_version=mc_version, loader_version=loader_version,
+                                        installer_version=installer_version), FABRIC_SERVER_JAR
+
+
+LOADER_META = LoaderMeta()
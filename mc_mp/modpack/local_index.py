@@ -0,0 +1,228 @@
+"""
+Author: Plantius (https://github.com/Plantius)
+Filename: ./mc_mp/modpack/local_index.py
+Last Edited: 2026-10-19
+
+This module is part of the MC Modpack Creator project. For more details, visit:
+https://github.com/Plantius/mc_modpack_creator
+"""
+from mc_mp.constants import SEARCH_PAGE_SIZE
+import mc_mp.standard as std
+from typing import Optional, Dict, Any, List, Union
+import threading
+import sqlite3
+import json
+import os
+import re
+
+# Bumped when the layout changes, older index files are migrated when opened
+SCHEMA_VERSION = 2
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    project_id TEXT NOT NULL UNIQUE,
+    slug TEXT,
+    title TEXT,
+    description TEXT,
+    downloads INTEGER DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS facets (
+    facet TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    PRIMARY KEY (facet, project_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS facets_project ON facets (project_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+    slug, title, description, content='projects', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS projects_fts_insert AFTER INSERT ON projects BEGIN
+    INSERT INTO projects_fts (rowid, slug, title, description) VALUES (new.id, new.slug, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS projects_fts_delete AFTER DELETE ON projects BEGIN
+    INSERT INTO projects_fts (projects_fts, rowid, slug, title, description)
+    VALUES ('delete', old.id, old.slug, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS projects_fts_update AFTER UPDATE ON projects BEGIN
+    INSERT INTO projects_fts (projects_fts, rowid, slug, title, description)
+    VALUES ('delete', old.id, old.slug, old.title, old.description);
+    INSERT INTO projects_fts (rowid, slug, title, description) VALUES (new.id, new.slug, new.title, new.description);
+END;
+"""
+
+# Fields kept from project payloads, shaped like a Modrinth search hit
+HIT_FIELDS = ("project_id", "slug", "title", "description", "categories", "display_categories",
+              "versions", "project_type", "client_side", "server_side", "downloads", "icon_url",
+              "date_modified", "latest_version")
+
+class LocalIndex:
+    """
+    Offline full-text index over every project and version payload seen from the Modrinth API.
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        """
+        Opens (and creates if needed) the index database.
+
+        Args:
+            path (str): Path of the SQLite database file.
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+        self._conn.executescript(SCHEMA)
+        self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def _migrate(self) -> None:
+        """
+        Brings an index file of an older layout up to SCHEMA_VERSION.
+
+        Version 1 kept its own copy of every project in projects_fts, keyed on an unindexed project_id
+        column. The projects are copied into the new table, whose insert trigger fills the full-text index.
+        """
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(projects)")}
+        if version >= SCHEMA_VERSION or not columns:
+            return
+        self._conn.executescript(f"""
+            BEGIN;
+            DROP TABLE IF EXISTS projects_fts;
+            ALTER TABLE projects RENAME TO projects_v1;
+            {SCHEMA}
+            INSERT INTO projects (project_id, slug, title, description, downloads, data)
+            SELECT project_id, slug, title, json_extract(data, '$.description'), downloads, data FROM projects_v1;
+            DROP TABLE projects_v1;
+            PRAGMA user_version={SCHEMA_VERSION};
+            COMMIT;
+        """)
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _to_hit(project: dict) -> dict:
+        """
+        Converts a project payload (from /project(s) or /search) into the search hit format.
+        """
+        hit = {key: project[key] for key in HIT_FIELDS if key in project}
+        hit.setdefault("project_id", project.get("id"))
+        if "game_versions" in project:
+            # Project payloads list version IDs under "versions", hits list game versions
+            hit["versions"] = project["game_versions"]
+        if "loaders" in project:
+            hit["categories"] = sorted(set(project.get("categories", [])) | set(project["loaders"]))
+        return hit
+
+    @std.sync_timing
+    def add_projects(self, projects: List[dict]) -> None:
+        """
+        Inserts or updates project payloads or search hits.
+
+        The full-text index follows the projects table by ID through triggers. A payload lists every loader and
+        game version of its project, so the project's facets are replaced, not added to.
+
+        Args:
+            projects (List[dict]): Project payloads from /project, /projects or /search hits.
+        """
+        hits = [self._to_hit(p) for p in projects if isinstance(p, dict) and (p.get("project_id") or p.get("id"))]
+        if not hits:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO projects (project_id, slug, title, description, downloads, data) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(project_id) DO UPDATE SET slug=excluded.slug, title=excluded.title, "
+                "description=excluded.description, downloads=excluded.downloads, data=excluded.data",
+                [(hit["project_id"], hit.get("slug", ""), hit.get("title", ""), hit.get("description", ""),
+                  hit.get("downloads", 0), json.dumps(hit)) for hit in hits])
+            self._conn.executemany("DELETE FROM facets WHERE project_id = ?", [(hit["project_id"],) for hit in hits])
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO facets (facet, project_id) VALUES (?, ?)",
+                [(facet, hit["project_id"]) for hit in hits for facet in self._hit_facets(hit)])
+
+    @staticmethod
+    def _hit_facets(hit: dict) -> List[str]:
+        facets = [f"categories:{c}" for c in hit.get("categories", [])]
+        facets += [f"versions:{v}" for v in hit.get("versions", [])]
+        if hit.get("project_type"):
+            facets.append(f"project_type:{hit['project_type']}")
+        return facets
+
+    @std.sync_timing
+    def add_versions(self, versions: List[dict]) -> None:
+        """
+        Records the loaders and game versions of version payloads as facets of their project.
+
+        Version lists are often filtered or partial, so these facets are only added. They are reset the
+        next time a payload of the project itself is indexed.
+
+        Args:
+            versions (List[dict]): Version payloads from /project/{id}/version, /version or /versions.
+        """
+        rows = [(facet, v["project_id"])
+                for v in versions if isinstance(v, dict) and v.get("project_id")
+                for facet in [f"categories:{ld}" for ld in v.get("loaders", [])]
+                + [f"versions:{gv}" for gv in v.get("game_versions", [])]]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO facets (facet, project_id) VALUES (?, ?)", rows)
+
+    @staticmethod
+    def _match_expression(query: str) -> str:
+        """
+        Turns free text into an FTS5 expression matching every word as a prefix.
+        """
+        words = re.findall(r"\w+", query or "")
+        return " ".join(f'"{word}"*' for word in words)
+
+    @std.sync_timing
+    def search(self, query: str = "", facets: Optional[Union[str, List[List[str]]]] = None,
+               offset: int = 0, limit: int = SEARCH_PAGE_SIZE, **kwargs) -> Dict[str, Any]:
+        """
+        Searches the index with the same parameters and response format as the Modrinth /search endpoint.
+
+        Args:
+            query (str): Free text matched against title, slug and description.
+            facets (Optional[Union[str, List[List[str]]]]): Facet groups, OR within a group and AND between groups.
+            offset (int): Number of hits to skip.
+            limit (int): Maximum number of hits to return.
+
+        Returns:
+            Dict[str, Any]: Search response with hits, offset, limit and total_hits.
+        """
+        if isinstance(facets, str):
+            facets = json.loads(facets)
+        offset, limit = int(offset), int(limit)
+        match = self._match_expression(query)
+
+        if match:
+            source = "projects_fts JOIN projects p ON p.id = projects_fts.rowid"
+            conditions, params = ["projects_fts MATCH ?"], [match]
+            order = "bm25(projects_fts), p.downloads DESC"
+        else:
+            source = "projects p"
+            conditions, params = [], []
+            order = "p.downloads DESC"
+        for group in facets or []:
+            group = [group] if isinstance(group, str) else group
+            conditions.append(f"p.project_id IN (SELECT project_id FROM facets WHERE facet IN ({', '.join('?' * len(group))}))")
+            params.extend(group)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM {source} {where}", params).fetchone()[0]
+            rows = self._conn.execute(f"SELECT p.data FROM {source} {where} ORDER BY {order} LIMIT ? OFFSET ?",
+                                      params + [limit, offset]).fetchall()
+        return {
+            "hits": [json.loads(row[0]) for row in rows],
+            "offset": offset,
+            "limit": limit,
+            "total_hits": total
+        }
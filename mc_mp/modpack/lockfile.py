@@ -0,0 +1,189 @@
+"""
+Author: Plantius (https://github.com/Plantius)
+Filename: ./mc_mp/modpack/lockfile.py
+Last Edited: 2026-10-19
+
+This module is part of the MC Modpack Creator project. For more details, visit:
+https://github.com/Plantius/mc_modpack_creator
+"""
+from mc_mp.constants import LOCK_VERSION, MOD_PATH, PACK_WORKERS, VERIFY_STATE
+from mc_mp.modpack.modpack import Modpack
+import mc_mp.metrics as metrics
+import mc_mp.standard as std
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import hashlib
+import json
+import os
+
+def build_lock(modpack: Modpack) -> dict:
+    """
+    Builds the lockfile of a modpack: the resolved version and primary file of every mod.
+
+    Args:
+        modpack (Modpack): The modpack.
+
+    Returns:
+        dict: The lock, mods by project ID.
+    """
+    mods = {}
+    for mod in modpack.mod_data:
+        primary = mod.primary_file()
+        if primary is None:
+            continue
+        mods[mod.project_id] = {
+            "version_id": mod.id,
+            "file": primary["filename"],
+            "size": primary.get("size", 0),
+            "sha512": primary["hashes"].get("sha512", ""),
+            "server": mod.server_side != "unsupported"
+        }
+    return {
+        "version": LOCK_VERSION,
+        "mc_version": modpack.mc_version,
+        "mod_loader": modpack.mod_loader,
+        "loader_version": modpack.loader_version,
+        "mods": mods
+    }
+
+def write_lock(modpack: Modpack, path: str) -> bool:
+    """
+    Writes the lockfile of a modpack atomically, with sorted keys so unchanged packs give unchanged files.
+
+    The file is not indented, json only uses its C encoder for compact output.
+
+    Args:
+        modpack (Modpack): The modpack.
+        path (str): The lockfile.
+
+    Returns:
+        bool: True if the lockfile is written, otherwise False.
+    """
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, "w") as file:
+            file.write(json.dumps(build_lock(modpack), sort_keys=True))
+        os.replace(tmp, path)
+    except OSError as e:
+        std.eprint(f"[ERROR] Could not write lockfile {path}: {e}")
+        return False
+    return True
+
+def load_lock(path: str) -> Optional[dict]:
+    """
+    Reads a lockfile.
+
+    Args:
+        path (str): The lockfile.
+
+    Returns:
+        Optional[dict]: The lock, or None if it is missing, unreadable or of another version.
+    """
+    try:
+        with open(path, "r") as file:
+            lock = json.load(file)
+    except (OSError, ValueError) as e:
+        std.eprint(f"[ERROR] Could not read lockfile {path}: {e}")
+        return None
+    if lock.get("version") != LOCK_VERSION:
+        std.eprint(f"[ERROR] Unsupported lockfile version in {path}.")
+        return None
+    return lock
+
+def hash_file(path: str) -> str:
+    """Returns the SHA-512 of a file, read in chunks so large jars are not held in memory."""
+    sha512 = hashlib.sha512()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            sha512.update(chunk)
+    return sha512.hexdigest()
+
+
+@dataclass
+class VerifyReport:
+    """The outcome of checking an install against a lockfile, file names are relative to the install."""
+
+    ok: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    mismatched: List[str] = field(default_factory=list)
+    extra: List[str] = field(default_factory=list)
+    # Files that had to be read, the rest was decided from their size and mtime
+    hashed: int = 0
+
+    @property
+    def success(self) -> bool:
+        """True if every locked file is present and matches."""
+        return not self.missing and not self.mismatched
+
+def load_state(path: str) -> Dict[str, dict]:
+    """Reads the size, mtime and SHA-512 recorded by the previous verification of an install."""
+    try:
+        with open(path, "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+@std.sync_timing
+@metrics.timed()
+def verify(lock: dict, directory: str, server: bool = False, workers: int = PACK_WORKERS) -> VerifyReport:
+    """
+    Checks the mod files of an install against a lockfile.
+
+    Files are stat'ed first: a size that differs from the lock fails without reading the file, and a file
+    with the size and mtime of the previous verification reuses its recorded hash. Only the remaining
+    files are hashed, in parallel.
+
+    Args:
+        lock (dict): The lock, as returned by build_lock or load_lock.
+        directory (str): The install, mods are expected under its mods folder.
+        server (bool): Skip mods that are not used on a dedicated server.
+        workers (int): Threads hashing files, hashlib releases the GIL so they run on all cores.
+
+    Returns:
+        VerifyReport: The files that match, are missing, differ or are not in the lock.
+    """
+    state_file = os.path.join(directory, VERIFY_STATE)
+    previous = load_state(state_file)
+    report, state, pending = VerifyReport(), {}, {}
+    expected = {}
+    for entry in lock["mods"].values():
+        if server and not entry.get("server", True):
+            continue
+        name = f"{MOD_PATH}{entry['file']}"
+        expected[name] = entry["sha512"]
+        try:
+            stat = os.stat(os.path.join(directory, name))
+        except FileNotFoundError:
+            report.missing.append(name)
+            continue
+        if entry["size"] and stat.st_size != entry["size"]:
+            report.mismatched.append(name)
+            continue
+        record = previous.get(name)
+        if record is not None and (record["size"], record["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+            state[name] = record
+        else:
+            pending[name] = stat
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        hashes = dict(zip(pending, executor.map(hash_file, [os.path.join(directory, name) for name in pending])))
+    report.hashed = len(hashes)
+    for name, stat in pending.items():
+        state[name] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha512": hashes[name]}
+    for name, record in state.items():
+        (report.ok if record["sha512"] == expected[name] else report.mismatched).append(name)
+
+    mods_dir = os.path.join(directory, MOD_PATH)
+    if os.path.isdir(mods_dir):
+        report.extra = [f"{MOD_PATH}{name}" for name in os.listdir(mods_dir)
+                        if f"{MOD_PATH}{name}" not in expected and os.path.isfile(os.path.join(mods_dir, name))]
+    for names in (report.ok, report.missing, report.mismatched, report.extra):
+        names.sort()
+
+    try:
+        with open(state_file, "w") as file:
+            file.write(json.dumps(state))
+    except OSError as e:
+        std.eprint(f"[ERROR] Could not store verification state in {directory}: {e}")
+    return report
@@ -7,6 +7,7 @@ This module is part of the MC Modpack Creator project. For more details, visit:
 https://github.com/Plantius/mc_modpack_creator
 """
 from dataclasses import dataclass, field
+from typing import Optional
 import mc_mp.standard as std
 import json
 
@@ -39,6 +40,8 @@ class Mod:
     project_id: str = "AABBCCDD"
     date_published: str = ""
     files: list[dict] = field(default_factory=list)
+    client_side: str = "unknown"
+    server_side: str = "unknown"
 
     @std.sync_timing
     def export_json(self) -> dict:
@@ -61,6 +64,16 @@ class Mod:
         for key, value in data.items():
             setattr(self, key, value)
 
+    def primary_file(self) -> Optional[dict]:
+        """
+        Returns the primary file of the mod's version. Modrinth marks at most one file as primary,
+        without one the first file is the primary file.
+
+        Returns:
+            Optional[dict]: The file, or None if the version has no files.
+        """
+        return next((file for file in self.files if file.get("primary")), self.files[0] if self.files else None)
+
     @std.sync_timing
     def update_self(self, latest_version: dict, project_info: dict):
         """
@@ -83,3 +96,5 @@ class Mod:
         self.files = latest_version.get("files", self.files)
         self.title = project_info.get("title", self.title)
         self.description = project_info.get("description", self.description)
+        self.client_side = project_info.get("client_side", self.client_side)
+        self.server_side = project_info.get("server_side", self.server_side)
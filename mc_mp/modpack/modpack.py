@@ -23,6 +23,10 @@ class Modpack:
     build_version: str = "0.1"
     mc_version: str = "1.19"
     mod_loader: str = "fabric"
+    # Pinned loader version, the latest stable one for mc_version is used if empty
+    loader_version: str = ""
+    # Directory whose contents are shipped as overrides (configs, resource packs, scripts)
+    overrides: str = ""
     client_side: str = "required"
     server_side: str = "optional"
     mod_data: list[Mod] = []
@@ -34,12 +38,50 @@ class Modpack:
         Args:
             kwargs (Any): Optional parameters for initializing the modpack attributes.
         """
+        # Never share the class-level default list between modpacks
+        self.mod_data = []
         for key, value in kwargs.items():
             if key == 'mod_data' and isinstance(value, list):
                 setattr(self, key, [Mod(**item) for item in value])
             else:
                 setattr(self, key, value)
         self._processing_mods: set = set()
+        self._revision: int = 0
+        self._views_key: tuple = ()
+        self._views: Dict[str, Any] = {}
+
+    def mark_changed(self) -> None:
+        """
+        Marks mod_data as changed so cached views are rebuilt on next access.
+        """
+        self._revision += 1
+
+    def get_revision(self) -> int:
+        """
+        Returns the change counter of mod_data.
+
+        Returns:
+            int: Counter incremented every time mod_data changes.
+        """
+        return self._revision
+
+    def _get_views(self) -> Dict[str, Any]:
+        """
+        Returns the cached name/version and description views, rebuilding them if mod_data changed.
+        """
+        key = (self._revision, id(self.mod_data), len(self.mod_data))
+        if key != self._views_key:
+            names = [f"{item.title} - {item.version_number}" for item in self.mod_data]
+            index: Dict[str, int] = {}
+            for i, name in enumerate(names):
+                index.setdefault(name, i)
+            self._views = {
+                "names": names,
+                "descriptions": [item.description for item in self.mod_data],
+                "index": index
+            }
+            self._views_key = key
+        return self._views
 
     @std.sync_timing
     def export_json(self) -> Dict[str, Any]:
@@ -69,7 +111,7 @@ class Modpack:
         Returns:
             List[str]: List of mod names with their version numbers.
         """
-        return [f"{item.title} - {item.version_number}" for item in self.mod_data]
+        return self._get_views()["names"]
 
     @std.sync_timing
     def get_mods_descriptions(self) -> List[str]:
@@ -79,7 +121,20 @@ class Modpack:
         Returns:
             List[str]: List of mod descriptions.
         """
-        return [item.description for item in self.mod_data]
+        return self._get_views()["descriptions"]
+
+    @std.sync_timing
+    def get_mod_index(self, name_ver: str) -> int:
+        """
+        Looks up the index of a mod by its "title - version" entry.
+
+        Args:
+            name_ver (str): Entry as returned by get_mods_name_ver.
+
+        Returns:
+            int: The index of the mod in mod_data, or -1 if not found.
+        """
+        return self._get_views()["index"].get(name_ver, -1)
     
     @std.sync_timing
     def sort_mods(self) -> None:
@@ -87,3 +142,4 @@ class Modpack:
         Sorts the mod_data list by mod title.
         """
         self.mod_data.sort(key=lambda mod: mod.project_id)
+        self.mark_changed()
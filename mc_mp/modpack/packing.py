@@ -0,0 +1,222 @@
+"""
+Author: Plantius (https://github.com/Plantius)
+Filename: ./mc_mp/modpack/packing.py
+Last Edited: 2026-10-19
+
+This module is part of the MC Modpack Creator project. For more details, visit:
+https://github.com/Plantius/mc_modpack_creator
+"""
+from mc_mp.constants import PACK_MANIFEST_EXT, PACK_WORKERS, RAW_ZIP_VERSIONS, ZIP_EPOCH
+import mc_mp.standard as std
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+import hashlib
+import json
+import os
+import struct
+import sys
+import zipfile
+import zlib
+
+def scan_tree(directory: str, prefix: str) -> Dict[str, str]:
+    """
+    Lists every file under a directory.
+
+    Args:
+        directory (str): The directory to scan.
+        prefix (str): Prefix of the archive names, like "overrides".
+
+    Returns:
+        Dict[str, str]: File path by archive name, empty if the directory does not exist.
+    """
+    files = {}
+    for root, _, names in os.walk(directory):
+        relative = os.path.relpath(root, directory)
+        for name in names:
+            parts = [prefix] + ([] if relative == "." else relative.split(os.sep)) + [name]
+            files["/".join(parts)] = os.path.join(root, name)
+    return files
+
+def compress(data: bytes) -> Tuple[bytes, int]:
+    """
+    Deflates data the way zip entries are stored, falling back to storing incompressible data.
+
+    Returns:
+        Tuple[bytes, int]: The entry data and its compression type.
+    """
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    deflated = compressor.compress(data) + compressor.flush()
+    if len(deflated) >= len(data):
+        return data, zipfile.ZIP_STORED
+    return deflated, zipfile.ZIP_DEFLATED
+
+def make_info(name: str, crc: int, size: int, compress_size: int, compress_type: int) -> zipfile.ZipInfo:
+    """
+    Builds a zip entry header with a fixed timestamp, permissions and creator system,
+    so an archive only depends on its contents.
+    """
+    info = zipfile.ZipInfo(name, ZIP_EPOCH)
+    info.create_system = 3
+    info.external_attr = 0o644 << 16
+    info.compress_type = compress_type
+    info.CRC = crc
+    info.file_size = size
+    info.compress_size = compress_size
+    return info
+
+def read_raw(fp, info: zipfile.ZipInfo) -> bytes:
+    """Reads the still compressed data of an entry from an open archive file."""
+    fp.seek(info.header_offset)
+    header = fp.read(zipfile.sizeFileHeader)
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    fp.seek(info.header_offset + zipfile.sizeFileHeader + name_length + extra_length)
+    return fp.read(info.compress_size)
+
+def raw_writes_supported(archive: zipfile.ZipFile) -> bool:
+    """
+    Checks if compressed entries can be appended to an archive as is.
+
+    zipfile has no public way to add compressed data, write_raw relies on its internals
+    (fp, start_dir, _didModify, NameToInfo), which are only trusted on the RAW_ZIP_VERSIONS.
+    """
+    oldest, newest = RAW_ZIP_VERSIONS
+    return (oldest <= sys.version_info[:2] <= newest and archive.mode == "w"
+            and all(hasattr(archive, name) for name in ("fp", "start_dir", "_didModify", "NameToInfo", "filelist")))
+
+def write_raw(archive: zipfile.ZipFile, info: zipfile.ZipInfo, raw: bytes) -> None:
+    """
+    Appends an already compressed entry to an archive open for writing.
+
+    The local header and data are written at the end of the entries and the entry is registered for
+    the central directory. Where raw_writes_supported fails the data is decompressed and written with
+    writestr instead, deflate is deterministic so the archive has the same bytes.
+    """
+    if not raw_writes_supported(archive):
+        data = raw if info.compress_type == zipfile.ZIP_STORED else zlib.decompress(raw, -15)
+        archive.writestr(info, data)
+        return
+    # Sizes are known up front, so no data descriptor follows the data
+    info.flag_bits &= ~0x08
+    info.header_offset = archive.start_dir
+    archive.fp.seek(archive.start_dir)
+    archive.fp.write(info.FileHeader())
+    archive.fp.write(raw)
+    archive.start_dir = archive.fp.tell()
+    archive.filelist.append(info)
+    archive.NameToInfo[info.filename] = info
+    archive._didModify = True
+
+def load_manifest(output: str) -> dict:
+    """
+    Reads the manifest of an earlier build of an archive.
+
+    The manifest only applies if the archive is still the one it was written for.
+
+    Args:
+        output (str): The archive.
+
+    Returns:
+        dict: The manifest, or an empty one if there is no usable earlier build.
+    """
+    try:
+        with open(f"{output}{PACK_MANIFEST_EXT}", "r") as file:
+            manifest = json.load(file)
+        stat = os.stat(output)
+    except (OSError, ValueError):
+        return {"files": {}}
+    if manifest.get("archive") != {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}:
+        return {"files": {}}
+    return manifest
+
+def prepare(path: str, stat: os.stat_result, record: Optional[dict]) -> Tuple[dict, Optional[Tuple[bytes, bytes, int]]]:
+    """
+    Hashes a file whose size or mtime changed and compresses it if its content changed, run in worker threads.
+
+    Args:
+        path (str): The file.
+        stat (os.stat_result): Its current stat.
+        record (Optional[dict]): Its manifest record of the previous build.
+
+    Returns:
+        Tuple[dict, Optional[Tuple[bytes, bytes, int]]]: The new record, and the data, entry data and
+        compression type if the file has to be compressed or None if the previous entry can be reused.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    new_record = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha1": hashlib.sha1(data).hexdigest()}
+    # Touched but unchanged files keep their entry
+    if record is not None and record["sha1"] == new_record["sha1"]:
+        return new_record, None
+    raw, compress_type = compress(data)
+    return new_record, (data, raw, compress_type)
+
+@std.sync_timing
+def pack_zip(output: str, members: Dict[str, bytes], files: Dict[str, str],
+             workers: int = PACK_WORKERS) -> Dict[str, int]:
+    """
+    Writes a zip archive, reusing unchanged entries of the previous build without recompressing them.
+
+    Files are tracked by size, mtime and SHA-1 in a manifest next to the archive, changed files are
+    compressed in parallel. The archive is written to a temporary file and moved into place.
+
+    Args:
+        output (str): The archive to write.
+        members (Dict[str, bytes]): Generated entries by archive name.
+        files (Dict[str, str]): File path by archive name.
+        workers (int): Threads compressing files, zlib releases the GIL so they run on all cores.
+
+    Returns:
+        Dict[str, int]: Number of "reused" and "compressed" entries.
+    """
+    manifest = load_manifest(output)
+    previous = manifest["files"]
+    names = sorted(files)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Files with the size and mtime of the previous build are not read at all
+        prepared = {}
+        for name in names:
+            stat = os.stat(files[name])
+            record = previous.get(name)
+            if record is not None and record["size"] == stat.st_size and record["mtime_ns"] == stat.st_mtime_ns:
+                prepared[name] = (record, None)
+            else:
+                prepared[name] = executor.submit(prepare, files[name], stat, record)
+
+        records, stats = {}, {"reused": 0, "compressed": 0}
+        tmp = f"{output}.{os.getpid()}.tmp"
+        old = zipfile.ZipFile(output, "r") if previous else None
+        try:
+            with zipfile.ZipFile(tmp, "w") as archive:
+                for name in sorted(members):
+                    raw, compress_type = compress(members[name])
+                    data = members[name]
+                    write_raw(archive, make_info(name, zlib.crc32(data), len(data), len(raw), compress_type), raw)
+                for name in names:
+                    result = prepared[name]
+                    record, packed = result if isinstance(result, tuple) else result.result()
+                    records[name] = record
+                    old_info = old.NameToInfo.get(name) if old is not None else None
+                    if packed is None and old_info is not None:
+                        info = make_info(name, old_info.CRC, old_info.file_size, old_info.compress_size,
+                                         old_info.compress_type)
+                        write_raw(archive, info, read_raw(old.fp, old_info))
+                        stats["reused"] += 1
+                        continue
+                    if packed is None:
+                        # The entry is missing from the previous archive, compress the file anyway
+                        with open(files[name], "rb") as file:
+                            data = file.read()
+                        packed = (data, *compress(data))
+                    data, raw, compress_type = packed
+                    write_raw(archive, make_info(name, zlib.crc32(data), len(data), len(raw), compress_type), raw)
+                    stats["compressed"] += 1
+        finally:
+            if old is not None:
+                old.close()
+    os.replace(tmp, output)
+
+    stat = os.stat(output)
+    with open(f"{output}{PACK_MANIFEST_EXT}", "w") as file:
+        # dumps uses the C encoder, dump to a file does not
+        file.write(json.dumps({"archive": {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}, "files": records}))
+    return stats
@@ -6,18 +6,25 @@ Last Edited: 2024-09-07
 This module is part of the MC Modpack Creator project. For more details, visit:
 https://github.com/Plantius/mc_modpack_creator
 """
-from mc_mp.constants import DEF_FILENAME, FORMAT_VERSION, GAME, MAX_WORKERS, MOD_PATH, MR_INDEX, PROJECT_DIR, FABRIC_V, DEF_EXT
+from mc_mp.constants import DEF_FILENAME, MAX_WORKERS, PROJECT_DIR, DEF_EXT, LOCK_EXT
 from mc_mp.modpack.modpack import Modpack
 from mc_mp.modpack.mod import Mod
 from mc_mp.modpack.project_api import ProjectAPI
+from mc_mp.modpack.compatibility import CompatibilityMatrix
+from mc_mp.modpack.version_index import VersionIndex
+from mc_mp.modpack.search import SearchPager
+from mc_mp.modpack.loader_meta import LOADER_META
+from mc_mp.modpack.export import resolve_plan, write_mrpack, fingerprint, is_current, record_fingerprint
+from mc_mp.modpack.lockfile import write_lock
 import mc_mp.standard as std
+import mc_mp.metrics as metrics
+import mc_mp.tracing as tracing
 import concurrent.futures as cf
-from typing import Optional, Dict, Any
-from dateutil import parser
+import copy
+from typing import Optional, Dict, Any, Callable
 import asyncio
 import functools
 import json
-import glob
 import os
 
 class Project:
@@ -27,6 +34,7 @@ class Project:
 
     modpack: Modpack
     api: ProjectAPI
+    versions: VersionIndex
     metadata: Dict[str, Any] = {
         "loaded": False,
         "saved": True,
@@ -35,8 +43,25 @@ class Project:
     }
 
     def __init__(self, **kwargs) -> None:
-        """Initializes a Project instance and ProjectAPI."""
+        """Initializes a Project instance, ProjectAPI and the version index."""
+        # Copy the class defaults so projects never share metadata
+        self.metadata = dict(Project.metadata)
         self.api = ProjectAPI()
+        self.versions = VersionIndex()
+
+    @std.sync_timing
+    def copy(self) -> "Project":
+        """
+        Returns a copy of the project with its own modpack, sharing the API client and version index.
+
+        Returns:
+            Project: The copy, changes to its modpack do not affect this project.
+        """
+        clone = Project()
+        clone.metadata = dict(self.metadata)
+        clone.modpack = copy.deepcopy(self.modpack)
+        clone.api, clone.versions = self.api, self.versions
+        return clone
 
     @std.sync_timing
     def is_mod_installed(self, id: str) -> int:
@@ -63,9 +88,7 @@ class Project:
         Returns:
             bool: True if new_date is later than current_date, otherwise False.
         """
-        new_mod_date = parser.parse(new_date)
-        current_mod_date = parser.parse(current_date)
-        return new_mod_date > current_mod_date
+        return std.parse_timestamp(new_date) > std.parse_timestamp(current_date)
 
     @std.sync_timing
     def create_project(self, **kwargs) -> None:
@@ -86,6 +109,7 @@ class Project:
             exit(1)
 
     @std.async_timing
+    @metrics.timed()
     async def load_project(self, filename: str) -> bool:
         """
         Loads project data from a file and initializes the modpack.
@@ -116,15 +140,16 @@ class Project:
         return True
 
     @std.async_timing
+    @metrics.timed()
     async def save_project(self, filename: Optional[str] = DEF_FILENAME) -> bool:
         """
-        Saves the current project state to a file.
+        Saves the current project state to a file, with the lockfile of the resolved mod files next to it.
 
         Args:
             filename (Optional[str]): The file name to save the project to.
 
         Returns:
-            bool: True if the project is saved successfully, otherwise False.
+            bool: True if the project and its lockfile are saved successfully, otherwise False.
         """
         if filename:
             self.metadata["filename"] = filename
@@ -139,7 +164,7 @@ class Project:
         with open(f'{self.metadata["filename"]}.{DEF_EXT}', 'w') as file:
             await loop.run_in_executor(None, functools.partial(json.dump, project_data, file, indent=4))
         
-        return True
+        return await loop.run_in_executor(None, write_lock, self.modpack, f'{self.metadata["filename"]}{LOCK_EXT}')
 
     @std.async_timing
     async def search_mods(self, **kwargs) -> dict:
@@ -155,6 +180,22 @@ class Project:
         result = await self.api.search_project(**kwargs)
         return result
 
+    @std.sync_timing
+    def search_mods_paged(self, **kwargs) -> SearchPager:
+        """
+        Creates a pager streaming search results and prefetching the versions of the hits.
+
+        Args:
+            **kwargs: Filter and search parameters for the mod search.
+
+        Returns:
+            SearchPager: Async iterator over the result pages.
+        """
+        return SearchPager(self.api, version_filters={
+            "loaders": [self.modpack.mod_loader],
+            "game_versions": [self.modpack.mc_version]
+        }, **kwargs)
+
     @std.sync_timing
     def add_mod(self, name: str, version: dict, project_info: dict, index: int = 0) -> bool:
         """
@@ -185,7 +226,9 @@ class Project:
             id=version["id"],
             project_id=version["project_id"],
             date_published=version["date_published"],
-            files=version["files"]
+            files=version["files"],
+            client_side=project_info.get("client_side", "unknown"),
+            server_side=project_info.get("server_side", "unknown")
         ))
         self.metadata["saved"] = False
         self.modpack.sort_mods()
@@ -247,6 +290,65 @@ class Project:
         self.metadata["saved"] = False
         return True
 
+    @std.async_timing
+    @metrics.timed()
+    async def update_mods_to_latest(self, ids: Optional[list[str]] = None,
+                                    progress: Optional[Callable[[int, int], None]] = None) -> list[dict]:
+        """
+        Updates mods to their newest version for the pack's loader and Minecraft version without prompting.
+
+        Args:
+            ids (Optional[list[str]]): Project IDs to update, all mods if None.
+            progress (Optional[Callable[[int, int], None]]): Called with (done, total) after each step.
+
+        Returns:
+            list[dict]: The applied updates with project_id, title and the old and new version numbers.
+        """
+        ids = ids if ids is not None else [m.project_id for m in self.modpack.mod_data]
+        if progress:
+            progress(0, 2)
+        info_list = await self.fetch_mods_by_ids(ids)
+        if progress:
+            progress(1, 2)
+        changes = self.apply_latest_versions(self.versions, {info["id"]: info for info in info_list})
+        if progress:
+            progress(2, 2)
+        return changes
+
+    @std.sync_timing
+    def apply_latest_versions(self, versions: VersionIndex, info_by_id: Dict[str, dict]) -> list[dict]:
+        """
+        Updates every mod to the newest indexed version for the pack's loader and Minecraft version.
+
+        Args:
+            versions (VersionIndex): Index holding the fetched versions of the mods.
+            info_by_id (Dict[str, dict]): Project information by project ID, mods without it are skipped.
+
+        Returns:
+            list[dict]: The applied updates with project_id, title and the old and new version numbers.
+        """
+        changes, latest_versions, project_infos, indices = [], [], [], []
+        for index, mod in enumerate(self.modpack.mod_data):
+            if mod.project_id not in info_by_id:
+                continue
+            record = versions.latest(mod.project_id, self.modpack.mod_loader,
+                                     self.modpack.mc_version, min_type="alpha")
+            if record is None or not versions.is_newer(record, mod.date_published):
+                continue
+            changes.append({
+                "project_id": mod.project_id,
+                "title": mod.title,
+                "from": mod.version_number,
+                "to": record.data.get("version_number")
+            })
+            latest_versions.append(record.data)
+            project_infos.append(info_by_id[mod.project_id])
+            indices.append(index)
+
+        if indices:
+            self.update_mods(latest_versions, project_infos, indices)
+        return changes
+
     @std.sync_timing
     def list_mods(self) -> list[str]:
         """
@@ -290,6 +392,7 @@ class Project:
         return future.result()
 
     @std.async_timing
+    @metrics.timed()
     async def fetch_mods_by_ids(self, ids: list[str]) -> list[dict]:
         """
         Fetches mods by their IDs concurrently and returns detailed information.
@@ -300,19 +403,25 @@ class Project:
         Returns:
             list[dict]: A list of mod details, including version information.
         """
+        if not self.api.require_online("fetch mods"):
+            return []
         mods_ver_info: list = []
         loop = asyncio.get_running_loop()
         
         with cf.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            tasks_vers = [loop.run_in_executor(executor, self.get_versions_id, id, loop) for id in ids]
-            tasks_info = loop.run_in_executor(executor, self.get_project_info_ids, ids, loop)
+            # Executor threads do not inherit the context, bind it so their spans nest under this one
+            tasks_vers = [loop.run_in_executor(executor, tracing.in_context(self.get_versions_id, id, loop))
+                          for id in ids]
+            tasks_info = loop.run_in_executor(executor, tracing.in_context(self.get_project_info_ids, ids, loop))
             res_ver = await asyncio.gather(*tasks_vers)
             res_info = await asyncio.gather(tasks_info)
         
+        for version_list in res_ver:
+            self.versions.add(version_list or [])
+        # Mods without a version for the pack's loader and Minecraft version are left out
         version_map: dict = {
-            version_list[0].get("project_id", ""): 
-                (version_list if version_list else []) 
-                for version_list in res_ver
+            version_list[0].get("project_id", ""): version_list
+                for version_list in res_ver if version_list
         }
         mods_ver_info = [
             {**project_info, "versions": version_map.get(project_info.get("id"), [])}
@@ -321,47 +430,63 @@ class Project:
         ]
         return mods_ver_info
 
+    @std.async_timing
+    @metrics.timed()
+    async def build_compatibility_matrix(self) -> CompatibilityMatrix:
+        """
+        Fetches all versions of every mod once and builds a compatibility matrix.
+
+        Returns:
+            CompatibilityMatrix: Support matrix of the installed mods over all game versions and loaders.
+        """
+        ids = [m.project_id for m in self.modpack.mod_data]
+        if not self.api.require_online("check compatibility"):
+            return CompatibilityMatrix({})
+        results = await asyncio.gather(*[self.api.list_versions(id=id) for id in ids])
+        for versions in results:
+            self.versions.add(versions or [])
+        return CompatibilityMatrix({id: versions or [] for id, versions in zip(ids, results)})
+
     @std.sync_timing
-    def download_file(self, file_info, loop) -> bool:
+    def download_file(self, file_info, loop, dir_name: str = PROJECT_DIR) -> bool:
         """
         Downloads a file and checks its hash.
 
         Args:
             file_info (dict): The file metadata, including URL and filename.
             loop (asyncio.AbstractEventLoop): The event loop to run the async task.
+            dir_name (str): The directory to download the file to.
 
         Returns:
             bool: True if the file is downloaded and verified successfully, otherwise False.
         """
-        future = asyncio.run_coroutine_threadsafe(self.api.get_file_from_url(**file_info), loop)
+        future = asyncio.run_coroutine_threadsafe(self.api.get_file_from_url(dir_name=dir_name, **file_info), loop)
         future.result()
 
-        if not std.check_hash(f'{PROJECT_DIR}/{file_info["filename"]}', file_info["hashes"]):
+        path = os.path.join(dir_name, file_info["filename"])
+        if not os.path.exists(path):
+            std.eprint(f"[ERROR] Could not download file: {file_info['filename']}")
+            return False
+        if not std.check_hash(path, file_info["hashes"]):
             std.eprint(f"[ERROR] Wrong hash for file: {file_info['filename']}")
-            os.remove(f'{PROJECT_DIR}/{file_info["filename"]}')
+            os.remove(path)
             return False
         return True
 
-    @std.sync_timing
-    def convert_file_to_mp_format(self, mod: dict) -> dict:
+    @std.async_timing
+    async def get_loader_version(self) -> Optional[str]:
         """
-        Converts a mod file to the modpack format.
-
-        Args:
-            mod (dict): The mod information.
+        Returns the pinned loader version of the modpack, or the latest stable one for its Minecraft version.
 
         Returns:
-            dict: A dictionary representing the mod file in modpack format.
-        """
-        return {
-            "path": f"{MOD_PATH}{mod['filename']}",
-            "hashes": mod['hashes'],
-            "env": mod["env"],
-            "downloads": [mod["url"]],
-            "fileSize": mod["size"]
-        }
-    
+            Optional[str]: The loader version, or None if it cannot be determined.
+        """
+        if self.modpack.loader_version:
+            return self.modpack.loader_version
+        return await LOADER_META.latest(self.modpack.mod_loader, self.modpack.mc_version)
+
     @std.async_timing
+    @metrics.timed()
     async def export_modpack(self, filename: str) -> bool:
         """
         Exports the current modpack to a JSON file and compresses it into an archive.
@@ -372,43 +497,17 @@ class Project:
         Returns:
             bool: True if the modpack is exported and archived successfully, otherwise False.
         """
+        plan = await resolve_plan(self)
+        if plan is None:
+            return False
+        # Unchanged inputs give the same archive, so an up to date one is kept
+        digest = f"{await asyncio.to_thread(fingerprint, plan)}-mrpack"
+        if is_current(f"{filename}.mrpack", digest):
+            print("[INFO] Modpack is up to date.")
+            return True
         try:
-            os.makedirs(PROJECT_DIR)
-        except FileExistsError:
-            pass
-        
-        modpack_json: dict = {
-            "formatVersion": FORMAT_VERSION, 
-            "game": GAME,
-            "versionId": self.modpack.mc_version,
-            "name": self.modpack.title,
-            "summary": self.modpack.description,
-            "files": [],
-            "dependencies": {
-                "minecraft": self.modpack.mc_version, 
-                self.modpack.mod_loader if ("fabric" or "quilt") not in self.modpack.mod_loader else f"{self.modpack.mod_loader}-loader": FABRIC_V
-            }
-        }
-
-        for mod in self.modpack.mod_data:
-            for mod_file in mod.files:
-                if not mod_file["primary"]:
-                    continue
-                mod_file["env"] = {
-                    "client": self.modpack.client_side,
-                    "server": self.modpack.server_side
-                }
-                modpack_json["files"].append(self.convert_file_to_mp_format(mod_file))
-
-        with open(f"{PROJECT_DIR}/{MR_INDEX}", 'w', encoding='utf8') as index_file:
-            json.dump(modpack_json, index_file, indent=3, ensure_ascii=False)
-        
-        try:
-            std.zip_dir(filename, PROJECT_DIR)
-            files = glob.glob(f'{PROJECT_DIR}/*')
-            for file in files:
-                os.remove(file)
-            os.rmdir(PROJECT_DIR)    
+            output = await asyncio.to_thread(write_mrpack, plan, filename)
+            await asyncio.to_thread(record_fingerprint, output, digest)
         except Exception as e:
             std.eprint(f"[ERROR] Could not create archive: {e}")
             return False
@@ -417,7 +516,20 @@ class Project:
         return True
 
     @std.async_timing
-    async def download_mods(self, dir_name: str) -> bool:
+    @metrics.timed()
+    async def download_mods(self, dir_name: str, progress: Optional[Callable[[int, int], None]] = None) -> bool:
+        """
+        Downloads the primary file of every mod and verifies its hashes.
+
+        Args:
+            dir_name (str): The directory to download the mods to.
+            progress (Optional[Callable[[int, int], None]]): Called with (done, total) after each file.
+
+        Returns:
+            bool: True if every file is downloaded and verified, otherwise False.
+        """
+        if not self.api.require_online("download mods"):
+            return False
         try:
             os.makedirs(dir_name)
         except FileExistsError:
@@ -425,20 +537,32 @@ class Project:
             std.eprint("[ERROR] Directory already exists")
         
         # Prepare list of file information
-        files = [file[0] for file in [[file for file in m.files if file["primary"]] for m in self.modpack.mod_data]]
+        files, missing = [], []
+        for mod in self.modpack.mod_data:
+            primary = mod.primary_file()
+            if primary is None:
+                std.eprint(f"[ERROR] No primary file for mod: {mod.title}")
+                missing.append(mod.title)
+                continue
+            files.append(primary)
 
         # Use ThreadPoolExecutor to download and check files concurrently
         loop = asyncio.get_running_loop()
         with cf.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
             tasks = [
-                loop.run_in_executor(executor, self.download_file, file, loop)
+                loop.run_in_executor(executor, tracing.in_context(self.download_file, file, loop, dir_name))
                 for file in files
             ]
+            if progress:
+                for task in tasks:
+                    task.add_done_callback(lambda _: progress(sum(t.done() for t in tasks), len(tasks)))
             results = await asyncio.gather(*tasks)
         
-        # Handle any errors
-        if not any(results):
-            std.eprint("[ERROR] One or more files failed to download or check correctly.")
+        # A single failed file fails the download
+        failed = missing + [file["filename"] for file, result in zip(files, results) if not result]
+        if failed:
+            std.eprint(f"[ERROR] {len(failed)} of {len(self.modpack.mod_data)} files failed to download or check "
+                       f"correctly: {', '.join(failed)}")
             return False
         return True
     
@@ -7,21 +7,157 @@ This module is part of the MC Modpack Creator project. For more details, visit:
 https://github.com/Plantius/mc_modpack_creator
 """
 import os
+import re
+import time
+import asyncio
 import logging
-from aiohttp import ClientSession, ClientError
+import threading
+from aiohttp import ClientSession, ClientError, TCPConnector
 from typing import Optional, Dict, Any
 from aiocache import cached
-from mc_mp.constants import API_BASE, HEADERS, PROJECT_DIR
+from mc_mp.constants import API_BASE, HEADERS, PROJECT_DIR, MAX_CONNECTIONS, DNS_CACHE_TTL, MAX_RETRIES, MAX_RETRY_DELAY
+from mc_mp.modpack.local_index import LocalIndex
+from mc_mp.modpack.cassette import Cassette
+import mc_mp.standard as std
+from mc_mp.metrics import API_REQUESTS, API_LATENCY, API_RETRIES, CACHE_LOOKUPS, DOWNLOAD_BYTES, DOWNLOAD_LATENCY, DOWNLOAD_THROUGHPUT
+import sqlite3
 
 # Configure logging
 logging.basicConfig(level=logging.ERROR)
 logger = logging.getLogger(__name__)
 
+# Path segments that hold an ID or slug, collapsed so metrics get one series per endpoint
+ENDPOINT_ID_PATTERN = re.compile(r"^/(project|version|version_file|user|team)/[^/]+")
+
+class metered_cached(cached):
+    """
+    aiocache's cached decorator, counting hits and misses in the metrics registry.
+
+    aiocache reads a stored None as an empty entry and calls the function again, so None results (failed
+    requests) are not stored and every lookup that returns None is a real miss.
+    """
+
+    def __init__(self, *args, skip_cache_func=lambda result: result is None, **kwargs):
+        super().__init__(*args, skip_cache_func=skip_cache_func, **kwargs)
+
+    async def get_from_cache(self, key: str):
+        value = await super().get_from_cache(key)
+        CACHE_LOOKUPS.inc(cache="api", result="miss" if value is None else "hit")
+        return value
+
 class ProjectAPI:
     """Handles interactions with the Modrinth API for project-related data."""
 
+    # Offline search index fed with every fetched project and version, disabled when None
+    local_index: Optional[LocalIndex] = None
+    # Database the local index is opened from on first use, so runs that never need it do not touch it
+    local_index_path: Optional[str] = None
+    # Skip the network and answer searches from the local index only
+    offline: bool = False
+    # Base URL requests are sent to
+    api_base: str = API_BASE
+    # Records all traffic, or replays recorded traffic instead of using the network, disabled when None
+    cassette: Optional[Cassette] = None
+    # One pooled HTTP session per event loop, sessions cannot be shared between loops
+    _sessions: Dict[asyncio.AbstractEventLoop, ClientSession] = {}
+    _index_lock = threading.Lock()
+
+    @staticmethod
+    def get_session() -> ClientSession:
+        """
+        Returns the shared HTTP session of the running event loop, creating it on first use.
+        With a cassette, the session is wrapped to record traffic or replaced to replay it.
+
+        Returns:
+            ClientSession: A session reusing pooled connections across requests.
+        """
+        if ProjectAPI.cassette is not None and ProjectAPI.cassette.replaying:
+            return ProjectAPI.cassette
+        loop = asyncio.get_running_loop()
+        for closed in [l for l in ProjectAPI._sessions if l.is_closed()]:
+            del ProjectAPI._sessions[closed]
+        session = ProjectAPI._sessions.get(loop)
+        if session is None or session.closed:
+            connector = TCPConnector(limit=MAX_CONNECTIONS, ttl_dns_cache=DNS_CACHE_TTL)
+            session = ClientSession(connector=connector, headers=HEADERS)
+            ProjectAPI._sessions[loop] = session
+        return ProjectAPI.cassette.wrap(session) if ProjectAPI.cassette is not None else session
+
+    @staticmethod
+    async def close_session() -> None:
+        """
+        Closes the shared HTTP session of the running event loop, if any.
+        """
+        session = ProjectAPI._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+
     @staticmethod
-    @cached(ttl=3600)
+    async def clear_caches() -> None:
+        """
+        Empties the response caches of every cached method, so the next calls hit the network.
+        """
+        for name in dir(ProjectAPI):
+            cache = getattr(getattr(ProjectAPI, name), "cache", None)
+            if cache is not None:
+                await cache.clear()
+
+    @staticmethod
+    def get_local_index() -> Optional[LocalIndex]:
+        """
+        Returns the local search index, opening it from local_index_path on first use.
+
+        Returns:
+            Optional[LocalIndex]: The index, or None if it is disabled or could not be opened.
+        """
+        with ProjectAPI._index_lock:
+            if ProjectAPI.local_index is None and ProjectAPI.local_index_path is not None:
+                path, ProjectAPI.local_index_path = ProjectAPI.local_index_path, None
+                try:
+                    ProjectAPI.local_index = LocalIndex(path)
+                except (OSError, sqlite3.Error) as e:
+                    logger.error(f"[ERROR] Could not open local search index {path}: {e}")
+            return ProjectAPI.local_index
+
+    @staticmethod
+    def require_online(action: str) -> bool:
+        """
+        Checks that the API may be used, offline mode only answers searches from the local index.
+
+        Args:
+            action (str): What needs the API, used in the error message.
+
+        Returns:
+            bool: True if online, otherwise False after printing why the action is unavailable.
+        """
+        if ProjectAPI.offline:
+            std.eprint(f"[ERROR] Cannot {action} in offline mode, only searches are answered from the local index.")
+            return False
+        return True
+
+    @staticmethod
+    def index_payload(projects: Optional[list] = None, versions: Optional[list] = None) -> None:
+        """
+        Adds fetched project and version payloads to the local search index, if enabled.
+
+        Args:
+            projects (Optional[list]): Project payloads or search hits.
+            versions (Optional[list]): Version payloads.
+        """
+        index = ProjectAPI.get_local_index()
+        if index is None:
+            return
+        try:
+            if isinstance(projects, list):
+                index.add_projects(projects)
+            if isinstance(versions, list):
+                index.add_versions(versions)
+        except sqlite3.Error as e:
+            logger.error(f"[ERROR] Could not update local search index: {e}")
+
+    @staticmethod
+    @std.async_timing
+    @metered_cached(ttl=3600)
     async def request(endpoint: str, params: Dict[str, Any] = {}) -> Optional[Dict[str, Any]]:
         """
         Makes a GET request to the specified API endpoint and returns the JSON response.
@@ -33,17 +169,64 @@ class ProjectAPI:
         Returns:
             Optional[Dict[str, Any]]: The JSON response from the API, or None if the request fails.
         """
-        async with ClientSession() as session:
-            try:
-                async with session.get(f"{API_BASE}{endpoint}", params=params, headers=HEADERS) as response:
-                    response.raise_for_status()
-                    return await response.json()
-            except ClientError as e:
-                logger.error(f"[ERROR] Request to {API_BASE}{endpoint} failed: {e}")
-                return None
-            except Exception as e:
-                logger.error(f"[ERROR] Unexpected error during request to {API_BASE}{endpoint}: {e}")
-                return None
+        if ProjectAPI.offline:
+            return None
+        start = time.perf_counter()
+        status = "error"
+        label = ProjectAPI.endpoint_label(endpoint)
+        url = f"{ProjectAPI.api_base}{endpoint}"
+        try:
+            for attempt in range(MAX_RETRIES + 1):
+                async with ProjectAPI.get_session().get(url, params=params) as response:
+                    status = str(response.status)
+                    if response.status != 429 or attempt == MAX_RETRIES:
+                        response.raise_for_status()
+                        return await response.json()
+                    delay = ProjectAPI.retry_delay(response.headers, attempt)
+                # Rate limited, wait outside the response so the connection goes back to the pool
+                API_RETRIES.inc(endpoint=label)
+                await asyncio.sleep(delay)
+        except ClientError as e:
+            logger.error(f"[ERROR] Request to {url} failed: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"[ERROR] Unexpected error during request to {url}: {e}")
+            return None
+        finally:
+            API_REQUESTS.inc(endpoint=label, status=status)
+            API_LATENCY.observe(time.perf_counter() - start, endpoint=label)
+
+    @staticmethod
+    def retry_delay(headers: Dict[str, str], attempt: int) -> float:
+        """
+        Returns how long to wait before retrying a rate limited request.
+
+        Args:
+            headers (Dict[str, str]): The 429 response headers, Retry-After or X-Ratelimit-Reset are honored.
+            attempt (int): Number of retries done so far, used for exponential backoff without those headers.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        value = headers.get("Retry-After") or headers.get("X-Ratelimit-Reset")
+        try:
+            delay = float(value) if value is not None else 0.5 * 2 ** attempt
+        except ValueError:
+            delay = 0.5 * 2 ** attempt
+        return min(max(delay, 0.0), MAX_RETRY_DELAY)
+
+    @staticmethod
+    def endpoint_label(endpoint: str) -> str:
+        """
+        Replaces IDs and slugs in an endpoint path by a placeholder, e.g. /project/{id}/version.
+
+        Args:
+            endpoint (str): The API endpoint.
+
+        Returns:
+            str: The endpoint with its ID segment replaced.
+        """
+        return ENDPOINT_ID_PATTERN.sub(r"/\1/{id}", endpoint.split("?", 1)[0])
 
     @staticmethod
     def parse_url(params: Dict[str, Any]) -> str:
@@ -59,7 +242,7 @@ class ProjectAPI:
         return '&'.join(f'{key}={value}' for key, value in params.items()).replace('\'', '\"').replace(" ", "")
 
     @staticmethod
-    @cached(ttl=3600)
+    @metered_cached(ttl=3600)
     async def is_slug_valid(slug_or_id: str) -> Optional[Dict[str, Any]]:
         """
         Checks if the given project slug or ID exists on Modrinth, with caching.
@@ -77,7 +260,7 @@ class ProjectAPI:
             return None
 
     @staticmethod
-    @cached(ttl=3600)
+    @metered_cached(ttl=3600)
     async def get_dependencies(project_name: str) -> Optional[Dict[str, Any]]:
         """
         Retrieves all dependencies for the specified project, with caching.
@@ -95,7 +278,7 @@ class ProjectAPI:
             return None
 
     @staticmethod
-    @cached(ttl=3600)
+    @metered_cached(ttl=3600)
     async def search_project(**kwargs) -> Optional[Dict[str, Any]]:
         """
         Searches for projects using various filters and sorting options, with caching.
@@ -108,13 +291,21 @@ class ProjectAPI:
         """
         params = {k: v for k, v in kwargs.items() if v is not None}
         try:
-            return await ProjectAPI.request("/search", params=ProjectAPI.parse_url(params))
+            if ProjectAPI.offline and ProjectAPI.get_local_index() is not None:
+                return ProjectAPI.local_index.search(**params)
+            result = await ProjectAPI.request("/search", params=ProjectAPI.parse_url(params))
+            if result is None and ProjectAPI.get_local_index() is not None:
+                # Fall back to the projects seen before when the network is unavailable
+                return ProjectAPI.local_index.search(**params)
+            if isinstance(result, dict):
+                ProjectAPI.index_payload(projects=result.get("hits"))
+            return result
         except Exception as e:
             logger.error(f"[ERROR] Project search failed with parameters {params}: {e}")
             return None
 
     @staticmethod
-    @cached(ttl=3600)
+    @metered_cached(ttl=3600)
     async def get_project(project_name: str) -> Optional[Dict[str, Any]]:
         """
         Retrieves detailed information about a specific project.
@@ -126,13 +317,15 @@ class ProjectAPI:
             Optional[Dict[str, Any]]: The project details, or None if an error occurs.
         """
         try:
-            return await ProjectAPI.request(f"/project/{project_name}")
+            result = await ProjectAPI.request(f"/project/{project_name}")
+            ProjectAPI.index_payload(projects=[result] if isinstance(result, dict) else None)
+            return result
         except Exception as e:
             logger.error(f"[ERROR] Could not retrieve project {project_name}: {e}")
             return None
 
     @staticmethod
-    @cached(ttl=3600)
+    @metered_cached(ttl=3600)
     async def get_projects(**kwargs) -> Optional[Dict[str, Any]]:
         """
         Retrieves information about multiple projects using various filters, with caching.
@@ -145,7 +338,9 @@ class ProjectAPI:
         """
         params = {k: v for k, v in kwargs.items() if v is not None}
         try:
-            return await ProjectAPI.request("/projects", params=ProjectAPI.parse_url(params))
+            result = await ProjectAPI.request("/projects", params=ProjectAPI.parse_url(params))
+            ProjectAPI.index_payload(projects=result)
+            return result
         except KeyError as e:
             logger.error(f"[ERROR] Missing required key 'ids' in parameters: {e}")
             return None
@@ -154,7 +349,7 @@ class ProjectAPI:
             return None
 
     @staticmethod
-    @cached(ttl=3600)
+    @metered_cached(ttl=3600)
     async def list_versions(**kwargs) -> Optional[Dict[str, Any]]:
         """
         Lists versions of a specified project with optional filtering.
@@ -167,7 +362,9 @@ class ProjectAPI:
         """
         try:
             params = {k: v for k, v in kwargs.items() if v is not None and k != "id"}
-            return await ProjectAPI.request(f"/project/{kwargs['id']}/version", params=ProjectAPI.parse_url(params))
+            result = await ProjectAPI.request(f"/project/{kwargs['id']}/version", params=ProjectAPI.parse_url(params))
+            ProjectAPI.index_payload(versions=result)
+            return result
         except KeyError as e:
             logger.error(f"[ERROR] Missing required key 'id' in parameters: {e}")
             return None
@@ -176,7 +373,7 @@ class ProjectAPI:
             return None
 
     @staticmethod
-    @cached(ttl=3600)
+    @metered_cached(ttl=3600)
     async def get_version(version_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieves detailed information about a specific version by its ID.
@@ -188,13 +385,15 @@ class ProjectAPI:
             Optional[Dict[str, Any]]: The version details, or None if an error occurs.
         """
         try:
-            return await ProjectAPI.request(f"/version/{version_id}")
+            result = await ProjectAPI.request(f"/version/{version_id}")
+            ProjectAPI.index_payload(versions=[result] if isinstance(result, dict) else None)
+            return result
         except Exception as e:
             logger.error(f"[ERROR] Could not retrieve version {version_id}: {e}")
             return None
 
     @staticmethod
-    @cached(ttl=3600)
+    @metered_cached(ttl=3600)
     async def get_versions(**kwargs) -> Optional[Dict[str, Any]]:
         """
         Retrieves information about multiple versions by their IDs.
@@ -207,30 +406,39 @@ class ProjectAPI:
         """
         params = {k: v for k, v in kwargs.items() if v is not None}
         try:
-            return await ProjectAPI.request("/versions", params=params)
+            result = await ProjectAPI.request("/versions", params=params)
+            ProjectAPI.index_payload(versions=result)
+            return result
         except Exception as e:
             logger.error(f"[ERROR] Failed to retrieve versions with parameters {params}: {e}")
             return None
 
     @staticmethod
-    async def get_file_from_url(**kwargs) -> None:
+    @std.async_timing
+    async def get_file_from_url(dir_name: str = PROJECT_DIR, **kwargs) -> None:
         """
         Downloads a file from the given URL and saves it to a specified location.
 
         Args:
+            dir_name (str): The directory to save the file in.
             **kwargs: File metadata including the URL and filename.
         """
         params = {k: v for k, v in kwargs.items() if v is not None}
         try:
-            async with ClientSession() as session:
-                async with session.get(params["url"]) as response:
-                    if response.status == 200:
-                        data = await response.read()
-                        os.makedirs(os.path.dirname(f'{PROJECT_DIR}/{params["filename"]}'), exist_ok=True)
-                        with open(f'{PROJECT_DIR}/{params["filename"]}', "wb") as file:
-                            file.write(data)
-                    else:
-                        logger.error(f"[ERROR] Failed to download file: Status code {response.status}")
+            start = time.perf_counter()
+            async with ProjectAPI.get_session().get(params["url"]) as response:
+                if response.status == 200:
+                    data = await response.read()
+                    duration = time.perf_counter() - start
+                    DOWNLOAD_BYTES.inc(len(data))
+                    DOWNLOAD_LATENCY.observe(duration)
+                    DOWNLOAD_THROUGHPUT.set(len(data) / duration if duration > 0 else 0)
+                    path = os.path.join(dir_name, params["filename"])
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(path, "wb") as file:
+                        file.write(data)
+                else:
+                    logger.error(f"[ERROR] Failed to download file: Status code {response.status}")
         except KeyError as e:
             logger.error(f"[ERROR] Missing required file download parameters: {e}")
         except Exception as e:
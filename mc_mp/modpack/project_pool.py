@@ -0,0 +1,205 @@
+"""
+Author: Plantius (https://github.com/Plantius)
+Filename: ./mc_mp/modpack/project_pool.py
+Last Edited: 2026-10-19
+
+This module is part of the MC Modpack Creator project. For more details, visit:
+https://github.com/Plantius/mc_modpack_creator
+"""
+from mc_mp.constants import DEF_EXT, MAX_LOADED_PROJECTS
+from mc_mp.modpack.project import Project
+from mc_mp.metrics import CACHE_LOOKUPS, CACHE_EVICTIONS, LOADED_PROJECTS
+import mc_mp.standard as std
+from collections import OrderedDict
+from typing import Optional, Dict
+import asyncio
+import threading
+import os
+
+class ProjectPool:
+    """
+    Keeps a bounded, least recently used set of loaded projects keyed by project ID.
+    Evicted projects are saved to disk and reloaded on their next use, projects held by a
+    session or job are never evicted.
+    """
+
+    def __init__(self, max_projects: int = MAX_LOADED_PROJECTS) -> None:
+        """
+        Initializes an empty pool.
+
+        Args:
+            max_projects (int): Maximum number of projects kept in memory.
+        """
+        self.max_projects = max_projects
+        self._projects: "OrderedDict[str, Project]" = OrderedDict()
+        self._files: Dict[str, str] = {}
+        # Number of holders of each project in use
+        self._users: Dict[str, int] = {}
+        # Loads in flight by absolute path, concurrent loads of a file share one
+        self._loading: Dict[str, asyncio.Task] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._projects)
+
+    def __contains__(self, project_id: str) -> bool:
+        with self._lock:
+            return project_id in self._projects
+
+    def _file_for(self, filename: str) -> Optional[str]:
+        """
+        Returns the ID of a loaded or evicted project read from the given file.
+        """
+        path = os.path.abspath(filename)
+        with self._lock:
+            for project_id, known in self._files.items():
+                if known == path:
+                    return project_id
+        return None
+
+    def hold(self, project_id: str) -> None:
+        """
+        Marks a project as in use, it is not evicted until every holder released it.
+
+        Args:
+            project_id (str): The project ID.
+        """
+        with self._lock:
+            self._users[project_id] = self._users.get(project_id, 0) + 1
+
+    def release(self, project_id: str) -> None:
+        """
+        Releases a project held with hold. The pool shrinks back to its bound on the next add.
+
+        Args:
+            project_id (str): The project ID.
+        """
+        with self._lock:
+            users = self._users.get(project_id, 0) - 1
+            if users > 0:
+                self._users[project_id] = users
+            else:
+                self._users.pop(project_id, None)
+
+    @std.async_timing
+    async def add(self, project: Project) -> str:
+        """
+        Adds a loaded or newly created project to the pool.
+
+        Args:
+            project (Project): The project to add.
+
+        Returns:
+            str: The project ID the project is stored under.
+        """
+        project_id = project.metadata["project_id"]
+        with self._lock:
+            self._projects[project_id] = project
+            self._projects.move_to_end(project_id)
+            if project.metadata.get("filename"):
+                self._files[project_id] = os.path.abspath(f'{project.metadata["filename"]}.{DEF_EXT}')
+            LOADED_PROJECTS.set(len(self._projects))
+        await self._evict()
+        return project_id
+
+    @std.async_timing
+    async def get(self, project_id: Optional[str]) -> Optional[Project]:
+        """
+        Returns a project by ID, reloading it from disk if it was evicted.
+
+        Args:
+            project_id (Optional[str]): The project ID.
+
+        Returns:
+            Optional[Project]: The project, or None if it is unknown.
+        """
+        if not project_id:
+            return None
+        with self._lock:
+            project = self._projects.get(project_id)
+            if project is not None:
+                self._projects.move_to_end(project_id)
+                CACHE_LOOKUPS.inc(cache="project_pool", result="hit")
+                return project
+            filename = self._files.get(project_id)
+        CACHE_LOOKUPS.inc(cache="project_pool", result="miss")
+        if filename is None:
+            return None
+        return await self.load(filename)
+
+    @std.async_timing
+    async def load(self, filename: str) -> Optional[Project]:
+        """
+        Loads a project file, reusing the pooled instance if the file is already loaded.
+        Concurrent loads of the same file wait for a single load and get the same instance.
+
+        Args:
+            filename (str): The project file to load.
+
+        Returns:
+            Optional[Project]: The loaded project, or None if the file could not be loaded.
+        """
+        path = os.path.abspath(filename)
+        project_id = self._file_for(filename)
+        with self._lock:
+            if project_id in self._projects:
+                self._projects.move_to_end(project_id)
+                return self._projects[project_id]
+            task = self._loading.get(path)
+            if task is None:
+                task = asyncio.ensure_future(self._load(filename))
+                self._loading[path] = task
+                task.add_done_callback(lambda _: self._loading.pop(path, None))
+        # A cancelled caller does not cancel the load the others wait for
+        return await asyncio.shield(task)
+
+    async def _load(self, filename: str) -> Optional[Project]:
+        """
+        Reads a project file and adds it to the pool.
+        """
+        project = Project()
+        if not await project.load_project(filename):
+            return None
+        with self._lock:
+            self._files[project.metadata["project_id"]] = os.path.abspath(filename)
+        await self.add(project)
+        return project
+
+    async def _evict(self) -> None:
+        """
+        Saves and drops the least recently used projects that are not held until the pool fits its bound.
+        """
+        while True:
+            with self._lock:
+                if len(self._projects) <= self.max_projects:
+                    return
+                project_id = next((known for known in self._projects if known not in self._users), None)
+                if project_id is None:
+                    # Every project is in use, the pool shrinks back on a later add
+                    return
+                project = self._projects[project_id]
+            # The project stays pooled while it is saved, so it is never read back from a stale file
+            if not project.metadata["saved"]:
+                if not project.metadata.get("filename"):
+                    project.metadata["filename"] = project_id
+                await project.save_project(None)
+            with self._lock:
+                # It may have been held, changed or replaced while it was saved
+                if (project_id in self._users or not project.metadata["saved"]
+                        or self._projects.get(project_id) is not project):
+                    continue
+                del self._projects[project_id]
+                self._files[project_id] = os.path.abspath(f'{project.metadata["filename"]}.{DEF_EXT}')
+                CACHE_EVICTIONS.inc(cache="project_pool")
+                LOADED_PROJECTS.set(len(self._projects))
+
+    @std.async_timing
+    async def save_all(self) -> None:
+        """
+        Saves every pooled project with unsaved changes.
+        """
+        with self._lock:
+            projects = list(self._projects.values())
+        for project in projects:
+            if not project.metadata["saved"]:
+                await project.save_project(None)
@@ -0,0 +1,143 @@
+"""
+Author: Plantius (https://github.com/Plantius)
+Filename: ./mc_mp/modpack/search.py
+Last Edited: 2026-10-19
+
+This module is part of the MC Modpack Creator project. For more details, visit:
+https://github.com/Plantius/mc_modpack_creator
+"""
+from mc_mp.constants import MAX_WORKERS, SEARCH_PAGE_SIZE
+from mc_mp.modpack.project_api import ProjectAPI
+import mc_mp.standard as std
+from typing import Optional, Dict, Any, List
+import asyncio
+
+class SearchPager:
+    """
+    Streams Modrinth search results page by page, prefetching the next page and
+    the version lists of the visible hits in the background.
+    """
+
+    def __init__(self, api: ProjectAPI, page_size: int = SEARCH_PAGE_SIZE,
+                 version_filters: Optional[Dict[str, Any]] = None, **kwargs) -> None:
+        """
+        Initializes the pager for a search query.
+
+        Args:
+            api (ProjectAPI): The API used for searching and listing versions.
+            page_size (int): Number of hits per page.
+            version_filters (Optional[Dict[str, Any]]): Filters passed to `list_versions` when prefetching,
+                these must match the ones used by `Project.get_versions_id` to hit its cache.
+            **kwargs: Search parameters passed to `search_project`.
+        """
+        self.api = api
+        self.page_size = page_size
+        self.params = {k: v for k, v in kwargs.items() if k not in ("offset", "limit")}
+        self.version_filters = version_filters or {}
+        self.pages: Dict[int, dict] = {}
+        self.hits: List[dict] = []
+        self.total_hits: Optional[int] = None
+        self._next_page = 0
+        self._page_tasks: Dict[int, asyncio.Task] = {}
+        self._version_tasks: Dict[str, asyncio.Task] = {}
+        self._semaphore = asyncio.Semaphore(MAX_WORKERS)
+
+    def __aiter__(self) -> "SearchPager":
+        return self
+
+    async def __anext__(self) -> dict:
+        page = await self.next_page()
+        if page is None:
+            raise StopAsyncIteration
+        return page
+
+    @property
+    def has_more(self) -> bool:
+        """Whether more pages may be available."""
+        return self.total_hits is None or len(self.hits) < self.total_hits
+
+    def _schedule_page(self, page: int) -> asyncio.Task:
+        """
+        Starts fetching a page in the background if it is not cached or in flight.
+        """
+        if page not in self._page_tasks:
+            self._page_tasks[page] = asyncio.create_task(self.api.search_project(
+                **self.params, offset=page * self.page_size, limit=self.page_size))
+        return self._page_tasks[page]
+
+    async def _fetch_versions(self, project_id: str) -> Optional[list]:
+        async with self._semaphore:
+            return await self.api.list_versions(id=project_id, **self.version_filters)
+
+    def _prefetch_versions(self, hits: List[dict]) -> None:
+        """
+        Starts fetching the version lists of the given hits in the background.
+        """
+        for hit in hits:
+            project_id = hit.get("project_id")
+            if project_id and project_id not in self._version_tasks:
+                self._version_tasks[project_id] = asyncio.create_task(self._fetch_versions(project_id))
+
+    @std.async_timing
+    async def get_page(self, page: int) -> Optional[dict]:
+        """
+        Returns a page of search results, using the page cache when possible.
+
+        Args:
+            page (int): Zero-based page number.
+
+        Returns:
+            Optional[dict]: The search response for the page, or None if the request fails.
+        """
+        if page in self.pages:
+            return self.pages[page]
+        result = await self._schedule_page(page)
+        if result is None:
+            # Allow a retry on the next call
+            del self._page_tasks[page]
+            return None
+        self.pages[page] = result
+        return result
+
+    @std.async_timing
+    async def next_page(self) -> Optional[dict]:
+        """
+        Fetches the next page, appends its hits and prefetches what comes after it.
+
+        Returns:
+            Optional[dict]: The search response, or None if there are no more results.
+        """
+        if not self.has_more:
+            return None
+        result = await self.get_page(self._next_page)
+        if not result or not result.get("hits"):
+            self.total_hits = len(self.hits)
+            return None
+
+        self._next_page += 1
+        self.hits.extend(result["hits"])
+        self.total_hits = result.get("total_hits", self.total_hits)
+        self._prefetch_versions(result["hits"])
+        if self.has_more:
+            self._schedule_page(self._next_page)
+        return result
+
+    @std.async_timing
+    async def wait_versions(self, ids: List[str]) -> None:
+        """
+        Waits for the prefetches of the given project IDs that are still in flight.
+
+        Args:
+            ids (List[str]): Project IDs about to be fetched.
+        """
+        tasks = [self._version_tasks[id] for id in ids if id in self._version_tasks]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def close(self) -> None:
+        """
+        Cancels all background fetches that are still running.
+        """
+        for task in list(self._page_tasks.values()) + list(self._version_tasks.values()):
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,133 @@
+"""
+Author: Plantius (https://github.com/Plantius)
+Filename: ./mc_mp/modpack/server_pack.py
+Last Edited: 2026-10-19
+
+This module is part of the MC Modpack Creator project. For more details, visit:
+https://github.com/Plantius/mc_modpack_creator
+"""
+from mc_mp.constants import MOD_PATH, SERVER_DIR
+from mc_mp.modpack.artifacts import ArtifactStore, link
+from mc_mp.modpack.fleet import Fleet
+from mc_mp.modpack.loader_meta import LOADER_META, SERVER_LAUNCHERS
+from mc_mp.modpack.mod import Mod
+from mc_mp.modpack.project import Project
+import mc_mp.metrics as metrics
+import mc_mp.standard as std
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import os
+
+class ServerPackBuilder:
+    """
+    Builds runnable dedicated server directories from projects.
+
+    Jars come from a shared artifact store and are hard linked into each server,
+    so building many servers downloads and stores every unique file once.
+    """
+
+    def __init__(self, store: Optional[ArtifactStore] = None) -> None:
+        """
+        Initializes the builder.
+
+        Args:
+            store (Optional[ArtifactStore]): Artifact store to use, the default cache directory if None.
+        """
+        self.store = store if store is not None else ArtifactStore()
+
+    @staticmethod
+    def server_mods(project: Project) -> List[Mod]:
+        """
+        Returns the mods a server needs, leaving out client-only mods.
+
+        Args:
+            project (Project): The project to build.
+
+        Returns:
+            List[Mod]: Mods not marked as unsupported on the server, mods without side info are kept.
+        """
+        return [mod for mod in project.modpack.mod_data if mod.server_side != "unsupported"]
+
+    @staticmethod
+    async def loader_artifact(project: Project) -> Optional[Tuple[str, str]]:
+        """
+        Returns the download URL and file name of the server loader of a project.
+
+        Args:
+            project (Project): The project to build.
+
+        Returns:
+            Optional[Tuple[str, str]]: The URL and file name, or None if the loader has no downloadable server launcher.
+        """
+        if project.modpack.mod_loader not in SERVER_LAUNCHERS:
+            return None
+        loader_version = await project.get_loader_version()
+        if loader_version is None:
+            return None
+        return await LOADER_META.server_launcher(project.modpack.mod_loader, project.modpack.mc_version, loader_version)
+
+    @std.async_timing
+    @metrics.timed()
+    async def build(self, project: Project, dest: str) -> bool:
+        """
+        Builds a server directory for a project, removing mods of earlier builds that are no longer part of it.
+
+        Args:
+            project (Project): The project to build.
+            dest (str): The server directory.
+
+        Returns:
+            bool: True if every file is downloaded, verified and placed, otherwise False.
+        """
+        mods_dir = os.path.join(dest, MOD_PATH)
+        os.makedirs(mods_dir, exist_ok=True)
+
+        # (url, hashes, destination) of every file the server needs
+        files = []
+        for mod in self.server_mods(project):
+            primary = mod.primary_file()
+            if primary is None:
+                std.eprint(f"[ERROR] No primary file for mod: {mod.title}")
+                continue
+            files.append((primary["url"], primary["hashes"], os.path.join(mods_dir, primary["filename"])))
+        loader = await self.loader_artifact(project)
+        if loader is not None:
+            files.append((loader[0], None, os.path.join(dest, loader[1])))
+        else:
+            print(f"[INFO] No server launcher for {project.modpack.mod_loader}, install the loader manually.")
+
+        paths = await asyncio.gather(*[self.store.fetch(url, hashes) for url, hashes, _ in files])
+        success = True
+        for (_, _, target), path in zip(files, paths):
+            if path is None:
+                success = False
+                continue
+            link(path, target)
+
+        wanted = {os.path.basename(target) for _, _, target in files}
+        for name in os.listdir(mods_dir):
+            if name not in wanted:
+                os.remove(os.path.join(mods_dir, name))
+        return success
+
+    @std.async_timing
+    async def build_many(self, filenames: Optional[List[str]] = None, dest_root: str = SERVER_DIR) -> Dict[str, bool]:
+        """
+        Builds the servers of many projects concurrently, each in a directory named after its project file.
+
+        Args:
+            filenames (Optional[List[str]]): Project files to build, all project files in the current directory if None.
+            dest_root (str): Directory the server directories are created in.
+
+        Returns:
+            Dict[str, bool]: Whether each project file was built successfully.
+        """
+        fleet = Fleet(filenames)
+        projects = await fleet.load()
+        names = list(projects)
+        results = await asyncio.gather(*[
+            self.build(projects[filename], os.path.join(dest_root, os.path.splitext(os.path.basename(filename))[0]))
+            for filename in names])
+        built = dict(zip(names, results))
+        built.update({filename: False for filename in fleet.filenames if filename not in built})
+        return built
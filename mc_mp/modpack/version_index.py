@@ -0,0 +1,147 @@
+"""
+Author: Plantius (https://github.com/Plantius)
+Filename: ./mc_mp/modpack/version_index.py
+Last Edited: 2026-10-19
+
+This module is part of the MC Modpack Creator project. For more details, visit:
+https://github.com/Plantius/mc_modpack_creator
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import bisect
+import mc_mp.standard as std
+
+# Stability of a Modrinth version type, higher is more stable
+RELEASE_RANK = {"alpha": 0, "beta": 1, "release": 2}
+
+@dataclass(frozen=True, slots=True)
+class VersionRecord:
+    """
+    A Modrinth version normalized once on ingest for cheap comparisons.
+    """
+
+    id: str
+    project_id: str
+    timestamp: float
+    version: tuple
+    rank: int
+    loaders: frozenset
+    game_versions: frozenset
+    data: dict = field(compare=False, hash=False, repr=False)
+
+    @property
+    def sort_key(self) -> tuple:
+        """Key ordering records from oldest to newest."""
+        return (self.timestamp, self.version)
+
+    @classmethod
+    def from_json(cls, data: dict) -> "VersionRecord":
+        """
+        Normalizes a version payload from the Modrinth API.
+
+        Args:
+            data (dict): The version payload.
+
+        Returns:
+            VersionRecord: The normalized record.
+        """
+        return cls(
+            id=data.get("id", ""),
+            project_id=data.get("project_id", ""),
+            timestamp=std.parse_timestamp(data.get("date_published", "")),
+            version=std.version_key(data.get("version_number", "")),
+            rank=RELEASE_RANK.get(data.get("version_type", "release"), 0),
+            loaders=frozenset(data.get("loaders", [])),
+            game_versions=frozenset(data.get("game_versions", [])),
+            data=data
+        )
+
+
+class VersionIndex:
+    """
+    Index of version records per project, kept sorted by publication date and version number.
+    """
+
+    def __init__(self, versions: Optional[List[dict]] = None) -> None:
+        """
+        Initializes the index, optionally ingesting a list of version payloads.
+
+        Args:
+            versions (Optional[List[dict]]): Version payloads to ingest.
+        """
+        self._records: Dict[str, List[VersionRecord]] = {}
+        self._keys: Dict[str, List[tuple]] = {}
+        self._ids: set = set()
+        if versions:
+            self.add(versions)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, version_id: str) -> bool:
+        return version_id in self._ids
+
+    @std.sync_timing
+    def add(self, versions: List[dict]) -> None:
+        """
+        Normalizes and inserts version payloads, skipping versions already indexed.
+
+        Args:
+            versions (List[dict]): Version payloads from the Modrinth API.
+        """
+        for data in versions:
+            if not data or data.get("id") in self._ids:
+                continue
+            record = VersionRecord.from_json(data)
+            self._ids.add(record.id)
+            records = self._records.setdefault(record.project_id, [])
+            keys = self._keys.setdefault(record.project_id, [])
+            position = bisect.bisect_right(keys, record.sort_key)
+            keys.insert(position, record.sort_key)
+            records.insert(position, record)
+
+    def versions(self, project_id: str) -> List[VersionRecord]:
+        """
+        Returns all indexed versions of a project, newest first.
+        """
+        return self._records.get(project_id, [])[::-1]
+
+    @std.sync_timing
+    def latest(self, project_id: str, loader: Optional[str] = None,
+               game_version: Optional[str] = None, min_type: str = "release") -> Optional[VersionRecord]:
+        """
+        Finds the newest version of a project matching the given filters.
+
+        Args:
+            project_id (str): The project to search.
+            loader (Optional[str]): Required mod loader.
+            game_version (Optional[str]): Required Minecraft version.
+            min_type (str): Least stable version type accepted (alpha, beta or release).
+
+        Returns:
+            Optional[VersionRecord]: The newest matching record, or None if nothing matches.
+        """
+        min_rank = RELEASE_RANK.get(min_type, 0)
+        for record in reversed(self._records.get(project_id, [])):
+            if record.rank < min_rank:
+                continue
+            if loader and loader not in record.loaders:
+                continue
+            if game_version and game_version not in record.game_versions:
+                continue
+            return record
+        return None
+
+    @staticmethod
+    def is_newer(record: VersionRecord, date_published: str) -> bool:
+        """
+        Checks if a record was published after the given date.
+
+        Args:
+            record (VersionRecord): The candidate version.
+            date_published (str): Publication date of the current version.
+
+        Returns:
+            bool: True if the record is newer, otherwise False.
+        """
+        return record.timestamp > std.parse_timestamp(date_published)
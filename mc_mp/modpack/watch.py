@@ -0,0 +1,191 @@
+"""
+Author: Plantius (https://github.com/Plantius)
+Filename: ./mc_mp/modpack/watch.py
+Last Edited: 2026-10-19
+
+This module is part of the MC Modpack Creator project. For more details, visit:
+https://github.com/Plantius/mc_modpack_creator
+"""
+from mc_mp.constants import WATCH_STATE_FILE, WATCH_INTERVAL, WATCH_JITTER
+from mc_mp.modpack.fleet import Fleet
+from mc_mp.modpack.project_api import ProjectAPI
+import mc_mp.standard as std
+from typing import Callable, Dict, List, Optional
+import asyncio
+import json
+import os
+import random
+import time
+
+# Delta types reported by a check
+NEW_VERSION = "new_version"
+REMOVED_VERSION = "removed_version"
+
+class UpdateWatcher:
+    """
+    Periodically checks the mods of a set of projects for new and removed versions.
+
+    Every check fetches the project information of all mods in batches and compares each
+    project's version list with the persisted state, versions are only fetched for projects
+    that changed since the last check.
+    """
+
+    def __init__(self, filenames: Optional[List[str]] = None, state_file: str = WATCH_STATE_FILE,
+                 interval: float = WATCH_INTERVAL, jitter: float = WATCH_JITTER, apply: bool = False) -> None:
+        """
+        Initializes the watcher and loads its state.
+
+        Args:
+            filenames (Optional[List[str]]): Project files to watch, all project files in the current directory if None.
+            state_file (str): File the last seen versions are persisted in.
+            interval (float): Seconds between checks.
+            jitter (float): Fraction the interval is randomly shortened or lengthened by.
+            apply (bool): Update and save the projects when new versions are found.
+        """
+        self.filenames = filenames
+        self.state_file = state_file
+        self.interval = interval
+        self.jitter = jitter
+        self.apply = apply
+        self.state = self.load_state()
+
+    def load_state(self) -> dict:
+        """
+        Reads the persisted state, starting empty if there is none or it is unreadable.
+
+        Returns:
+            dict: The state with the last seen versions per project ID.
+        """
+        try:
+            with open(self.state_file, "r") as file:
+                state = json.load(file)
+        except FileNotFoundError:
+            return {"projects": {}, "last_check": None}
+        except (OSError, ValueError) as e:
+            std.eprint(f"[ERROR] Could not read watch state {self.state_file}: {e}")
+            return {"projects": {}, "last_check": None}
+        state.setdefault("projects", {})
+        return state
+
+    def save_state(self) -> None:
+        """
+        Writes the state atomically, so an interrupted write never corrupts it.
+        """
+        directory = os.path.dirname(self.state_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.state_file}.tmp"
+        with open(tmp, "w") as file:
+            json.dump(self.state, file, indent=1)
+        os.replace(tmp, self.state_file)
+
+    def next_delay(self) -> float:
+        """
+        Returns the jittered delay until the next check, so many watchers do not hit the API at the same time.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        return max(self.interval * (1 + random.uniform(-self.jitter, self.jitter)), 0.0)
+
+    @std.async_timing
+    async def check(self) -> List[dict]:
+        """
+        Runs one check and updates the persisted state.
+
+        Returns:
+            List[dict]: The deltas found, each with type, project_id, title, version_id, version_number and files.
+        """
+        fleet = Fleet(self.filenames)
+        await fleet.load()
+        ids = fleet.project_ids()
+        # Responses are cached for an hour, a check must see the current state
+        await ProjectAPI.clear_caches()
+        info_by_id = await fleet.fetch_infos(ids)
+
+        known = self.state["projects"]
+        changed = {}
+        for project_id, info in info_by_id.items():
+            seen = known.get(project_id)
+            if seen is not None and seen["updated"] == info.get("updated") and seen["versions"] == info.get("versions", []):
+                continue
+            changed[project_id] = (seen, info)
+
+        # Only projects that changed cost a versions request
+        new_ids = [pid for pid, (seen, info) in changed.items()
+                   if seen is not None and set(info.get("versions", [])) - set(seen["versions"])]
+        if new_ids:
+            await fleet.fetch_versions(new_ids)
+
+        installed: Dict[str, Dict[str, List[str]]] = {}
+        for filename, project in fleet.projects.items():
+            for mod in project.modpack.mod_data:
+                installed.setdefault(mod.project_id, {}).setdefault(mod.id, []).append(filename)
+
+        deltas = []
+        for project_id, (seen, info) in changed.items():
+            versions = info.get("versions", [])
+            known[project_id] = {"updated": info.get("updated"), "versions": versions}
+            if seen is None:
+                # First time this project is seen, its versions become the baseline
+                continue
+            for version_id in [v for v in versions if v not in seen["versions"]]:
+                record = next((r for r in fleet.versions.versions(project_id) if r.id == version_id), None)
+                files = [filename for filename in sorted({f for fs in installed.get(project_id, {}).values() for f in fs})
+                         if record is not None and fleet.projects[filename].modpack.mod_loader in record.loaders
+                         and fleet.projects[filename].modpack.mc_version in record.game_versions]
+                deltas.append({
+                    "type": NEW_VERSION,
+                    "project_id": project_id,
+                    "title": info.get("title"),
+                    "version_id": version_id,
+                    "version_number": record.data.get("version_number") if record is not None else None,
+                    "files": files
+                })
+            for version_id in [v for v in seen["versions"] if v not in versions]:
+                deltas.append({
+                    "type": REMOVED_VERSION,
+                    "project_id": project_id,
+                    "title": info.get("title"),
+                    "version_id": version_id,
+                    "version_number": None,
+                    "files": installed.get(project_id, {}).get(version_id, [])
+                })
+
+        if self.apply and new_ids:
+            updated_infos = {pid: info_by_id[pid] for pid in new_ids}
+            to_save = [filename for filename, project in fleet.projects.items()
+                       if project.apply_latest_versions(fleet.versions, updated_infos)]
+            await fleet.save(to_save)
+
+        self.state["last_check"] = time.time()
+        self.save_state()
+        return deltas
+
+    @staticmethod
+    def format_delta(delta: dict) -> str:
+        """Formats a delta as a single report line."""
+        files = ", ".join(delta["files"]) if delta["files"] else "no watched project"
+        if delta["type"] == NEW_VERSION:
+            return f"[UPDATE] {delta['title']}: new version {delta['version_number'] or delta['version_id']} ({files})"
+        return f"[REMOVED] {delta['title']}: version {delta['version_id']} was removed ({files})"
+
+    @std.async_timing
+    async def run(self, cycles: Optional[int] = None, report: Callable[[str], None] = print) -> None:
+        """
+        Checks repeatedly with jittered delays until cancelled or the given number of cycles ran.
+
+        Args:
+            cycles (Optional[int]): Number of checks to run, forever if None.
+            report (Callable[[str], None]): Called with one line per delta.
+        """
+        done = 0
+        while cycles is None or done < cycles:
+            try:
+                for delta in await self.check():
+                    report(self.format_delta(delta))
+            except Exception as e:
+                std.eprint(f"[ERROR] Update check failed: {e}")
+            done += 1
+            if cycles is None or done < cycles:
+                await asyncio.sleep(self.next_delay())
@@ -0,0 +1,110 @@
+"""
+Author: Plantius (https://github.com/Plantius)
+Filename: ./mc_mp/profiling.py
+Last Edited: 2026-10-19
+
+This module is part of the MC Modpack Creator project. For more details, visit:
+https://github.com/Plantius/mc_modpack_creator
+"""
+from contextlib import contextmanager
+from typing import List, Optional, TextIO
+import cProfile
+import pstats
+import sys
+import threading
+import tracemalloc
+
+# Rows printed for the CPU profile and the allocation sites
+PROFILE_TOP = 25
+ALLOCATION_TOP = 15
+# From 3.12 cProfile hooks sys.monitoring, which already sees every thread and allows one profiler at a time
+PROFILER_SEES_THREADS = sys.version_info >= (3, 12)
+
+def format_size(size: float) -> str:
+    """Formats a number of bytes as a human readable size."""
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+def report_memory(snapshot: tracemalloc.Snapshot, peak: int, limit: int = ALLOCATION_TOP,
+                  out: TextIO = sys.stderr) -> None:
+    """
+    Prints the largest allocation sites of a snapshot and the peak traced memory.
+
+    Args:
+        snapshot (tracemalloc.Snapshot): The snapshot taken at exit.
+        peak (int): Peak traced memory in bytes.
+        limit (int): Number of allocation sites to print.
+        out (TextIO): Stream to print to.
+    """
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, "<unknown>")
+    ))
+    stats = snapshot.statistics("lineno")
+    print(f"[MEMORY] Peak traced memory: {format_size(peak)}", file=out)
+    print(f"[MEMORY] Top {min(limit, len(stats))} allocation sites still held at exit:", file=out)
+    for stat in stats[:limit]:
+        frame = stat.traceback[0]
+        print(f"  {format_size(stat.size):>10} in {stat.count:>7} blocks  {frame.filename}:{frame.lineno}", file=out)
+
+def profile_threads(profilers: List[cProfile.Profile]) -> None:
+    """
+    Profiles every thread started from now on with its own profiler, appended to profilers.
+
+    cProfile only profiles the thread that enabled it before Python 3.12, so the executor and
+    job queue threads would otherwise be missing from the profile.
+
+    Args:
+        profilers (List[cProfile.Profile]): Receives the profiler of each new thread.
+    """
+    lock = threading.Lock()
+
+    def start(frame, event, arg):
+        # Called once on the first event of a new thread, enabling the profiler replaces this hook
+        profiler = cProfile.Profile()
+        with lock:
+            profilers.append(profiler)
+        profiler.enable()
+    threading.setprofile(start)
+
+@contextmanager
+def capture(cpu_file: Optional[str] = None, memory: bool = False, out: TextIO = sys.stderr):
+    """
+    Runs the enclosed code under cProfile and/or tracemalloc and reports the results on exit.
+    The CPU profile covers the threads started inside the block as well as the calling thread.
+
+    Args:
+        cpu_file (Optional[str]): File the pstats output is written to, CPU profiling is off when None.
+        memory (bool): Trace memory allocations and print the top sites and peak usage.
+        out (TextIO): Stream the reports are printed to.
+    """
+    profiler = cProfile.Profile() if cpu_file else None
+    thread_profilers: List[cProfile.Profile] = []
+    if memory:
+        tracemalloc.start()
+    if profiler is not None:
+        if not PROFILER_SEES_THREADS:
+            profile_threads(thread_profilers)
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            threading.setprofile(None)
+            stats = pstats.Stats(profiler, stream=out)
+            for thread_profiler in thread_profilers:
+                stats.add(thread_profiler)
+            stats.dump_stats(cpu_file)
+            print(f"[PROFILE] CPU profile written to {cpu_file}", file=out)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_TOP)
+        if memory:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            report_memory(snapshot, peak, out=out)
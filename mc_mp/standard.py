@@ -7,16 +7,16 @@ This module is part of the MC Modpack Creator project. For more details, visit:
 https://github.com/Plantius/mc_modpack_creator
 """
 from mc_mp.constants import DEF_EXT, BUF_SIZE
+import mc_mp.tracing as tracing
 from enum import Enum, auto
-import os
 import sys
 import inspect
 import glob
-import zipfile
 import hashlib
-import time 
 import functools
 import uuid
+import re
+from datetime import datetime, timezone
 
 class Setting(Enum):
     TITLE = auto()
@@ -31,10 +31,12 @@ debug_flag = False
 
 def set_debug_flag(enable: bool) -> None:
     """
-    Enables or disables debug flag, which controls timing wrappers and other debug functionality.
+    Enables or disables debug flag, which controls tracing and other debug functionality.
     """
     global debug_flag
     debug_flag = enable
+    if enable:
+        tracing.TRACER.enable()
 
 def is_debug_flag() -> bool:
     """
@@ -43,36 +45,12 @@ def is_debug_flag() -> bool:
     return debug_flag
 
 def async_timing(func):
-    """Decorator to measure the execution time of an async function."""
-    
-    @functools.wraps(func)
-    async def wrapper(*args, **kwargs):
-        if not is_debug_flag():
-            return await func(*args, **kwargs)
-        start_time = time.monotonic()  # Start time measurement
-        result = await func(*args, **kwargs)
-        end_time = time.monotonic()  # End time measurement
-        duration = end_time - start_time
-        print(f"[TIMER] {func.__name__} executed in {duration:.4f} seconds")
-        return result
-    
-    return wrapper
+    """Decorator to trace the execution time of an async function, see `mc_mp.tracing`."""
+    return tracing.trace_async(func)
 
 def sync_timing(func):
-    """Decorator to measure the execution time of a synchronous function."""
-    
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        if not is_debug_flag():
-            return func(*args, **kwargs)
-        start_time = time.monotonic()  # Start time measurement
-        result = func(*args, **kwargs)
-        end_time = time.monotonic()  # End time measurement
-        duration = end_time - start_time
-        print(f"[TIMER] {func.__name__} executed in {duration:.4f} seconds")
-        return result
-    
-    return wrapper
+    """Decorator to trace the execution time of a synchronous function, see `mc_mp.tracing`."""
+    return tracing.trace_sync(func)
 
 
 def get_variables(obj) -> dict:
@@ -114,6 +92,41 @@ def get_index(lst: list, item) -> int:
     except ValueError:
         return -1
 
+VERSION_PATTERN = re.compile(r"\d+(?:\.\d+)*")
+
+@functools.lru_cache(maxsize=1 << 16)
+def version_key(version: str) -> tuple:
+    """
+    Converts a version string into a tuple that sorts numerically.
+
+    The first dotted number sequence is compared numerically, final releases sort
+    after pre-releases with the same numbers (e.g. "1.20-rc1" < "1.20"), build
+    metadata after a "+" is ignored for that purpose.
+    """
+    match = VERSION_PATTERN.search(version or "")
+    if not match:
+        return ((), 0, version or "")
+    numbers = tuple(int(n) for n in match.group(0).split('.'))
+    suffix = version[match.end():]
+    return (numbers, 0 if suffix and not suffix.startswith("+") else 1, suffix)
+
+@functools.lru_cache(maxsize=1 << 16)
+def parse_timestamp(date: str) -> float:
+    """
+    Converts an ISO 8601 date string into a UTC epoch timestamp.
+
+    Naive dates are treated as UTC, missing or unparsable dates return 0.0 so they sort as oldest.
+    """
+    if not date:
+        return 0.0
+    try:
+        parsed = datetime.fromisoformat(date.replace("Z", "+00:00"))
+    except ValueError:
+        return 0.0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
 def get_project_files() -> list:
     """Returns a sorted list of JSON files in the current directory."""
     return sorted(glob.glob(f"./*.{DEF_EXT}"))
@@ -137,10 +150,3 @@ def check_hash(filename: str, hashes: dict) -> bool:
             sha1.update(data)
             sha512.update(data)
     return sha1.hexdigest() == hashes["sha1"] and sha512.hexdigest() == hashes["sha512"]
-
-def zip_dir(filename: str, mp_dir: str):
-    with zipfile.ZipFile(f"{filename}.mrpack", "w") as file:
-        for root, subdirs, files in os.walk(mp_dir):
-            cur_dir = root[len(mp_dir):]
-            for filename in files:
-                file.write(os.path.join(root, filename), os.path.join(cur_dir, filename))
@@ -0,0 +1,247 @@
+"""
+Author: Plantius (https://github.com/Plantius)
+Filename: ./mc_mp/tracing.py
+Last Edited: 2026-10-19
+
+This module is part of the MC Modpack Creator project. For more details, visit:
+https://github.com/Plantius/mc_modpack_creator
+"""
+from contextvars import ContextVar
+from typing import Optional, Dict, List, Tuple
+import asyncio
+import contextvars
+import functools
+import itertools
+import json
+import os
+import random
+import threading
+import time
+
+# Maximum number of spans kept for the trace file, aggregates keep counting after that
+MAX_TRACE_SPANS = 1 << 20
+# Durations sampled per span name for the p95, count and total cover every call
+MAX_DURATION_SAMPLES = 1024
+
+# A finished span: (id, parent id, name, start ns, duration ns, lane)
+Span = Tuple[int, Optional[int], str, int, int, int]
+
+def _lane() -> int:
+    """Returns the asyncio task or thread the current span runs in, so concurrent spans do not overlap."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return id(task) if task is not None else threading.get_ident()
+
+
+class Tracer:
+    """
+    Records nested timing spans of traced functions and aggregates them per function.
+    Disabled tracers cost one attribute check per call.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._ids = itertools.count(1)
+        self._current: ContextVar[Optional[int]] = ContextVar("mc_mp_span", default=None)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def enable(self) -> None:
+        """Starts recording spans."""
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stops recording spans, recorded spans are kept."""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Drops all recorded spans and aggregates."""
+        with self._lock:
+            self.origin = time.perf_counter_ns()
+            self.spans: List[Span] = []
+            self.dropped = 0
+            # Per name: call count, total duration and a reservoir sample of durations, so a long
+            # running process keeps a bounded amount of memory
+            self._durations: Dict[str, list] = {}
+
+    def start(self, name: str) -> Tuple[int, Optional[int], object, int]:
+        """
+        Opens a span as a child of the current one.
+
+        Args:
+            name (str): The span name.
+
+        Returns:
+            Tuple[int, Optional[int], object, int]: Handle to pass to `finish`.
+        """
+        span_id = next(self._ids)
+        parent = self._current.get()
+        token = self._current.set(span_id)
+        return span_id, parent, token, time.perf_counter_ns()
+
+    def finish(self, name: str, handle: Tuple[int, Optional[int], object, int]) -> None:
+        """
+        Closes a span opened by `start` and records it.
+
+        Args:
+            name (str): The span name.
+            handle (Tuple[int, Optional[int], object, int]): The handle returned by `start`.
+        """
+        end = time.perf_counter_ns()
+        span_id, parent, token, start = handle
+        try:
+            self._current.reset(token)
+        except ValueError:
+            # Finished in another context than it was started in, e.g. a generator resumed elsewhere
+            pass
+        duration = end - start
+        with self._lock:
+            durations = self._durations.get(name)
+            if durations is None:
+                durations = self._durations[name] = [0, 0, []]
+            durations[0] += 1
+            durations[1] += duration
+            samples = durations[2]
+            if len(samples) < MAX_DURATION_SAMPLES:
+                samples.append(duration)
+            else:
+                slot = random.randrange(durations[0])
+                if slot < MAX_DURATION_SAMPLES:
+                    samples[slot] = duration
+            if len(self.spans) < MAX_TRACE_SPANS:
+                self.spans.append((span_id, parent, name, start - self.origin, duration, _lane()))
+            else:
+                self.dropped += 1
+
+    def stats(self) -> Dict[str, dict]:
+        """
+        Aggregates the recorded spans per name.
+
+        Returns:
+            Dict[str, dict]: Per name the call count and the total, mean and p95 duration in seconds,
+            the p95 is estimated from a sample once a name has more than MAX_DURATION_SAMPLES calls.
+        """
+        with self._lock:
+            durations = {name: (count, total, sorted(samples))
+                         for name, (count, total, samples) in self._durations.items()}
+        stats = {}
+        for name, (count, total, samples) in durations.items():
+            stats[name] = {
+                "count": count,
+                "total": total / 1e9,
+                "mean": total / count / 1e9,
+                "p95": samples[min(int(len(samples) * 0.95), len(samples) - 1)] / 1e9
+            }
+        return stats
+
+    def summary(self, limit: int = 30) -> str:
+        """
+        Formats the aggregates as a table, slowest total first.
+
+        Args:
+            limit (int): Maximum number of rows.
+
+        Returns:
+            str: The table.
+        """
+        rows = sorted(self.stats().items(), key=lambda item: item[1]["total"], reverse=True)[:limit]
+        width = max([len(name) for name, _ in rows] + [8])
+        lines = [f"{'function':<{width}} {'calls':>8} {'total s':>10} {'mean ms':>10} {'p95 ms':>10}"]
+        for name, stat in rows:
+            lines.append(f"{name:<{width}} {stat['count']:>8} {stat['total']:>10.4f} "
+                         f"{stat['mean'] * 1e3:>10.3f} {stat['p95'] * 1e3:>10.3f}")
+        if self.dropped:
+            lines.append(f"{self.dropped} spans were aggregated but not kept for the trace file")
+        return "\n".join(lines)
+
+    def write_jsonl(self, filename: str) -> None:
+        """
+        Writes one JSON object per span, times in seconds since the tracer was reset.
+
+        Args:
+            filename (str): The output file.
+        """
+        with self._lock:
+            spans = list(self.spans)
+        with open(filename, "w") as file:
+            for span_id, parent, name, start, duration, lane in spans:
+                file.write(json.dumps({"id": span_id, "parent": parent, "name": name, "start": start / 1e9,
+                                       "duration": duration / 1e9, "lane": lane}) + "\n")
+
+    def write_chrome_trace(self, filename: str) -> None:
+        """
+        Writes the spans in the Chrome trace event format, viewable in chrome://tracing or Perfetto.
+
+        Args:
+            filename (str): The output file.
+        """
+        with self._lock:
+            spans = list(self.spans)
+        lanes: Dict[int, int] = {}
+        events = [{
+            "name": name,
+            "ph": "X",
+            "ts": start / 1e3,
+            "dur": duration / 1e3,
+            "pid": os.getpid(),
+            "tid": lanes.setdefault(lane, len(lanes) + 1),
+            "args": {"id": span_id, "parent": parent}
+        } for span_id, parent, name, start, duration, lane in spans]
+        with open(filename, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+    def write(self, filename: str) -> None:
+        """
+        Writes the trace as JSONL if the filename ends in .jsonl, otherwise as a Chrome trace.
+
+        Args:
+            filename (str): The output file.
+        """
+        if filename.endswith(".jsonl"):
+            self.write_jsonl(filename)
+        else:
+            self.write_chrome_trace(filename)
+
+
+TRACER = Tracer()
+
+def in_context(func, *args):
+    """
+    Binds a call to a copy of the current context, for executor threads which do not inherit it,
+    so spans started in the thread nest under the span that submitted the call.
+    """
+    return functools.partial(contextvars.copy_context().run, func, *args)
+
+def trace_async(func):
+    """Decorator recording a span for every call of an async function."""
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if not TRACER.enabled:
+            return await func(*args, **kwargs)
+        handle = TRACER.start(name)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            TRACER.finish(name, handle)
+
+    return wrapper
+
+def trace_sync(func):
+    """Decorator recording a span for every call of a synchronous function."""
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not TRACER.enabled:
+            return func(*args, **kwargs)
+        handle = TRACER.start(name)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            TRACER.finish(name, handle)
+
+    return wrapper
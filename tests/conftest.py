@@ -0,0 +1,71 @@
+import pytest
+import hashlib
+from unittest.mock import MagicMock, AsyncMock
+from mc_mp.modpack.project import Project
+from web_app.app import create_app, db
+
+CDN = "https://cdn.example/"
+
+def build_version(project_id, version_id, number="1.0", date="2024-01-01T00:00:00Z", loader="fabric",
+                  changelog="", jar=None):
+    """Builds a Modrinth version payload, with a primary file holding the jar bytes if given."""
+    files = []
+    if jar is not None:
+        filename = f"{project_id.lower()}.jar"
+        files = [{"url": f"{CDN}{filename}", "filename": filename, "primary": True, "size": len(jar),
+                  "hashes": {"sha1": hashlib.sha1(jar).hexdigest(), "sha512": hashlib.sha512(jar).hexdigest()}}]
+    return {"id": version_id, "project_id": project_id, "name": f"{project_id} {number}", "changelog": changelog,
+            "version_number": number, "dependencies": [], "game_versions": ["1.20.1"], "version_type": "release",
+            "loaders": [loader], "date_published": date, "files": files}
+
+def build_session(files, status=200, headers=None):
+    """
+    Builds a session whose get serves the given bytes by URL, with the given status and headers.
+    The response of each URL is kept in session.responses so tests can change it.
+    """
+    session = MagicMock()
+    session.responses = {}
+    for url, body in files.items():
+        response = MagicMock(status=status, headers=headers or {})
+        response.read = AsyncMock(return_value=body)
+        session.responses[url] = response
+    def get(url, **kwargs):
+        context = MagicMock()
+        context.__aenter__ = AsyncMock(return_value=session.responses[url])
+        context.__aexit__ = AsyncMock(return_value=False)
+        return context
+    session.get.side_effect = get
+    return session
+
+@pytest.fixture
+def version():
+    return build_version
+
+@pytest.fixture
+def fake_session():
+    return build_session
+
+@pytest.fixture
+def create_pack(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    async def create(title, mods, save=True, mod_loader="fabric", mc_version="1.20.1", **settings):
+        """Creates a project from (version, project info) pairs, saved as title.modpack unless save is False."""
+        project = Project()
+        project.create_project(title=title, mod_loader=mod_loader, mc_version=mc_version, **settings)
+        for version, info in mods:
+            project.add_mod(info["title"], version, info)
+        if save:
+            await project.save_project(title)
+        return project
+    return create
+
+@pytest.fixture
+def app(tmp_path):
+    """A web app on a database in tmp_path, its job queue is stopped afterwards."""
+    app = create_app(test_config={"TESTING": True,
+                                  "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'app.sqlite'}"})
+    with app.app_context():
+        db.create_all()
+    yield app
+    app.extensions['job_queue'].shutdown()
@@ -0,0 +1,110 @@
+import pytest
+import asyncio
+import time
+from unittest.mock import patch
+from mc_mp.modpack.project import Project
+from mc_mp.modpack.jobs import CANCELLED, FAILED, RUNNING
+from web_app.app.api import MAX_PAGE_SIZE
+from web_app.app.storage import ProjectStorage
+
+def make_project(version, title, count):
+    project = Project()
+    project.create_project(title=title, mod_loader="fabric", mc_version="1.20.1")
+    for i in range(count):
+        project.add_mod(f"Mod {i:02}", version(f"MOD{i:02}", f"v{i}"), {"title": f"Mod {i:02}", "description": ""})
+    return project
+
+def add_to_session(app, client, project):
+    """Pools a project and makes it the project of the client's session."""
+    app.extensions['job_queue'].run_coroutine(app.extensions['project_pool'].add(project)).result()
+    with client.session_transaction() as session:
+        session['project_id'] = project.metadata['project_id']
+    return project.metadata['project_id']
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+def test_list_projects_only_shows_the_sessions_project(app, client, version):
+    own, other = make_project(version, "Own", 1), make_project(version, "Other", 2)
+    with app.app_context():
+        ProjectStorage.save_project(other)
+    project_id = add_to_session(app, client, own)
+    client.get(f"/api/projects/{project_id}/mods")
+
+    assert [p["project_id"] for p in client.get("/api/projects").get_json()["projects"]] == [project_id]
+    assert app.test_client().get("/api/projects").get_json() == {"projects": []}
+
+def test_list_mods_answers_304_until_the_project_changes(app, client, version):
+    project = make_project(version, "Pack", 3)
+    project_id = add_to_session(app, client, project)
+
+    response = client.get(f"/api/projects/{project_id}/mods")
+    assert response.status_code == 200 and response.get_json()["total"] == 3
+    etag = response.headers["ETag"]
+    assert client.get(f"/api/projects/{project_id}/mods", headers={"If-None-Match": etag}).status_code == 304
+
+    # An unsaved edit is stored again and gets a new ETag
+    project.add_mod("Extra", version("EXTRA", "e1"), {"title": "Extra", "description": ""})
+    response = client.get(f"/api/projects/{project_id}/mods", headers={"If-None-Match": etag})
+    assert response.status_code == 200 and response.get_json()["total"] == 4
+    assert response.headers["ETag"] != etag
+
+def test_list_mods_clamps_offset_and_limit(app, client, version):
+    project_id = add_to_session(app, client, make_project(version, "Pack", 5))
+
+    page = client.get(f"/api/projects/{project_id}/mods?offset=-3&limit=0").get_json()
+    assert (page["offset"], page["limit"]) == (0, 1)
+    assert [m["title"] for m in page["mods"]] == ["Mod 00"]
+    page = client.get(f"/api/projects/{project_id}/mods?offset=3&limit=100000").get_json()
+    assert page["limit"] == MAX_PAGE_SIZE
+    assert [m["title"] for m in page["mods"]] == ["Mod 03", "Mod 04"]
+
+def test_other_sessions_projects_are_not_found(app, client, version):
+    project_id = add_to_session(app, client, make_project(version, "Pack", 1))
+    stranger = app.test_client()
+
+    assert client.get(f"/api/projects/{project_id}/mods").status_code == 200
+    assert stranger.get(f"/api/projects/{project_id}/mods").status_code == 404
+    assert stranger.post(f"/api/projects/{project_id}/jobs", json={"type": "export"}).status_code == 404
+
+def test_submit_poll_and_cancel_job(app, client, version):
+    project_id = add_to_session(app, client, make_project(version, "Pack", 1))
+    assert client.post(f"/api/projects/{project_id}/jobs", json={"type": "unknown"}).status_code == 400
+
+    async def slow_update(self, progress=None):
+        await asyncio.sleep(60)
+
+    with patch('mc_mp.modpack.project.Project.update_mods_to_latest', slow_update):
+        response = client.post(f"/api/projects/{project_id}/jobs", json={"type": "update"})
+        assert response.status_code == 202
+        job_url = response.headers["Location"]
+        for _ in range(100):
+            if client.get(job_url).get_json()["status"] == RUNNING:
+                break
+            time.sleep(0.01)
+        assert client.get(job_url).get_json()["status"] == RUNNING
+        assert [job["id"] for job in client.get("/api/jobs").get_json()["jobs"]] == [response.get_json()["id"]]
+
+        assert client.delete(job_url).status_code == 200
+        for _ in range(100):
+            if client.get(job_url).get_json()["status"] == CANCELLED:
+                break
+            time.sleep(0.01)
+        assert client.get(job_url).get_json()["status"] == CANCELLED
+        # A finished job cannot be cancelled again
+        assert client.delete(job_url).status_code == 409
+    assert client.get("/api/jobs/unknown").status_code == 404
+    assert client.delete("/api/jobs/unknown").status_code == 404
+
+def test_download_job_fails_if_a_mod_fails(app, client, version):
+    project_id = add_to_session(app, client, make_project(version, "Pack", 2))
+
+    with patch('mc_mp.modpack.project.Project.download_mods', return_value=False):
+        job_url = client.post(f"/api/projects/{project_id}/jobs", json={"type": "download"}).headers["Location"]
+        for _ in range(100):
+            if client.get(job_url).get_json()["status"] == FAILED:
+                break
+            time.sleep(0.01)
+    job = client.get(job_url).get_json()
+    assert job["status"] == FAILED and "failed to download" in job["error"]
@@ -0,0 +1,38 @@
+import pytest
+import asyncio
+import time
+from web_app.app.asgi import ThreadedWsgiToAsgi
+
+LATENCY = 0.5
+
+async def get(asgi_app, path):
+    """Sends a GET request straight to an ASGI app, returning the status and body."""
+    scope = {"type": "http", "method": "GET", "path": path, "query_string": b"", "root_path": "",
+             "http_version": "1.1", "scheme": "http", "headers": [], "server": ("testserver", 80)}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await asgi_app(scope, receive, send)
+    return messages[0]["status"], b"".join(m.get("body", b"") for m in messages[1:])
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_overlap(app):
+    async def slow():
+        await asyncio.sleep(LATENCY)
+        return "done"
+    app.add_url_rule("/slow", view_func=slow)
+    asgi_app = ThreadedWsgiToAsgi(app)
+
+    start = time.perf_counter()
+    responses = await asyncio.gather(*[get(asgi_app, "/slow") for _ in range(4)])
+    elapsed = time.perf_counter() - start
+    asgi_app.shutdown()
+
+    assert responses == [(200, b"done")] * 4
+    # Requests wait on the job queue's loop side by side instead of one after another
+    assert elapsed < 2 * LATENCY
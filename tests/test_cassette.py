@@ -0,0 +1,79 @@
+import pytest
+import json
+from aiohttp import ClientError
+from mc_mp.modpack.cassette import Cassette, RECORD, REPLAY
+
+class FakeResponse:
+    def __init__(self, status, body):
+        self.status = status
+        self.headers = {"Content-Type": "application/json"}
+        self.body = body
+
+    async def read(self):
+        return self.body
+
+    async def json(self):
+        return json.loads(self.body)
+
+class FakeContext:
+    def __init__(self, response):
+        self.response = response
+
+    async def __aenter__(self):
+        return self.response
+
+    async def __aexit__(self, *exc):
+        return False
+
+class FakeSession:
+    closed = False
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+
+    def get(self, url, params=None, **kwargs):
+        return FakeContext(self.responses.pop(0))
+
+@pytest.mark.asyncio
+async def test_record_and_replay(tmp_path):
+    path = str(tmp_path / "traffic.cassette")
+    cassette = Cassette(path, RECORD)
+    session = cassette.wrap(FakeSession([
+        FakeResponse(429, b'{"error": "ratelimited"}'),
+        FakeResponse(200, b'{"id": "AABBCCDD"}'),
+        FakeResponse(200, b'{"id": "AABBCCDD"}')
+    ]))
+    for _ in range(2):
+        async with session.get("https://api/project/AABBCCDD") as response:
+            assert response.status in (200, 429)
+    async with session.get("https://api/projects", params='ids=["AABBCCDD"]') as response:
+        assert await response.json() == {"id": "AABBCCDD"}
+    assert len(cassette) == 3
+    cassette.close()
+
+    replay = Cassette(path, REPLAY, speed=0)
+    async with replay.get("https://api/project/AABBCCDD") as response:
+        assert response.status == 429
+        with pytest.raises(ClientError):
+            response.raise_for_status()
+    for _ in range(2):
+        # Once all recorded responses were served the last one repeats
+        async with replay.get("https://api/project/AABBCCDD") as response:
+            assert await response.json() == {"id": "AABBCCDD"}
+    async with replay.get("https://api/projects", params='ids=["AABBCCDD"]') as response:
+        response.raise_for_status()
+        assert await response.read() == b'{"id": "AABBCCDD"}'
+    with pytest.raises(ClientError):
+        async with replay.get("https://api/search"):
+            pass
+    replay.close()
+
+def test_bodies_deduplicated(tmp_path):
+    import zipfile
+    path = str(tmp_path / "traffic.cassette")
+    cassette = Cassette(path, RECORD)
+    for i in range(3):
+        cassette.record("GET", f"https://api/version/{i}", None, 200, {}, b"same body", 0.0, 0.01)
+    cassette.close()
+    with zipfile.ZipFile(path) as archive:
+        assert len([n for n in archive.namelist() if n.startswith("bodies/")]) == 1
@@ -0,0 +1,46 @@
+import pytest
+from mc_mp.modpack.compatibility import CompatibilityMatrix
+import mc_mp.standard as std
+
+@pytest.fixture
+def matrix():
+    return CompatibilityMatrix({
+        "id1": [
+            {"game_versions": ["1.20.1", "1.21"], "loaders": ["fabric", "quilt"]},
+            {"game_versions": ["1.19.2"], "loaders": ["forge"]}
+        ],
+        "id2": [
+            {"game_versions": ["1.20.1"], "loaders": ["fabric"]},
+            {"game_versions": ["1.21-rc1"], "loaders": ["fabric"]}
+        ],
+        "id3": []
+    })
+
+def test_axes_sorted(matrix):
+    assert matrix.game_versions == ["1.19.2", "1.20.1", "1.21-rc1", "1.21"]
+    assert matrix.loaders == ["fabric", "forge", "quilt"]
+    assert matrix.matrix.shape == (3, 4, 3)
+
+def test_coverage(matrix):
+    coverage = matrix.coverage("fabric")
+    assert coverage["1.20.1"] == pytest.approx(2 / 3)
+    assert coverage["1.19.2"] == 0.0
+
+def test_best_version(matrix):
+    assert matrix.best_version(0.6, "fabric") == "1.20.1"
+    assert matrix.best_version(0.3, "fabric") == "1.21"
+    assert matrix.best_version(0.3, "fabric", releases_only=False) == "1.21"
+    assert matrix.best_version(1.0) is None
+
+def test_blocking_mods(matrix):
+    assert matrix.blocking_mods("1.21", "fabric") == ["id2", "id3"]
+    assert matrix.blocking_mods("1.21") == ["id2", "id3"]
+    assert matrix.blocking_mods("1.12") == ["id1", "id2", "id3"]
+
+def test_loader_coverage(matrix):
+    assert matrix.loader_coverage("1.20.1") == pytest.approx({"fabric": 2 / 3, "forge": 0.0, "quilt": 1 / 3})
+    assert matrix.loader_coverage("1.12") == {"fabric": 0.0, "forge": 0.0, "quilt": 0.0}
+
+def test_version_key():
+    versions = ["1.20", "1.9", "1.20-pre1", "1.20.1", "0.5.8+1.20.1"]
+    assert sorted(versions, key=std.version_key) == ["0.5.8+1.20.1", "1.9", "1.20-pre1", "1.20", "1.20.1"]
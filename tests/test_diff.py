@@ -0,0 +1,50 @@
+import pytest
+import json
+import zipfile
+from unittest.mock import patch, AsyncMock
+from mc_mp.modpack.diff import PackEntry, diff_entries, diff_packs, format_diff
+
+def test_diff_entries_classifies_by_project_id():
+    old = {"A": PackEntry("A", "a1", "Alpha", version_number="1.0"),
+           "B": PackEntry("B", "b2", "Beta", version_number="2.0", date_published="2024-02-01T00:00:00Z"),
+           "C": PackEntry("C", "c1", "Gamma", version_number="1.0"),
+           "D": PackEntry("D", "d1", "Delta", version_number="1.0")}
+    new = {"A": PackEntry("A", "a2", "Alpha", version_number="1.1"),
+           "B": PackEntry("B", "b1", "Beta", version_number="2.1-beta", date_published="2024-01-01T00:00:00Z"),
+           "C": PackEntry("C", "c1", "Gamma", version_number="1.0"),
+           "E": PackEntry("E", "e1", "Epsilon", version_number="0.1")}
+
+    diff = diff_entries(old, new)
+
+    assert [c.project_id for c in diff.upgraded] == ["A"]
+    # The publication date wins over the version number
+    assert [c.project_id for c in diff.downgraded] == ["B"]
+    assert [c.project_id for c in diff.added] == ["E"]
+    assert [c.project_id for c in diff.removed] == ["D"]
+    assert diff.unchanged == 1
+    notes = format_diff(diff)
+    assert "- Alpha 1.0 -> 1.1" in notes and "1 added, 1 removed, 1 updated, 1 downgraded, 1 unchanged" in notes
+
+@pytest.mark.asyncio
+async def test_diff_project_against_mrpack_fetches_versions_once(tmp_path, create_pack, version):
+    await create_pack("old", [(version(project_id, f"{project_id}1", "1.0", "2024-01-01T00:00:00Z"),
+                               {"title": project_id.title(), "description": ""})
+                              for project_id in ("AAAA", "BBBB", "CCCC")], loader_version="0.16.5")
+
+    cdn = "https://cdn.modrinth.com/data/{}/versions/{}/{}.jar"
+    index = {"files": [{"path": f"mods/{p}.jar", "hashes": {"sha1": p}, "downloads": [cdn.format(p, v, p)]}
+                       for p, v in (("AAAA", "AAAA2"), ("BBBB", "BBBB1"), ("DDDD", "DDDD1"))]}
+    with zipfile.ZipFile(tmp_path / "new.mrpack", "w") as archive:
+        archive.writestr("modrinth.index.json", json.dumps(index))
+
+    fetched = [version("AAAA", "AAAA2", "1.1", "2024-03-01T00:00:00Z", changelog="Fixed crash")]
+    with patch('mc_mp.modpack.project_api.ProjectAPI.get_versions', AsyncMock(return_value=fetched)) as mock_get:
+        diff = await diff_packs("old", "new.mrpack", changelogs=True)
+
+    # Only the changed mod is looked up, in one bulk request
+    mock_get.assert_awaited_once_with(ids='["AAAA2"]')
+    assert [(c.title, c.old.version_number, c.new.version_number) for c in diff.upgraded] == [("Aaaa", "1.0", "1.1")]
+    assert [c.title for c in diff.added] == ["DDDD.jar"]
+    assert [c.title for c in diff.removed] == ["Cccc"]
+    assert diff.unchanged == 1
+    assert "  Fixed crash" in format_diff(diff, changelogs=True)
@@ -0,0 +1,112 @@
+import pytest
+import json
+import os
+import tomllib
+import zipfile
+from unittest.mock import patch, AsyncMock
+from mc_mp.modpack.artifacts import ArtifactStore
+from mc_mp.modpack.export import Exporter, resolve_plan, write_packwiz, write_server_zip
+
+JARS = {f"https://cdn.example/{name}.jar": name.encode() * 100 for name in ("both", "client")}
+
+def mod(version, name, **info):
+    return (version(name.upper(), f"{name}-v1", jar=JARS[f"https://cdn.example/{name}.jar"]),
+            {"title": name.title(), "description": "", **info})
+
+@pytest.mark.asyncio
+async def test_export_all_targets(tmp_path, create_pack, version, fake_session):
+    (tmp_path / "overrides" / "config").mkdir(parents=True)
+    (tmp_path / "overrides" / "config" / "mod.toml").write_text("enabled = true\n")
+    project = await create_pack("Pack", [mod(version, "both", client_side="required", server_side="required"),
+                                         mod(version, "client", client_side="required", server_side="unsupported")],
+                                save=False, mod_loader="quilt", loader_version="0.26.4", overrides="overrides")
+    session = fake_session(JARS)
+
+    with patch('mc_mp.modpack.project_api.ProjectAPI.get_session', return_value=session):
+        outputs = await Exporter(ArtifactStore(str(tmp_path / "store"))).export(project, "pack")
+
+    assert outputs == {"mrpack": "pack.mrpack", "packwiz": "pack-packwiz",
+                       "curseforge": "pack-curseforge.zip", "server": "pack-server.zip"}
+    # Both bundling targets share one download per jar
+    assert session.get.call_count == 2
+
+    with zipfile.ZipFile("pack.mrpack") as archive:
+        index = json.loads(archive.read("modrinth.index.json"))
+    assert index["dependencies"] == {"minecraft": "1.20.1", "quilt-loader": "0.26.4"}
+    assert {f["path"]: f["env"]["server"] for f in index["files"]} == \
+        {"mods/both.jar": "required", "mods/client.jar": "unsupported"}
+    with zipfile.ZipFile("pack.mrpack") as archive:
+        assert archive.read("overrides/config/mod.toml") == b"enabled = true\n"
+
+    with open("pack-packwiz/pack.toml", "rb") as file:
+        pack = tomllib.load(file)
+    assert pack["versions"] == {"minecraft": "1.20.1", "quilt": "0.26.4"}
+    with open("pack-packwiz/index.toml", "rb") as file:
+        assert [entry["file"] for entry in tomllib.load(file)["files"]] == \
+            ["config/mod.toml", "mods/both.pw.toml", "mods/client.pw.toml"]
+    # Overrides are copies, editing the pack leaves the project's files alone
+    assert not os.path.samefile("pack-packwiz/config/mod.toml", "overrides/config/mod.toml")
+    with open("pack-packwiz/mods/client.pw.toml", "rb") as file:
+        meta = tomllib.load(file)
+    assert meta["side"] == "client" and meta["update"]["modrinth"]["mod-id"] == "CLIENT"
+
+    with zipfile.ZipFile("pack-curseforge.zip") as archive:
+        manifest = json.loads(archive.read("manifest.json"))
+        assert manifest["minecraft"]["modLoaders"] == [{"id": "quilt-0.26.4", "primary": True}]
+        assert archive.read("overrides/mods/client.jar") == JARS["https://cdn.example/client.jar"]
+    with zipfile.ZipFile("pack-server.zip") as archive:
+        assert archive.namelist() == ["mods/both.jar"]
+
+@pytest.mark.asyncio
+async def test_export_is_reproducible_and_skips_unchanged(tmp_path, create_pack, version):
+    (tmp_path / "overrides").mkdir()
+    (tmp_path / "overrides" / "options.txt").write_text("fov:90\n")
+    project = await create_pack("Pack", [mod(version, "both")], save=False, loader_version="0.16.5",
+                                overrides="overrides")
+
+    assert await project.export_modpack("first")
+    os.utime(tmp_path / "overrides" / "options.txt", (0, 0))
+    assert await project.export_modpack("second")
+    # Entry timestamps and order do not depend on when or from which file times the pack was built
+    assert (tmp_path / "first.mrpack").read_bytes() == (tmp_path / "second.mrpack").read_bytes()
+
+    with patch('mc_mp.modpack.project.write_mrpack') as mock_write:
+        assert await project.export_modpack("second")
+        mock_write.assert_not_called()
+
+    project.modpack.description = "Changed"
+    outputs = await Exporter(ArtifactStore(str(tmp_path / "store"))).export(project, "second", ["mrpack"])
+    assert outputs == {"mrpack": "second.mrpack"}
+    assert (tmp_path / "first.mrpack").read_bytes() != (tmp_path / "second.mrpack").read_bytes()
+
+@pytest.mark.asyncio
+async def test_export_rebuilds_edited_dirs_and_new_launchers(tmp_path, create_pack, version, fake_session):
+    project = await create_pack("Pack", [mod(version, "both")], save=False, loader_version="0.16.5")
+    exporter = Exporter(ArtifactStore(str(tmp_path / "store")))
+    launcher = AsyncMock(return_value=("https://cdn.example/both.jar", "server.jar"))
+
+    async def export():
+        with patch('mc_mp.modpack.project_api.ProjectAPI.get_session', return_value=fake_session(JARS)), \
+             patch('mc_mp.modpack.export.LOADER_META.server_launcher', launcher), \
+             patch('mc_mp.modpack.export.write_packwiz', wraps=write_packwiz) as packwiz, \
+             patch('mc_mp.modpack.export.write_server_zip', wraps=write_server_zip) as server:
+            await exporter.export(project, "pack", ["packwiz", "server"])
+        return packwiz.call_count, server.call_count
+
+    assert await export() == (1, 1)
+    assert await export() == (0, 0)
+    # A partly deleted directory is rebuilt even though its inputs did not change
+    os.remove("pack-packwiz/mods/both.pw.toml")
+    assert await export() == (1, 0)
+    # A newer installer gives another launcher URL
+    launcher.return_value = ("https://cdn.example/client.jar", "server.jar")
+    assert await export() == (0, 1)
+
+@pytest.mark.asyncio
+async def test_resolve_plan_reports_mods_without_files(capsys, create_pack, version):
+    empty = (version("EMPTY", "empty-v1"), {"title": "Empty", "description": ""})
+    project = await create_pack("Pack", [mod(version, "both"), empty], save=False, loader_version="0.16.5")
+
+    plan = await resolve_plan(project)
+    assert [file.filename for file in plan.files] == ["both.jar"]
+    assert "No primary file for mod: Empty" in capsys.readouterr().err
@@ -0,0 +1,42 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+from mc_mp.modpack.fleet import Fleet
+from mc_mp.modpack.project import Project
+
+INFOS = [{"id": "SHARED", "title": "Shared", "description": "In both packs"},
+         {"id": "FABRIC", "title": "Fabric only", "description": "Only in the fabric pack"}]
+
+@pytest.fixture
+def versions(version):
+    return {
+        "SHARED": [version("SHARED", "S1", "1.0", "2024-01-01T00:00:00Z"),
+                   version("SHARED", "S2", "2.0", "2024-06-01T00:00:00Z"),
+                   version("SHARED", "S3", "2.1", "2024-07-01T00:00:00Z", loader="forge")],
+        "FABRIC": [version("FABRIC", "F1", "1.0", "2024-01-01T00:00:00Z")]
+    }
+
+async def fleet_pack(create_pack, versions, title, loader, mods):
+    await create_pack(title, [(next(v for v in versions[project_id] if v["id"] == version_id),
+                               next(i for i in INFOS if i["id"] == project_id))
+                              for project_id, version_id in mods], mod_loader=loader)
+    return f"{title}.modpack"
+
+@pytest.mark.asyncio
+@patch('mc_mp.modpack.project_api.ProjectAPI.get_projects', new_callable=AsyncMock)
+@patch('mc_mp.modpack.project_api.ProjectAPI.list_versions', new_callable=AsyncMock)
+async def test_fleet_fetches_union_once(mock_list_versions, mock_get_projects, create_pack, versions):
+    mock_list_versions.side_effect = lambda id: versions[id]
+    mock_get_projects.side_effect = lambda ids: [i for i in INFOS if i["id"] in ids]
+    files = [await fleet_pack(create_pack, versions, "fabric_pack", "fabric", [("SHARED", "S1"), ("FABRIC", "F1")]),
+             await fleet_pack(create_pack, versions, "forge_pack", "forge", [("SHARED", "S1")])]
+
+    changes = await Fleet(files).update()
+
+    assert sorted(call.kwargs["id"] for call in mock_list_versions.call_args_list) == ["FABRIC", "SHARED"]
+    assert mock_get_projects.call_count == 1
+    assert [c["to"] for c in changes["fabric_pack.modpack"]] == ["2.0"]
+    assert [c["to"] for c in changes["forge_pack.modpack"]] == ["2.1"]
+
+    reloaded = Project()
+    assert await reloaded.load_project("forge_pack.modpack")
+    assert reloaded.modpack.mod_data[0].version_number == "2.1"
@@ -0,0 +1,82 @@
+import pytest
+import asyncio
+import time
+from mc_mp.modpack.jobs import JobQueue, DONE, FAILED, CANCELLED, RUNNING, FINISHED
+
+def wait_for(job, statuses=FINISHED, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while job.status not in statuses:
+        assert time.monotonic() < deadline, f"job stuck in {job.status}"
+        time.sleep(0.01)
+    return job
+
+@pytest.fixture
+def queue():
+    queue = JobQueue(workers=2)
+    yield queue
+    queue.shutdown()
+
+def test_job_result_and_progress(queue):
+    async def run(job):
+        job.set_progress(1, 2)
+        await asyncio.sleep(0)
+        return "result"
+
+    job = wait_for(queue.submit("test", run))
+    assert job.status == DONE
+    assert job.result == "result"
+    assert job.progress == 1.0
+    assert queue.get(job.id) is job
+
+def test_job_failure(queue):
+    async def run(job):
+        raise ValueError("broken")
+
+    job = wait_for(queue.submit("test", run))
+    assert job.status == FAILED
+    assert job.error == "ValueError: broken"
+
+def test_cancel_running_job(queue):
+    async def run(job):
+        await asyncio.sleep(60)
+
+    job = wait_for(queue.submit("test", run), statuses=(RUNNING,))
+    assert queue.cancel(job.id)
+    assert wait_for(job).status == CANCELLED
+    assert not queue.cancel(job.id)
+
+def test_workers_bounded(queue):
+    running = []
+
+    async def run(job):
+        running.append(job.id)
+        await asyncio.sleep(60)
+
+    jobs = [queue.submit(f"test {i}", run) for i in range(3)]
+    wait_for(jobs[1], statuses=(RUNNING,))
+    time.sleep(0.05)
+    assert len(running) == 2
+    assert jobs[2].status == "queued"
+
+    assert queue.cancel(jobs[2].id)
+    assert wait_for(jobs[2]).status == CANCELLED
+    assert [job.id for job in queue.list_jobs()] == [job.id for job in jobs]
+
+def test_run_coroutine_keeps_caller_context(queue):
+    import contextvars
+    request_id = contextvars.ContextVar("request_id")
+    request_id.set("abc")
+
+    async def read():
+        return request_id.get(), asyncio.get_running_loop()
+
+    first, first_loop = queue.run_coroutine(read()).result(timeout=5)
+    _, second_loop = queue.run_coroutine(read()).result(timeout=5)
+    assert first == "abc"
+    assert first_loop is second_loop
+
+    async def fail():
+        raise ValueError("broken")
+
+    with pytest.raises(ValueError):
+        queue.run_coroutine(fail()).result(timeout=5)
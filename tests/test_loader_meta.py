@@ -0,0 +1,78 @@
+import pytest
+import asyncio
+import json
+import zipfile
+from unittest.mock import patch, AsyncMock
+from mc_mp.constants import LOADER_MANIFESTS
+from mc_mp.modpack.loader_meta import LoaderMeta, index_meta, index_forge, index_neoforge
+from mc_mp.modpack.project import Project
+
+FABRIC = {
+    "game": [{"version": "1.21.1", "stable": True}, {"version": "1.20.1", "stable": True}],
+    "loader": [{"version": "0.16.6", "stable": False}, {"version": "0.16.5", "stable": True},
+               {"version": "0.15.11", "stable": True}],
+    "installer": [{"version": "1.0.2", "stable": False}, {"version": "1.0.1", "stable": True}]
+}
+
+FABRIC_URL = LOADER_MANIFESTS["fabric"]
+
+def test_index_meta():
+    assert index_meta(FABRIC) == {"1.21.1": "0.16.5", "1.20.1": "0.16.5"}
+    # Quilt has no stable flag, pre-releases are marked in the version
+    quilt = {"game": [{"version": "1.20.1"}], "loader": [{"version": "0.27.0-beta.1"}, {"version": "0.26.4"}]}
+    assert index_meta(quilt) == {"1.20.1": "0.26.4"}
+
+def test_index_forge():
+    promos = {"promos": {"1.20.1-latest": "47.3.12", "1.20.1-recommended": "47.3.0", "1.21.1-latest": "52.0.16"}}
+    assert index_forge(promos) == {"1.20.1": "47.3.0", "1.21.1": "52.0.16"}
+
+def test_index_neoforge():
+    versions = {"versions": ["20.4.237", "21.0.167", "21.1.9", "21.1.72", "21.2.0-beta"]}
+    assert index_neoforge(versions) == {"1.20.4": "20.4.237", "1.21": "21.0.167", "1.21.1": "21.1.72"}
+
+@pytest.mark.asyncio
+async def test_latest_is_cached_and_revalidated(tmp_path, fake_session):
+    meta = LoaderMeta(str(tmp_path), ttl=3600)
+    with patch('mc_mp.modpack.project_api.ProjectAPI.get_session',
+               return_value=fake_session({FABRIC_URL: json.dumps(FABRIC).encode()},
+                                         headers={"ETag": '"v1"'})) as get_session:
+        assert await meta.latest("fabric", "1.20.1") == "0.16.5"
+        assert await meta.latest("fabric", "1.21.1") == "0.16.5"
+        assert await meta.installer("fabric") == "1.0.1"
+    assert get_session.call_count == 1
+
+    # A new process reads the disk cache, once stale it revalidates with the stored ETag
+    meta = LoaderMeta(str(tmp_path), ttl=0)
+    session = fake_session({FABRIC_URL: b""}, status=304)
+    with patch('mc_mp.modpack.project_api.ProjectAPI.get_session', return_value=session):
+        assert await meta.latest("fabric", "1.20.1") == "0.16.5"
+    assert session.get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_fetch(tmp_path, fake_session):
+    meta = LoaderMeta(str(tmp_path), ttl=3600)
+    session = fake_session({FABRIC_URL: b""})
+    async def slow_read():
+        await asyncio.sleep(0.01)
+        return json.dumps(FABRIC).encode()
+    session.responses[FABRIC_URL].read = slow_read
+
+    with patch('mc_mp.modpack.project_api.ProjectAPI.get_session', return_value=session):
+        results = await asyncio.gather(*[meta.latest("fabric", "1.20.1") for _ in range(3)])
+    # Callers arriving during the fetch wait for it instead of reading the still empty cache
+    assert results == ["0.16.5"] * 3
+    assert session.get.call_count == 1
+
+@pytest.mark.asyncio
+async def test_export_uses_loader_dependency_name(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    project = Project()
+    project.create_project(title="pack", mod_loader="quilt", mc_version="1.20.1")
+    with patch('mc_mp.modpack.loader_meta.LoaderMeta.latest', new_callable=AsyncMock, return_value="0.26.4"):
+        assert await project.export_modpack("pack")
+    with zipfile.ZipFile("pack.mrpack") as archive:
+        index = json.loads(archive.read("modrinth.index.json"))
+    assert index["dependencies"] == {"minecraft": "1.20.1", "quilt-loader": "0.26.4"}
+
+    project.modpack.loader_version = "0.25.0"
+    assert await project.get_loader_version() == "0.25.0"
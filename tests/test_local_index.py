@@ -0,0 +1,85 @@
+import pytest
+import json
+import sqlite3
+from mc_mp.modpack.local_index import LocalIndex
+
+sample_hits = [
+    {"project_id": "AANobbMI", "slug": "sodium", "title": "Sodium", "description": "Modern rendering engine",
+     "categories": ["fabric", "optimization"], "versions": ["1.20.1", "1.21"], "project_type": "mod", "downloads": 500},
+    {"project_id": "gvQqBUqZ", "slug": "lithium", "title": "Lithium", "description": "Game logic optimization",
+     "categories": ["fabric", "optimization"], "versions": ["1.20.1"], "project_type": "mod", "downloads": 300},
+    {"project_id": "YL57xq9U", "slug": "iris", "title": "Iris Shaders", "description": "Shaders for Sodium",
+     "categories": ["quilt", "decoration"], "versions": ["1.21"], "project_type": "mod", "downloads": 400}
+]
+
+@pytest.fixture
+def index():
+    index = LocalIndex()
+    index.add_projects(sample_hits)
+    yield index
+    index.close()
+
+def test_search_text(index):
+    result = index.search(query="sodium")
+    assert {hit["slug"] for hit in result["hits"]} == {"sodium", "iris"}
+    assert result["total_hits"] == 2
+
+def test_search_prefix(index):
+    assert [hit["slug"] for hit in index.search(query="lith")["hits"]] == ["lithium"]
+
+def test_search_facets(index):
+    result = index.search(facets=[["categories:fabric"], ["versions:1.21"]])
+    assert [hit["slug"] for hit in result["hits"]] == ["sodium"]
+    result = index.search(facets='[["categories:fabric", "categories:quilt"]]')
+    assert [hit["slug"] for hit in result["hits"]] == ["sodium", "iris", "lithium"]
+
+def test_search_paging(index):
+    result = index.search(offset=1, limit=1)
+    assert [hit["slug"] for hit in result["hits"]] == ["iris"]
+    assert result["total_hits"] == 3
+
+def test_project_payload_update(index):
+    index.add_projects([{"id": "gvQqBUqZ", "slug": "lithium", "title": "Lithium", "description": "Updated",
+                         "categories": ["optimization"], "loaders": ["fabric", "quilt"],
+                         "game_versions": ["1.21"], "versions": ["VERSIONID"], "project_type": "mod"}])
+    result = index.search(query="updated", facets=[["categories:quilt"], ["versions:1.21"]])
+    assert [hit["project_id"] for hit in result["hits"]] == ["gvQqBUqZ"]
+    assert index.search(query="logic")["hits"] == []
+
+def test_version_facets(index):
+    index.add_versions([{"project_id": "YL57xq9U", "loaders": ["fabric"], "game_versions": ["1.20.1"]}])
+    result = index.search(facets=[["categories:fabric"], ["versions:1.20.1"]])
+    assert {hit["slug"] for hit in result["hits"]} == {"sodium", "lithium", "iris"}
+
+def test_project_payload_replaces_facets(index):
+    index.add_projects([dict(sample_hits[0], categories=["quilt"], versions=["1.21"])])
+    assert [hit["slug"] for hit in index.search(facets=[["categories:fabric"]])["hits"]] == ["lithium"]
+    assert index.search(facets=[["versions:1.20.1"]])["total_hits"] == 1
+
+def test_reindexing_keeps_one_text_row_per_project(index):
+    for _ in range(3):
+        index.add_projects(sample_hits)
+    assert index.search(query="sodium")["total_hits"] == 2
+    assert index._conn.execute("SELECT COUNT(*) FROM projects_fts").fetchone()[0] == len(sample_hits)
+
+def test_old_index_file_is_migrated(tmp_path):
+    path = str(tmp_path / "index.sqlite")
+    # The first layout, with its own copy of every project in projects_fts
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE projects (project_id TEXT PRIMARY KEY, slug TEXT, title TEXT, downloads INTEGER DEFAULT 0,
+                               data TEXT NOT NULL);
+        CREATE TABLE facets (facet TEXT NOT NULL, project_id TEXT NOT NULL, PRIMARY KEY (facet, project_id)) WITHOUT ROWID;
+        CREATE VIRTUAL TABLE projects_fts USING fts5(project_id UNINDEXED, slug, title, description);
+    """)
+    hit = sample_hits[1]
+    connection.execute("INSERT INTO projects VALUES (?, ?, ?, ?, ?)",
+                       (hit["project_id"], hit["slug"], hit["title"], hit["downloads"], json.dumps(hit)))
+    connection.commit()
+    connection.close()
+
+    index = LocalIndex(path)
+    assert [h["slug"] for h in index.search(query="logic")["hits"]] == ["lithium"]
+    index.add_projects([hit])
+    assert index.search(query="logic")["total_hits"] == 1
+    index.close()
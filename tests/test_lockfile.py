@@ -0,0 +1,56 @@
+import pytest
+import hashlib
+import json
+import os
+from unittest.mock import patch
+from mc_mp.modpack.lockfile import build_lock, load_lock, verify
+
+JARS = {name: name.encode() * 1000 for name in ("alpha", "beta", "client")}
+
+async def make_project(create_pack, version):
+    return await create_pack("Pack", [(version(name.upper(), f"{name}1", jar=jar),
+                                       {"title": name.title(), "description": "",
+                                        "server_side": "unsupported" if name == "client" else "required"})
+                                      for name, jar in JARS.items()], save=False, loader_version="0.16.5")
+
+@pytest.mark.asyncio
+async def test_save_project_writes_lockfile(create_pack, version):
+    project = await make_project(create_pack, version)
+    assert await project.save_project("pack")
+
+    lock = load_lock("pack.lock.json")
+    assert lock == build_lock(project.modpack)
+    assert lock["mods"]["ALPHA"] == {"version_id": "alpha1", "file": "alpha.jar", "size": 5000,
+                                     "sha512": hashlib.sha512(JARS["alpha"]).hexdigest(), "server": True}
+    assert lock["mods"]["CLIENT"]["server"] is False
+
+@pytest.mark.asyncio
+async def test_verify_only_hashes_changed_files(tmp_path, create_pack, version):
+    lock = build_lock((await make_project(create_pack, version)).modpack)
+    mods = tmp_path / "mods"
+    mods.mkdir()
+    for name in ("alpha", "beta"):
+        (mods / f"{name}.jar").write_bytes(JARS[name])
+    (mods / "stray.jar").write_bytes(b"stray")
+
+    report = verify(lock, str(tmp_path), server=True)
+    assert report.success and report.hashed == 2
+    assert report.ok == ["mods/alpha.jar", "mods/beta.jar"] and report.extra == ["mods/stray.jar"]
+
+    # Unchanged files are decided from their size and mtime alone
+    with patch('mc_mp.modpack.lockfile.hash_file') as mock_hash:
+        assert verify(lock, str(tmp_path), server=True).success
+        mock_hash.assert_not_called()
+
+    # Same size, new content and mtime: only that file is hashed
+    (mods / "beta.jar").write_bytes(JARS["beta"][::-1])
+    os.utime(mods / "beta.jar", ns=(0, 0))
+    report = verify(lock, str(tmp_path), server=True)
+    assert report.hashed == 1 and report.mismatched == ["mods/beta.jar"]
+
+    # A different size fails without hashing, client-only mods count when checking a client install
+    (mods / "alpha.jar").write_bytes(b"short")
+    report = verify(lock, str(tmp_path))
+    assert report.hashed == 0
+    assert report.mismatched == ["mods/alpha.jar", "mods/beta.jar"] and report.missing == ["mods/client.jar"]
+    assert json.loads((tmp_path / ".verify_state.json").read_text())["mods/beta.jar"]["mtime_ns"] == 0
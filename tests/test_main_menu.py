@@ -0,0 +1,30 @@
+import pytest
+import asyncio
+import threading
+from unittest.mock import patch
+from mc_mp.menu.main_menu import Menu
+from mc_mp.modpack.project import Project
+
+@pytest.mark.asyncio
+async def test_display_runs_loop_tasks_while_menu_is_shown(monkeypatch):
+    monkeypatch.setattr(Menu, "main_menu_instance", object())
+    prefetched = threading.Event()
+
+    async def prefetch():
+        prefetched.set()
+
+    class FakeTerminalMenu:
+        def __init__(self, **kwargs):
+            pass
+
+        def show(self):
+            # The user is still browsing when the prefetch has to run
+            assert prefetched.wait(timeout=5)
+            return None
+
+    task = asyncio.get_running_loop().create_task(prefetch())
+    menu = Menu(Project(), title="Results", menu_entries=["A"], parent_menu=object())
+    with patch('mc_mp.menu.main_menu.TerminalMenu', FakeTerminalMenu):
+        await menu.display()
+    await task
+    assert not menu.menu_active
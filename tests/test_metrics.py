@@ -0,0 +1,60 @@
+import pytest
+import asyncio
+from mc_mp.metrics import MetricsRegistry, timed, OPERATIONS, OPERATION_FAILURES
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+def test_counter_and_gauge_render(registry):
+    requests = registry.counter("requests_total", "Requests.", ("endpoint", "status"))
+    requests.inc(endpoint="/search", status="200")
+    requests.inc(2, endpoint="/search", status="200")
+    loaded = registry.gauge("loaded", "Loaded projects.")
+    loaded.set(3)
+    loaded.dec()
+
+    assert registry.counter("requests_total", "Requests.", ("endpoint", "status")) is requests
+    text = registry.render()
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{endpoint="/search",status="200"} 3' in text
+    assert "loaded 2" in text
+
+def test_registry_rejects_other_kind(registry):
+    registry.counter("value", "A counter.")
+    with pytest.raises(ValueError):
+        registry.gauge("value", "A gauge.")
+
+def test_histogram_buckets_and_quantile(registry):
+    latency = registry.histogram("latency_seconds", "Latency.", ("endpoint",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 2.0):
+        latency.observe(value, endpoint='/a"b')
+
+    text = latency.render()
+    assert 'latency_seconds_bucket{endpoint="/a\\"b",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{endpoint="/a\\"b",le="1"} 3' in text
+    assert 'latency_seconds_bucket{endpoint="/a\\"b",le="+Inf"} 4' in text
+    assert 'latency_seconds_count{endpoint="/a\\"b"} 4' in text
+    assert latency.get(endpoint='/a"b') == (3.05, 4)
+    assert latency.quantile(0.5, endpoint='/a"b') == 1.0
+    assert latency.quantile(0.95, endpoint='/a"b') == float("inf")
+    assert "count=4" in registry.summary()
+
+def test_timed_records_failures():
+    @timed("test_sync")
+    def sync_op(ok):
+        return ok
+
+    @timed("test_async")
+    async def async_op():
+        raise RuntimeError("broken")
+
+    sync_op(True)
+    sync_op(False)
+    with pytest.raises(RuntimeError):
+        asyncio.run(async_op())
+
+    assert OPERATIONS.get(operation="test_sync")[1] == 2
+    assert OPERATION_FAILURES.get(operation="test_sync") == 1
+    assert OPERATIONS.get(operation="test_async")[1] == 1
+    assert OPERATION_FAILURES.get(operation="test_async") == 1
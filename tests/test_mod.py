@@ -98,3 +98,10 @@ def test_project_encoder():
     expected_output = json.dumps(mod_instance.export_json())
     
     assert json.loads(json_output) == json.loads(expected_output)
+
+def test_primary_file():
+    first, second = {"filename": "a.jar"}, {"filename": "b.jar", "primary": True}
+    assert Mod(files=[first, second]).primary_file() is second
+    # Without a file marked primary the first one is the primary file
+    assert Mod(files=[first, {"filename": "c.jar", "primary": False}]).primary_file() is first
+    assert Mod(files=[]).primary_file() is None
@@ -88,3 +88,27 @@ def test_mod_data_empty_mods():
     assert modpack_instance.get_mods_name_ver() == []
     assert modpack_instance.get_mods_descriptions() == []
     assert modpack_instance.check_compatibility() is True
+
+def test_get_mod_index(modpack_instance):
+    assert modpack_instance.get_mod_index("Mod2 - 2.0.0") == 1
+    assert modpack_instance.get_mod_index("Missing - 1.0") == -1
+
+def test_views_invalidated_on_change(modpack_instance):
+    names = modpack_instance.get_mods_name_ver()
+    assert modpack_instance.get_mods_name_ver() is names
+    revision = modpack_instance.get_revision()
+
+    modpack_instance.mod_data[0].version_number = "1.1.0"
+    modpack_instance.mark_changed()
+    assert modpack_instance.get_revision() == revision + 1
+    assert modpack_instance.get_mods_name_ver() == ["Mod1 - 1.1.0", "Mod2 - 2.0.0"]
+    assert modpack_instance.get_mod_index("Mod1 - 1.1.0") == 0
+
+    modpack_instance.mod_data.append(Mod(title="Mod3", version_number="3.0.0", project_id="id3"))
+    assert modpack_instance.get_mods_name_ver()[-1] == "Mod3 - 3.0.0"
+
+def test_mod_data_not_shared():
+    first = Modpack()
+    second = Modpack()
+    first.mod_data.append(Mod(title="Mod1"))
+    assert second.mod_data == []
@@ -0,0 +1,67 @@
+import os
+import sys
+import zipfile
+from unittest.mock import patch
+from mc_mp.constants import RAW_ZIP_VERSIONS
+from mc_mp.modpack.packing import pack_zip, raw_writes_supported, scan_tree
+
+def make_tree(root, count):
+    for i in range(count):
+        path = root / "config" / f"mod{i}.toml"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"setting = {i}\n" * 50)
+    (root / "icon.png").write_bytes(os.urandom(256))
+
+def read_all(output):
+    with zipfile.ZipFile(output) as archive:
+        assert archive.testzip() is None
+        return {name: archive.read(name) for name in archive.namelist()}
+
+def test_scan_tree(tmp_path):
+    make_tree(tmp_path / "overrides", 2)
+    files = scan_tree(str(tmp_path / "overrides"), "overrides")
+    assert sorted(files) == ["overrides/config/mod0.toml", "overrides/config/mod1.toml", "overrides/icon.png"]
+    assert scan_tree(str(tmp_path / "missing"), "overrides") == {}
+
+def test_pack_zip_reuses_unchanged_entries(tmp_path):
+    make_tree(tmp_path / "src", 20)
+    files = scan_tree(str(tmp_path / "src"), "overrides")
+    output = str(tmp_path / "pack.mrpack")
+
+    assert pack_zip(output, {"index.json": b"{}"}, files, workers=4) == {"reused": 0, "compressed": 21}
+    first = read_all(output)
+    assert first["overrides/config/mod3.toml"] == (tmp_path / "src" / "config" / "mod3.toml").read_bytes()
+
+    # Touching a file without changing it keeps its entry
+    os.utime(tmp_path / "src" / "config" / "mod1.toml")
+    (tmp_path / "src" / "config" / "mod2.toml").write_text("changed = true\n")
+    assert pack_zip(output, {"index.json": b"{}"}, files, workers=4) == {"reused": 20, "compressed": 1}
+    second = read_all(output)
+    assert second["overrides/config/mod2.toml"] == b"changed = true\n"
+    assert {k: v for k, v in second.items() if k != "overrides/config/mod2.toml"} == \
+        {k: v for k, v in first.items() if k != "overrides/config/mod2.toml"}
+
+def test_pack_zip_ignores_manifest_of_replaced_archive(tmp_path):
+    make_tree(tmp_path / "src", 3)
+    files = scan_tree(str(tmp_path / "src"), "overrides")
+    output = str(tmp_path / "pack.zip")
+    pack_zip(output, {}, files)
+
+    with zipfile.ZipFile(output, "w") as archive:
+        archive.writestr("other", b"not the packed archive")
+    assert pack_zip(output, {}, files) == {"reused": 0, "compressed": 4}
+    assert sorted(read_all(output)) == sorted(files)
+
+def test_write_raw_uses_zipfile_internals_on_supported_versions(tmp_path):
+    with zipfile.ZipFile(tmp_path / "check.zip", "w") as archive:
+        oldest, newest = RAW_ZIP_VERSIONS
+        assert raw_writes_supported(archive) == (oldest <= sys.version_info[:2] <= newest)
+
+def test_write_raw_fallback_gives_same_archive(tmp_path):
+    make_tree(tmp_path / "src", 3)
+    files = scan_tree(str(tmp_path / "src"), "overrides")
+    pack_zip(str(tmp_path / "raw.zip"), {"index.json": b"{}"}, files)
+    with patch('mc_mp.modpack.packing.raw_writes_supported', return_value=False):
+        pack_zip(str(tmp_path / "public.zip"), {"index.json": b"{}"}, files)
+    assert (tmp_path / "raw.zip").read_bytes() == (tmp_path / "public.zip").read_bytes()
+    assert read_all(str(tmp_path / "public.zip"))["overrides/icon.png"] == (tmp_path / "src" / "icon.png").read_bytes()
@@ -0,0 +1,32 @@
+import io
+import pstats
+from mc_mp import profiling
+
+def allocate():
+    return [bytearray(1024) for _ in range(100)]
+
+def test_capture_cpu_and_memory(tmp_path):
+    out = io.StringIO()
+    cpu_file = tmp_path / "run.pstats"
+    with profiling.capture(cpu_file=str(cpu_file), memory=True, out=out):
+        kept = allocate()
+
+    report = out.getvalue()
+    assert cpu_file.exists()
+    assert any(name == "allocate" for _, _, name in pstats.Stats(str(cpu_file)).stats)
+    assert "[MEMORY] Peak traced memory" in report
+    assert "test_profiling.py" in report
+    assert len(kept) == 100
+
+def test_format_size():
+    assert profiling.format_size(512) == "512.0 B"
+    assert profiling.format_size(3 * 1024 * 1024) == "3.0 MiB"
+
+def test_capture_profiles_worker_threads(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    cpu_file = tmp_path / "run.pstats"
+    with profiling.capture(cpu_file=str(cpu_file), out=io.StringIO()):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(lambda _: allocate(), range(4)))
+
+    assert any(name == "allocate" for _, _, name in pstats.Stats(str(cpu_file)).stats)
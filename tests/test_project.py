@@ -1,21 +1,34 @@
 import pytest
-from unittest.mock import patch, AsyncMock
-from mc_mp.modpack.project_api import ProjectAPI
+import os
+from unittest.mock import patch, AsyncMock, MagicMock
+from mc_mp.modpack.project_api import ProjectAPI, metered_cached
+from mc_mp.metrics import CACHE_LOOKUPS
+from mc_mp.modpack.project import Project
+from mc_mp.modpack.local_index import LocalIndex
 
 @pytest.mark.asyncio
 @patch('mc_mp.modpack.project_api.ClientSession')
 async def test_request_fail(mock_client_session):
-    mock_client = mock_client_session.return_value
-    mock_session = AsyncMock()
+    mock_session = mock_client_session.return_value
+    mock_session.closed = False
     mock_response = AsyncMock()
-    mock_response.raise_for_status.side_effect = Exception("Request failed")
+    mock_response.raise_for_status = MagicMock(side_effect=Exception("Request failed"))
     
-    mock_client.__aenter__.return_value = mock_session
-    mock_client.__aexit__.return_value = False
-    mock_session.get.return_value = mock_response
+    mock_session.get.return_value.__aenter__.return_value = mock_response
+    mock_session.get.return_value.__aexit__.return_value = False
     
     result = await ProjectAPI.request('/test-endpoint')
     assert result is None
+    mock_response.raise_for_status.assert_called_once()
+    ProjectAPI._sessions.clear()
+
+@pytest.mark.asyncio
+@patch('mc_mp.modpack.project_api.ClientSession')
+async def test_session_shared(mock_client_session):
+    mock_client_session.return_value.closed = False
+    assert ProjectAPI.get_session() is ProjectAPI.get_session()
+    assert mock_client_session.call_count == 1
+    ProjectAPI._sessions.clear()
 
 def test_parse_url():
     params = {'key1': 'value1', 'key2': 'value2'}
@@ -64,6 +77,34 @@ async def test_search_project_fail(mock_request):
     result = await ProjectAPI.search_project(param1='value1')
     assert result is None
 
+@pytest.mark.asyncio
+@patch('mc_mp.modpack.project_api.ProjectAPI.request')
+async def test_search_project_local_fallback(mock_request):
+    mock_request.return_value = None
+    index = LocalIndex()
+    index.add_projects([{'project_id': 'id1', 'slug': 'offline-mod', 'title': 'Offline Mod', 'description': ''}])
+    with patch.object(ProjectAPI, 'local_index', index):
+        result = await ProjectAPI.search_project(query='offline')
+    assert [hit['slug'] for hit in result['hits']] == ['offline-mod']
+
+def test_local_index_opened_on_first_use(tmp_path):
+    path = tmp_path / 'cache' / 'index.sqlite'
+    with patch.object(ProjectAPI, 'local_index', None), patch.object(ProjectAPI, 'local_index_path', str(path)):
+        assert not path.exists()
+        index = ProjectAPI.get_local_index()
+        assert path.exists() and ProjectAPI.get_local_index() is index
+        index.close()
+
+@pytest.mark.asyncio
+@patch('mc_mp.modpack.project_api.ProjectAPI.request')
+async def test_offline_actions_need_the_network(mock_request, tmp_path, capsys):
+    project = Project()
+    with patch.object(ProjectAPI, 'offline', True):
+        assert await project.fetch_mods_by_ids(['AAAA']) == []
+        assert await project.download_mods(str(tmp_path / 'mods')) is False
+    mock_request.assert_not_called()
+    assert "Cannot fetch mods in offline mode" in capsys.readouterr().err
+
 @pytest.mark.asyncio
 @patch('mc_mp.modpack.project_api.ProjectAPI.request')
 async def test_get_project(mock_request):
@@ -132,4 +173,100 @@ async def test_get_versions(mock_request):
 async def test_get_versions_fail(mock_request):
     mock_request.side_effect = Exception("Request failed")
     result = await ProjectAPI.get_versions(id='project-id')
-    assert result is None
\ No newline at end of file
+    assert result is None
+
+@pytest.mark.asyncio
+async def test_metered_cached_does_not_store_failures():
+    results = iter([None, {"id": "A"}])
+    fetch = AsyncMock(side_effect=lambda: next(results))
+    cached_fetch = metered_cached(ttl=60)(fetch)
+    hits, misses = CACHE_LOOKUPS.get(cache="api", result="hit"), CACHE_LOOKUPS.get(cache="api", result="miss")
+
+    # The failed fetch is retried instead of being served from the cache, the result is then cached
+    assert await cached_fetch() is None
+    assert await cached_fetch() == {"id": "A"}
+    assert await cached_fetch() == {"id": "A"}
+    assert fetch.await_count == 2
+    assert CACHE_LOOKUPS.get(cache="api", result="miss") - misses == 2
+    assert CACHE_LOOKUPS.get(cache="api", result="hit") - hits == 1
+
+def test_endpoint_label():
+    assert ProjectAPI.endpoint_label('/project/AANobbMI/version') == '/project/{id}/version'
+    assert ProjectAPI.endpoint_label('/version/abc') == '/version/{id}'
+    assert ProjectAPI.endpoint_label('/search') == '/search'
+
+@pytest.mark.asyncio
+@patch('mc_mp.modpack.project_api.asyncio.sleep', new_callable=AsyncMock)
+@patch('mc_mp.modpack.project_api.ClientSession')
+async def test_request_retries_rate_limit(mock_client_session, mock_sleep):
+    mock_session = mock_client_session.return_value
+    mock_session.closed = False
+    limited = AsyncMock(status=429, headers={'Retry-After': '2'})
+    ok = AsyncMock(status=200, headers={})
+    ok.raise_for_status = MagicMock()
+    ok.json.return_value = {'id': 'retried'}
+    contexts = [MagicMock(), MagicMock()]
+    for context, response in zip(contexts, (limited, ok)):
+        context.__aenter__.return_value = response
+        context.__aexit__.return_value = False
+    mock_session.get.side_effect = contexts
+
+    result = await ProjectAPI.request('/project/retried')
+    assert result == {'id': 'retried'}
+    assert mock_session.get.call_count == 2
+    mock_sleep.assert_awaited_once_with(2.0)
+    ProjectAPI._sessions.clear()
+
+def test_retry_delay():
+    assert ProjectAPI.retry_delay({'X-Ratelimit-Reset': '5'}, 0) == 5.0
+    assert ProjectAPI.retry_delay({}, 2) == 2.0
+    assert ProjectAPI.retry_delay({'Retry-After': '3600'}, 0) == 60
+
+@pytest.mark.asyncio
+async def test_download_mods_into_directory(tmp_path, create_pack, version, fake_session):
+    data = b"jar" * 100
+    project = await create_pack("Pack", [(version("MOD", "V1", jar=data), {"title": "Mod", "description": ""})],
+                                save=False)
+    session = fake_session({"https://cdn.example/mod.jar": data})
+
+    with patch('mc_mp.modpack.project_api.ProjectAPI.get_session', return_value=session):
+        assert await project.download_mods(str(tmp_path / "first"))
+        assert await project.download_mods(str(tmp_path / "second"))
+
+    # Each download lands in its own directory instead of the shared project directory
+    assert (tmp_path / "first" / "mod.jar").read_bytes() == data
+    assert (tmp_path / "second" / "mod.jar").read_bytes() == data
+    assert not os.path.exists(tmp_path / "mp")
+
+@pytest.mark.asyncio
+async def test_download_mods_fails_if_any_file_fails(tmp_path, create_pack, version, fake_session, capsys):
+    good, bad = b"good" * 100, b"bad" * 100
+    project = await create_pack("Pack", [(version("GOOD", "G1", jar=good), {"title": "Good", "description": ""}),
+                                         (version("BAD", "B1", jar=bad), {"title": "Bad", "description": ""})],
+                                save=False)
+    # The second file is served with the wrong content and fails its hash check
+    session = fake_session({"https://cdn.example/good.jar": good, "https://cdn.example/bad.jar": good})
+
+    with patch('mc_mp.modpack.project_api.ProjectAPI.get_session', return_value=session):
+        assert not await project.download_mods(str(tmp_path / "mods"))
+    assert "1 of 2 files failed to download or check correctly: bad.jar" in capsys.readouterr().err
+
+def test_project_copy_is_independent():
+    project = Project()
+    project.create_project(title="Pack", mod_loader="fabric", mc_version="1.20.1")
+    working = project.copy()
+    working.modpack.title = "Changed"
+    assert project.modpack.title == "Pack"
+    assert working.versions is project.versions
+
+@pytest.mark.asyncio
+@patch('mc_mp.modpack.project_api.ProjectAPI.get_projects', new_callable=AsyncMock)
+@patch('mc_mp.modpack.project_api.ProjectAPI.list_versions', new_callable=AsyncMock)
+async def test_fetch_mods_by_ids_skips_mods_without_versions(mock_list_versions, mock_get_projects):
+    mock_list_versions.side_effect = lambda id, **kwargs: [{"id": "V1", "project_id": "HAS"}] if id == "HAS" else []
+    mock_get_projects.return_value = [{"id": "HAS"}, {"id": "NONE"}]
+    project = Project()
+    project.create_project(title="Pack", mod_loader="fabric", mc_version="1.20.1")
+
+    mods = await project.fetch_mods_by_ids(["HAS", "NONE"])
+    assert [(mod["id"], len(mod["versions"])) for mod in mods] == [("HAS", 1)]
@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+from mc_mp.modpack.project import Project
+from mc_mp.modpack.project_pool import ProjectPool
+
+def new_project(title: str) -> Project:
+    project = Project()
+    project.create_project(title=title, description="A test modpack")
+    project.metadata["filename"] = project.metadata["project_id"]
+    return project
+
+def test_projects_isolated():
+    first = new_project("First")
+    second = new_project("Second")
+    assert first.metadata is not second.metadata
+    assert first.metadata["project_id"] != second.metadata["project_id"]
+    assert first.modpack.mod_data is not second.modpack.mod_data
+
+@pytest.mark.asyncio
+async def test_lru_eviction_saves_and_reloads(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pool = ProjectPool(max_projects=2)
+    projects = [new_project(f"Pack {i}") for i in range(3)]
+    ids = [await pool.add(project) for project in projects]
+
+    assert len(pool) == 2
+    assert ids[0] not in pool
+    assert (tmp_path / f"{ids[0]}.modpack").exists()
+
+    reloaded = await pool.get(ids[0])
+    assert reloaded is not projects[0]
+    assert reloaded.modpack.title == "Pack 0"
+    assert ids[1] not in pool
+
+@pytest.mark.asyncio
+async def test_load_reuses_instance(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    project = new_project("Shared")
+    await project.save_project(None)
+
+    pool = ProjectPool()
+    first = await pool.load(f"{project.metadata['project_id']}.modpack")
+    second = await pool.load(f"./{project.metadata['project_id']}.modpack")
+    assert first is second
+    assert await pool.get(first.metadata["project_id"]) is first
+    assert await pool.get("unknown") is None
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_share_one_instance(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    project = new_project("Shared")
+    await project.save_project(None)
+
+    pool = ProjectPool()
+    filename = f"{project.metadata['project_id']}.modpack"
+    first, second = await asyncio.gather(pool.load(filename), pool.load(f"./{filename}"))
+    assert first is second
+    assert await pool.get(project.metadata["project_id"]) is first
+
+@pytest.mark.asyncio
+async def test_held_projects_are_not_evicted(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pool = ProjectPool(max_projects=1)
+    first, second = new_project("First"), new_project("Second")
+    await pool.add(first)
+    pool.hold(first.metadata["project_id"])
+    first.metadata["saved"] = False
+
+    # The least recently used project is held, so the newer one is evicted instead
+    await pool.add(second)
+    assert first.metadata["project_id"] in pool and second.metadata["project_id"] not in pool
+    assert first.metadata["saved"] is False
+
+    pool.release(first.metadata["project_id"])
+    await pool.add(new_project("Third"))
+    assert first.metadata["project_id"] not in pool and len(pool) == 1
+    assert first.metadata["saved"] is True
@@ -0,0 +1,53 @@
+import pytest
+from unittest.mock import AsyncMock
+from mc_mp.modpack.search import SearchPager
+
+def make_api(total: int = 5):
+    api = AsyncMock()
+
+    async def search_project(**kwargs):
+        hits = [{"project_id": f"P{i}", "title": f"Mod {i}"}
+                for i in range(kwargs["offset"], min(kwargs["offset"] + kwargs["limit"], total))]
+        return {"hits": hits, "offset": kwargs["offset"], "limit": kwargs["limit"], "total_hits": total}
+
+    api.search_project.side_effect = search_project
+    api.list_versions.return_value = [{"id": "V1"}]
+    return api
+
+@pytest.mark.asyncio
+async def test_pages_stream_with_offset():
+    api = make_api()
+    pager = SearchPager(api, page_size=2, query="sodium")
+    pages = [page async for page in pager]
+
+    assert [page["offset"] for page in pages] == [0, 2, 4]
+    assert [hit["project_id"] for hit in pager.hits] == ["P0", "P1", "P2", "P3", "P4"]
+    assert not pager.has_more
+    assert api.search_project.await_count == 3
+
+@pytest.mark.asyncio
+async def test_pages_cached():
+    api = make_api()
+    pager = SearchPager(api, page_size=2, query="sodium")
+    first = await pager.get_page(0)
+    assert await pager.get_page(0) is first
+    assert api.search_project.await_count == 1
+
+@pytest.mark.asyncio
+async def test_versions_prefetched():
+    api = make_api()
+    pager = SearchPager(api, page_size=2, version_filters={"loaders": ["fabric"], "game_versions": ["1.20.1"]}, query="sodium")
+    await pager.next_page()
+    await pager.wait_versions(["P0", "P1"])
+
+    api.list_versions.assert_any_await(id="P0", loaders=["fabric"], game_versions=["1.20.1"])
+    api.list_versions.assert_any_await(id="P1", loaders=["fabric"], game_versions=["1.20.1"])
+    pager.close()
+
+@pytest.mark.asyncio
+async def test_failed_page_stops():
+    api = AsyncMock()
+    api.search_project.return_value = None
+    pager = SearchPager(api, query="sodium")
+    assert await pager.next_page() is None
+    assert pager.hits == []
@@ -0,0 +1,39 @@
+import pytest
+import os
+from unittest.mock import patch
+from mc_mp.modpack.artifacts import ArtifactStore
+from mc_mp.modpack.server_pack import ServerPackBuilder
+
+JARS = {f"https://cdn.example/{name}.jar": name.encode() * 100 for name in ("shared", "client", "server")}
+
+async def forge_pack(create_pack, version, title, mods):
+    await create_pack(title, [(version(name.upper(), name, loader="forge", jar=name.encode() * 100),
+                               {"title": name, "description": "", "server_side": server_side})
+                              for name, server_side in mods], mod_loader="forge")
+    return f"{title}.modpack"
+
+@pytest.mark.asyncio
+async def test_build_many_shares_artifacts(tmp_path, create_pack, version, fake_session):
+    files = [await forge_pack(create_pack, version, "pack_a", [("shared", "required"), ("client", "unsupported")]),
+             await forge_pack(create_pack, version, "pack_b", [("shared", "optional"), ("server", "required")])]
+    session = fake_session(JARS)
+
+    with patch('mc_mp.modpack.project_api.ProjectAPI.get_session', return_value=session):
+        builder = ServerPackBuilder(ArtifactStore(str(tmp_path / "store")))
+        built = await builder.build_many(files, str(tmp_path / "servers"))
+
+    assert built == {"pack_a.modpack": True, "pack_b.modpack": True}
+    assert sorted(os.listdir(tmp_path / "servers" / "pack_a" / "mods")) == ["shared.jar"]
+    assert sorted(os.listdir(tmp_path / "servers" / "pack_b" / "mods")) == ["server.jar", "shared.jar"]
+    # The shared jar is downloaded once and both servers link the same file
+    assert sorted(call.args[0] for call in session.get.call_args_list) == \
+        ["https://cdn.example/server.jar", "https://cdn.example/shared.jar"]
+    assert os.stat(tmp_path / "servers" / "pack_a" / "mods" / "shared.jar").st_ino == \
+        os.stat(tmp_path / "servers" / "pack_b" / "mods" / "shared.jar").st_ino
+
+@pytest.mark.asyncio
+async def test_fetch_rejects_wrong_hash(tmp_path, fake_session):
+    store = ArtifactStore(str(tmp_path / "store"))
+    with patch('mc_mp.modpack.project_api.ProjectAPI.get_session', return_value=fake_session(JARS)):
+        assert await store.fetch("https://cdn.example/shared.jar", {"sha1": "0" * 40}) is None
+    assert not os.path.exists(store.path("0" * 40))
@@ -0,0 +1,96 @@
+import pytest
+import sqlite3
+from sqlalchemy import create_engine, inspect
+from mc_mp.modpack.project import Project
+from web_app.app import db
+from web_app.app.storage import ProjectStorage, upgrade_schema
+
+def make_project(version, mods):
+    project = Project()
+    project.create_project(title="Pack", mod_loader="fabric", mc_version="1.20.1", loader_version="0.16.5",
+                           overrides="config", client_side="optional", server_side="required")
+    for project_id, title, loader in mods:
+        project.add_mod(title, version(project_id, f"{project_id}1", loader=loader),
+                        {"title": title, "description": f"{title} mod"})
+    return project
+
+@pytest.fixture
+def context(app):
+    with app.app_context():
+        yield
+
+def test_save_and_load_round_trip(context, version):
+    project = make_project(version, [("AAAA", "Alpha", "fabric"), ("BBBB", "Beta", "quilt")])
+    ProjectStorage.save_project(project)
+
+    loaded = ProjectStorage.load_project(project.metadata["project_id"])
+    for field in ("title", "mc_version", "mod_loader", "loader_version", "overrides", "client_side", "server_side"):
+        assert getattr(loaded.modpack, field) == getattr(project.modpack, field)
+    assert [(m.project_id, m.id, m.mod_loaders) for m in loaded.modpack.mod_data] == \
+        [("AAAA", "AAAA1", ["fabric"]), ("BBBB", "BBBB1", ["quilt"])]
+    assert loaded.metadata["project_id"] == project.metadata["project_id"] and loaded.metadata["saved"]
+
+    # Saving again replaces the mods and bumps the revision
+    assert project.rm_mod(project.is_mod_installed("BBBB"))
+    ProjectStorage.save_project(project)
+    assert ProjectStorage.get_revision(project.metadata["project_id"]) == 2
+    assert [m.project_id for m in ProjectStorage.load_project(project.metadata["project_id"]).modpack.mod_data] == ["AAAA"]
+
+def test_query_mods_filters_sorts_and_pages(context, version):
+    project = make_project(version, [("CCCC", "Gamma", "fabric"), ("AAAA", "Alpha", "fabric"),
+                                     ("BBBB", "Beta", "quilt"), ("DDDD", "Delta", "fabric")])
+    ProjectStorage.save_project(project)
+    project_id = project.metadata["project_id"]
+
+    mods, total = ProjectStorage.query_mods(project_id, limit=2)
+    assert total == 4 and [m.title for m in mods] == ["Alpha", "Beta"]
+    mods, total = ProjectStorage.query_mods(project_id, offset=2, limit=2)
+    assert [m.title for m in mods] == ["Delta", "Gamma"]
+    mods, total = ProjectStorage.query_mods(project_id, sort="-project_id")
+    assert [m.project_id for m in mods] == ["DDDD", "CCCC", "BBBB", "AAAA"]
+    mods, total = ProjectStorage.query_mods(project_id, loader="fabric", query="ta")
+    assert total == 1 and [m.title for m in mods] == ["Delta"]
+    assert ProjectStorage.query_mods("unknown") == ([], 0)
+
+def test_delete_project(context, version):
+    project = make_project(version, [("AAAA", "Alpha", "fabric")])
+    ProjectStorage.save_project(project)
+    project_id = project.metadata["project_id"]
+
+    assert ProjectStorage.delete_project(project_id)
+    assert not ProjectStorage.has_project(project_id)
+    assert ProjectStorage.load_project(project_id) is None
+    assert ProjectStorage.query_mods(project_id) == ([], 0)
+    assert not ProjectStorage.delete_project(project_id)
+
+def test_sqlite_connections_use_wal(app, context):
+    assert db.session.execute(db.text("PRAGMA journal_mode")).scalar() == "wal"
+
+def test_upgrade_schema_adds_columns_and_indexes(tmp_path):
+    path = tmp_path / "old.sqlite"
+    # The schema before revisions, loader versions, overrides and the listing indexes
+    with sqlite3.connect(path) as connection:
+        connection.executescript("""
+            CREATE TABLE modpack (id INTEGER PRIMARY KEY, title VARCHAR(100) NOT NULL, description TEXT NOT NULL,
+                build_date VARCHAR(20) NOT NULL, build_version VARCHAR(20) NOT NULL, mc_version VARCHAR(10) NOT NULL,
+                mod_loader VARCHAR(20) NOT NULL, client_side VARCHAR(20) NOT NULL, server_side VARCHAR(20) NOT NULL);
+            CREATE TABLE project (id INTEGER PRIMARY KEY, project_id VARCHAR(36) NOT NULL UNIQUE,
+                modpack_id INTEGER NOT NULL REFERENCES modpack (id));
+            INSERT INTO modpack VALUES (1, 'Old', '', '2024-01-01', '0.1', '1.20.1', 'fabric', 'required', 'optional');
+            INSERT INTO project VALUES (1, 'old-project', 1);
+        """)
+    engine = create_engine(f"sqlite:///{path}")
+
+    added = upgrade_schema(engine)
+
+    assert {"project.filename", "project.revision", "modpack.loader_version", "modpack.overrides"} <= set(added)
+    inspector = inspect(engine)
+    assert "mod" in inspector.get_table_names()
+    assert "ix_mod_modpack_title" in {index["name"] for index in inspector.get_indexes("mod")}
+    assert "ix_project_modpack_id" in {index["name"] for index in inspector.get_indexes("project")}
+    with engine.connect() as connection:
+        # Existing rows get the model's default instead of NULL
+        assert connection.execute(db.text("SELECT revision FROM project")).scalar() == 0
+        assert connection.execute(db.text("SELECT loader_version FROM modpack")).scalar() == ""
+    # Running it on an up to date database changes nothing
+    assert upgrade_schema(engine) == []
@@ -0,0 +1,88 @@
+import pytest
+import asyncio
+import json
+from unittest.mock import patch, AsyncMock
+from mc_mp.modpack.project import Project
+from mc_mp.tracing import TRACER, MAX_DURATION_SAMPLES, trace_sync, trace_async
+
+@pytest.fixture
+def tracer():
+    TRACER.reset()
+    TRACER.enable()
+    yield TRACER
+    TRACER.disable()
+    TRACER.reset()
+
+@trace_sync
+def leaf(n):
+    return n * 2
+
+@trace_async
+async def child(n):
+    await asyncio.sleep(0)
+    return leaf(n)
+
+@trace_async
+async def parent():
+    return await asyncio.gather(child(1), child(2))
+
+def test_disabled_records_nothing():
+    TRACER.reset()
+    assert leaf(2) == 4
+    assert TRACER.spans == []
+    assert TRACER.stats() == {}
+
+def test_async_spans_nest(tracer):
+    assert asyncio.run(parent()) == [2, 4]
+    spans = {span[0]: span for span in tracer.spans}
+    by_name = {}
+    for span_id, parent_id, name, *_ in tracer.spans:
+        by_name.setdefault(name, []).append((span_id, parent_id))
+
+    (parent_id, root), = by_name["parent"]
+    assert root is None
+    assert all(p == parent_id for _, p in by_name["child"])
+    child_ids = {span_id for span_id, _ in by_name["child"]}
+    assert all(p in child_ids for _, p in by_name["leaf"])
+    assert len(spans) == 5
+
+def test_stats_and_output(tracer, tmp_path):
+    for i in range(20):
+        leaf(i)
+    stats = tracer.stats()["leaf"]
+    assert stats["count"] == 20
+    assert stats["p95"] <= stats["total"]
+    assert "leaf" in tracer.summary()
+
+    tracer.write(str(tmp_path / "trace.jsonl"))
+    lines = (tmp_path / "trace.jsonl").read_text().splitlines()
+    assert len(lines) == 20
+    assert json.loads(lines[0])["name"] == "leaf"
+
+    tracer.write(str(tmp_path / "trace.json"))
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert len(events) == 20
+    assert events[0]["ph"] == "X"
+
+def test_durations_are_bounded(tracer):
+    for i in range(MAX_DURATION_SAMPLES * 3):
+        leaf(i)
+    stats = tracer.stats()["leaf"]
+    assert stats["count"] == MAX_DURATION_SAMPLES * 3
+    assert len(tracer._durations["leaf"][2]) == MAX_DURATION_SAMPLES
+    assert 0 < stats["p95"] <= stats["total"]
+
+@pytest.mark.asyncio
+@patch('mc_mp.modpack.project_api.ProjectAPI.get_projects', new_callable=AsyncMock)
+@patch('mc_mp.modpack.project_api.ProjectAPI.list_versions', new_callable=AsyncMock)
+async def test_executor_spans_nest_under_caller(mock_list_versions, mock_get_projects, tracer):
+    mock_list_versions.side_effect = lambda id, **kwargs: [{"id": f"{id}1", "project_id": id}]
+    mock_get_projects.return_value = [{"id": "A"}, {"id": "B"}]
+    project = Project()
+    project.create_project(title="Pack", mod_loader="fabric", mc_version="1.20.1")
+
+    await project.fetch_mods_by_ids(["A", "B"])
+    ids = {name: span_id for span_id, _, name, *_ in tracer.spans}
+    parents = {name: parent for _, parent, name, *_ in tracer.spans}
+    assert parents["Project.get_versions_id"] == ids["Project.fetch_mods_by_ids"]
+    assert parents["Project.get_project_info_ids"] == ids["Project.fetch_mods_by_ids"]
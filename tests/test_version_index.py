@@ -0,0 +1,48 @@
+import pytest
+from mc_mp.modpack.version_index import VersionIndex, VersionRecord
+import mc_mp.standard as std
+
+sample_versions = [
+    {"id": "V1", "project_id": "P1", "version_number": "1.0.0", "version_type": "release",
+     "date_published": "2024-01-01T10:00:00Z", "loaders": ["fabric"], "game_versions": ["1.20.1"]},
+    {"id": "V3", "project_id": "P1", "version_number": "1.2.0-beta", "version_type": "beta",
+     "date_published": "2024-03-01T10:00:00Z", "loaders": ["fabric"], "game_versions": ["1.20.1"]},
+    {"id": "V2", "project_id": "P1", "version_number": "1.1.0", "version_type": "release",
+     "date_published": "2024-02-01T10:00:00.123456Z", "loaders": ["fabric", "quilt"], "game_versions": ["1.20.1", "1.21"]},
+    {"id": "V4", "project_id": "P2", "version_number": "2.0", "version_type": "release",
+     "date_published": "2024-01-05T00:00:00Z", "loaders": ["forge"], "game_versions": ["1.19.2"]}
+]
+
+@pytest.fixture
+def index():
+    return VersionIndex(sample_versions)
+
+def test_ingest(index):
+    assert len(index) == 4
+    assert "V2" in index
+    assert [r.id for r in index.versions("P1")] == ["V3", "V2", "V1"]
+    index.add(sample_versions)
+    assert len(index) == 4
+
+def test_latest(index):
+    assert index.latest("P1").id == "V2"
+    assert index.latest("P1", min_type="beta").id == "V3"
+    assert index.latest("P1", loader="quilt", game_version="1.21").id == "V2"
+    assert index.latest("P1", loader="forge") is None
+    assert index.latest("unknown") is None
+
+def test_is_newer(index):
+    record = index.latest("P1")
+    assert VersionIndex.is_newer(record, "2024-01-01T10:00:00Z")
+    assert not VersionIndex.is_newer(record, "2024-03-01")
+
+def test_record_from_json():
+    record = VersionRecord.from_json(sample_versions[0])
+    assert record.rank == 2
+    assert record.version == ((1, 0, 0), 1, "")
+    assert record.timestamp == std.parse_timestamp("2024-01-01T10:00:00+00:00")
+
+def test_parse_timestamp():
+    assert std.parse_timestamp("2024-09-07") < std.parse_timestamp("2024-09-07T00:00:01Z")
+    assert std.parse_timestamp("") == 0.0
+    assert std.parse_timestamp("not a date") == 0.0
@@ -0,0 +1,63 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+from mc_mp.modpack.project import Project
+from mc_mp.modpack.watch import UpdateWatcher, NEW_VERSION, REMOVED_VERSION
+
+def info(versions, updated):
+    return {"id": "MOD", "title": "Mod", "description": "A mod", "versions": versions, "updated": updated}
+
+@pytest.fixture
+def v1(version):
+    return version("MOD", "V1", "1.0", "2024-01-01T00:00:00Z")
+
+@pytest.fixture
+def v2(version):
+    return version("MOD", "V2", "2.0", "2024-06-01T00:00:00Z")
+
+async def watched_pack(create_pack, v1):
+    await create_pack("pack", [(v1, info(["V1"], "2024-01-01T00:00:00Z"))])
+    return "pack.modpack"
+
+@pytest.mark.asyncio
+@patch('mc_mp.modpack.project_api.ProjectAPI.get_projects', new_callable=AsyncMock)
+@patch('mc_mp.modpack.project_api.ProjectAPI.list_versions', new_callable=AsyncMock)
+async def test_watch_reports_deltas_only(mock_list_versions, mock_get_projects, tmp_path, create_pack, v1, v2):
+    filename = await watched_pack(create_pack, v1)
+    state_file = str(tmp_path / "state.json")
+    mock_get_projects.return_value = [info(["V1"], "2024-01-01T00:00:00Z")]
+
+    # The first check only records the baseline, an unchanged project costs no versions request
+    assert await UpdateWatcher([filename], state_file=state_file).check() == []
+    assert await UpdateWatcher([filename], state_file=state_file).check() == []
+    mock_list_versions.assert_not_called()
+
+    mock_get_projects.return_value = [info(["V1", "V2"], "2024-06-01T00:00:00Z")]
+    mock_list_versions.return_value = [v1, v2]
+    deltas = await UpdateWatcher([filename], state_file=state_file, apply=True).check()
+
+    assert [(d["type"], d["version_id"], d["version_number"], d["files"]) for d in deltas] == \
+        [(NEW_VERSION, "V2", "2.0", [filename])]
+    mock_list_versions.assert_called_once_with(id="MOD")
+    reloaded = Project()
+    assert await reloaded.load_project(filename)
+    assert reloaded.modpack.mod_data[0].version_number == "2.0"
+
+@pytest.mark.asyncio
+@patch('mc_mp.modpack.project_api.ProjectAPI.get_projects', new_callable=AsyncMock)
+@patch('mc_mp.modpack.project_api.ProjectAPI.list_versions', new_callable=AsyncMock)
+async def test_watch_reports_removed_installed_version(mock_list_versions, mock_get_projects, tmp_path,
+                                                       create_pack, v1):
+    filename = await watched_pack(create_pack, v1)
+    state_file = str(tmp_path / "state.json")
+    mock_get_projects.return_value = [info(["V1"], "2024-01-01T00:00:00Z")]
+    await UpdateWatcher([filename], state_file=state_file).check()
+
+    mock_get_projects.return_value = [info([], "2024-06-01T00:00:00Z")]
+    deltas = await UpdateWatcher([filename], state_file=state_file).check()
+
+    assert [(d["type"], d["version_id"], d["files"]) for d in deltas] == [(REMOVED_VERSION, "V1", [filename])]
+    mock_list_versions.assert_not_called()
+
+def test_next_delay_jitter(tmp_path):
+    watcher = UpdateWatcher(state_file=str(tmp_path / "state.json"), interval=100, jitter=0.1)
+    assert all(90 <= watcher.next_delay() <= 110 for _ in range(100))
@@ -1,16 +1,43 @@
-from flask import Flask, g
+from flask import Flask, g, session
 from flask_sqlalchemy import SQLAlchemy
+from mc_mp.constants import MAX_LOADED_PROJECTS, MAX_JOB_WORKERS
+from mc_mp.modpack.project_pool import ProjectPool
+from mc_mp.modpack.jobs import JobQueue
+import functools
+import inspect
 import os
 
 db = SQLAlchemy()
 
+class SharedLoopFlask(Flask):
+    """
+    Flask app running every async view on the long-lived loop of the job queue, instead of a new
+    loop per request, so the ProjectAPI HTTP session and caches are shared by all requests.
+
+    Async views share that loop with every other request and job, so they run blocking work like
+    database queries in a thread with asyncio.to_thread.
+    """
+
+    def ensure_sync(self, func):
+        if not inspect.iscoroutinefunction(func):
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # The coroutine runs in a copy of the request's context so request, session and g still work
+            return self.extensions['job_queue'].run_coroutine(func(*args, **kwargs)).result()
+        return wrapper
+
 def create_app(project=None, test_config=None):
     # Create and configure the app
-    app = Flask(__name__, instance_relative_config=True)
+    app = SharedLoopFlask(__name__, instance_relative_config=True)
     app.config.from_mapping(
         SECRET_KEY='dev',
         SQLALCHEMY_DATABASE_URI='sqlite:///' + os.path.join(app.instance_path, 'app.sqlite'),
-        SQLALCHEMY_TRACK_MODIFICATIONS=False
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        MAX_LOADED_PROJECTS=MAX_LOADED_PROJECTS,
+        MAX_JOB_WORKERS=MAX_JOB_WORKERS,
+        MODS_PAGE_SIZE=50
     )
 
     if test_config is None:
@@ -22,6 +49,9 @@ def create_app(project=None, test_config=None):
 
     # Initialize the database
     db.init_app(app)
+    from .storage import enable_sqlite_wal
+    with app.app_context():
+        enable_sqlite_wal(db.engine)
 
     # Ensure the instance folder exists
     try:
@@ -30,12 +60,29 @@ def create_app(project=None, test_config=None):
         pass
 
     # Register Blueprints
-    from . import routes
+    from . import routes, api
     app.register_blueprint(routes.bp)
+    app.register_blueprint(api.bp)
+
+    # Projects are kept per session in a bounded pool
+    pool = ProjectPool(app.config['MAX_LOADED_PROJECTS'])
+    app.extensions['project_pool'] = pool
+    # Long operations run on a background worker loop instead of the request, async views run on it too
+    app.extensions['job_queue'] = JobQueue(app.config['MAX_JOB_WORKERS'])
 
-    # Store the project in g object
+    # Store the session's project in g object, falling back to the project given at startup
     @app.before_request
-    def before_request():
-        g.project = project
+    async def before_request():
+        g.pool = pool
+        g.project = await pool.get(session.get('project_id')) or project
+        # The pool keeps the session's project loaded until the request is done with it
+        g.held = g.project.metadata['project_id'] if g.project is not None and g.project is not project else None
+        if g.held:
+            pool.hold(g.held)
+
+    @app.teardown_request
+    def teardown_request(exception=None):
+        if g.get('held'):
+            pool.release(g.held)
 
     return app
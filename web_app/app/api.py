@@ -0,0 +1,196 @@
+from flask import Blueprint, request, g, session, current_app, abort
+from mc_mp.modpack.project_api import ProjectAPI
+from mc_mp.constants import SEARCH_PAGE_SIZE
+from .storage import ProjectStorage
+import asyncio
+import hashlib
+import json
+import os
+import weakref
+
+bp = Blueprint('api', __name__, url_prefix='/api')
+
+# Upper bound of the limit query argument
+MAX_PAGE_SIZE = 500
+# Fields of a mod returned by the listing, changelogs and files are left out
+MOD_FIELDS = ("project_id", "mod_id", "title", "description", "version_number", "version_type",
+              "mod_loaders", "mc_versions", "date_published")
+# Modpack and modpack revision of each loaded project when it was last stored, so listings follow unsaved edits
+STORED_REVISIONS: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+def json_response(payload, etag=None, max_age=0):
+    """Builds a compact JSON response with an ETag, answering 304 if the client's copy is current."""
+    body = json.dumps(payload, separators=(',', ':'), ensure_ascii=False)
+    response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(etag or hashlib.sha1(body.encode('utf8')).hexdigest())
+    response.cache_control.max_age = max_age
+    return response.make_conditional(request)
+
+def not_modified(etag):
+    """Answers 304 before doing any work if the client already has this ETag."""
+    if etag in request.if_none_match:
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+    return None
+
+def page_args():
+    """Reads offset and limit from the query string, clamped to sane bounds."""
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    limit = request.args.get('limit', current_app.config['MODS_PAGE_SIZE'], type=int)
+    return offset, min(max(limit, 1), MAX_PAGE_SIZE)
+
+def session_project_ids():
+    """Returns the IDs of the projects the session may access: its own project and the one given at startup."""
+    ids = {session.get('project_id')}
+    if g.project is not None:
+        ids.add(g.project.metadata['project_id'])
+    ids.discard(None)
+    return sorted(ids)
+
+def session_owns(project_id):
+    """Checks if a project is the session's own project or the one given at startup."""
+    return project_id in session_project_ids()
+
+def session_project(project_id):
+    """Returns the loaded project of the session if it is this project, otherwise None."""
+    project = g.project
+    if project is None or project.metadata['project_id'] != project_id or not project.metadata['loaded']:
+        return None
+    return project
+
+async def stored_revision(project_id):
+    """
+    Returns the stored revision of a project. The session's loaded project is stored again first
+    if its mods changed since it was last stored, so listings include edits that are not saved yet.
+    """
+    # Database work runs in a thread, views share the job queue's loop with every other request and job
+    project = session_project(project_id)
+    if project is not None:
+        stored = STORED_REVISIONS.get(project)
+        if stored is None or stored[0] is not project.modpack or stored[1] != project.modpack.get_revision():
+            revision = project.modpack.get_revision()
+            await asyncio.to_thread(ProjectStorage.save_project, project)
+            STORED_REVISIONS[project] = (project.modpack, revision)
+    return await asyncio.to_thread(ProjectStorage.get_revision, project_id)
+
+@bp.route('/projects')
+def list_projects():
+    # Only the projects this session can open, the other sessions' projects stay hidden
+    return json_response({'projects': ProjectStorage.list_project_summaries(session_project_ids())})
+
+@bp.route('/projects/<project_id>/mods')
+async def list_mods(project_id):
+    if not session_owns(project_id):
+        abort(404)
+    revision = await stored_revision(project_id)
+    if revision is None:
+        abort(404)
+
+    # The ETag only depends on the stored revision and the query, so unchanged pages skip the query
+    etag = hashlib.sha1(f"{project_id}:{revision}:{request.query_string.decode()}".encode()).hexdigest()
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+
+    offset, limit = page_args()
+    mods, total = await asyncio.to_thread(ProjectStorage.query_mods, project_id, query=request.args.get('q'),
+                                          loader=request.args.get('loader'),
+                                          sort=request.args.get('sort', 'title'),
+                                          offset=offset, limit=limit)
+    return json_response({
+        'total': total,
+        'offset': offset,
+        'limit': limit,
+        'mods': [{field: getattr(mod, field) for field in MOD_FIELDS} for mod in mods]
+    }, etag=etag)
+
+@bp.route('/search')
+async def search():
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    limit = min(max(request.args.get('limit', SEARCH_PAGE_SIZE, type=int), 1), SEARCH_PAGE_SIZE)
+    loaders, versions = request.args.getlist('loader'), request.args.getlist('version')
+    # Values inside a facet group are ORed, groups are ANDed
+    facets = [[f"categories:{loader}" for loader in loaders]] if loaders else []
+    facets += [[f"versions:{version}" for version in versions]] if versions else []
+    facets.append(["project_type:mod"])
+
+    # Results come from the ProjectAPI cache or the local index when possible
+    result = await ProjectAPI.search_project(query=request.args.get('q', ''), facets=facets,
+                                             offset=offset, limit=limit)
+    if result is None:
+        abort(502)
+    return json_response(result, max_age=300)
+
+@bp.route('/projects/<project_id>/jobs', methods=['POST'])
+async def submit_job(project_id):
+    project = session_project(project_id)
+    if project is None:
+        abort(404)
+    data = request.get_json(silent=True) or {}
+    job_type = data.get('type')
+    app = current_app._get_current_object()
+    name = os.path.basename(data.get('filename') or project.metadata['project_id'])
+
+    if job_type == 'export':
+        async def run(job, project):
+            os.makedirs(os.path.join(app.instance_path, 'exports'), exist_ok=True)
+            filename = os.path.join(app.instance_path, 'exports', name)
+            if not await project.export_modpack(filename):
+                raise RuntimeError('Could not export the modpack')
+            return f'{filename}.mrpack'
+    elif job_type == 'download':
+        async def run(job, project):
+            dir_name = os.path.join(app.instance_path, 'downloads', name)
+            if not await project.download_mods(dir_name, progress=job.set_progress):
+                raise RuntimeError('One or more mods failed to download or verify')
+            return dir_name
+    elif job_type == 'update':
+        async def run(job, project):
+            # Requests keep using the pooled project while the copy is updated, the result is swapped in at once
+            working = project.copy()
+            changes = await working.update_mods_to_latest(progress=job.set_progress)
+            project.modpack = working.modpack
+            project.metadata["saved"] = project.metadata["saved"] and not changes
+            def store():
+                with app.app_context():
+                    ProjectStorage.save_project(project)
+            await asyncio.to_thread(store)
+            return changes
+    else:
+        abort(400)
+
+    # The job works on the pooled project of when it starts, and keeps it loaded until it is done
+    pool = g.pool
+    async def held(job):
+        pool.hold(project_id)
+        try:
+            return await run(job, await pool.get(project_id) or project)
+        finally:
+            pool.release(project_id)
+
+    job = app.extensions['job_queue'].submit(f'{job_type}:{project_id}', held)
+    response = json_response(job.export_json())
+    response.status_code = 202
+    response.headers['Location'] = f'{bp.url_prefix}/jobs/{job.id}'
+    return response
+
+@bp.route('/jobs')
+def list_jobs():
+    return json_response({'jobs': [job.export_json() for job in current_app.extensions['job_queue'].list_jobs()]})
+
+@bp.route('/jobs/<job_id>')
+def job_status(job_id):
+    job = current_app.extensions['job_queue'].get(job_id)
+    if job is None:
+        abort(404)
+    return json_response(job.export_json())
+
+@bp.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    queue = current_app.extensions['job_queue']
+    if queue.get(job_id) is None:
+        abort(404)
+    if not queue.cancel(job_id):
+        abort(409)
+    return json_response(queue.get(job_id).export_json())
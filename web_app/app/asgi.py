@@ -0,0 +1,36 @@
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from concurrent.futures import ThreadPoolExecutor
+from mc_mp.constants import MAX_REQUEST_WORKERS
+
+class ThreadedWsgiToAsgi(WsgiToAsgi):
+    """
+    Serves a WSGI app over ASGI with every request on its own pool thread.
+
+    asgiref's WsgiToAsgi runs every request on one shared thread, and views of the app block that thread
+    until their coroutine finishes on the job queue's loop, so requests would be handled one at a time.
+    """
+
+    def __init__(self, wsgi_application, workers: int = MAX_REQUEST_WORKERS, duplicate_header_limit: int = 100):
+        super().__init__(wsgi_application, duplicate_header_limit)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="asgi-request")
+
+    async def __call__(self, scope, receive, send):
+        await ThreadedWsgiToAsgiInstance(self.wsgi_application, self.executor,
+                                         self.duplicate_header_limit)(scope, receive, send)
+
+    def shutdown(self) -> None:
+        """Stops the request threads once the server is done."""
+        self.executor.shutdown(wait=True)
+
+class ThreadedWsgiToAsgiInstance(WsgiToAsgiInstance):
+    """A single request of ThreadedWsgiToAsgi."""
+
+    def __init__(self, wsgi_application, executor: ThreadPoolExecutor, duplicate_header_limit: int = 100):
+        super().__init__(wsgi_application, duplicate_header_limit)
+        self.executor = executor
+
+    async def run_wsgi_app(self, body):
+        # The undecorated app call of asgiref, moved off the shared thread onto the pool
+        run = WsgiToAsgiInstance.__dict__["run_wsgi_app"].func
+        await sync_to_async(run, thread_sensitive=False, executor=self.executor)(self, body)
@@ -12,12 +12,15 @@ class Mod(db.Model):
     version_type = db.Column(db.String(20), nullable=True)
     mod_loaders = db.Column(db.JSON, nullable=True)
     mod_id = db.Column(db.String(100), nullable=False)
-    project_id = db.Column(db.String(100), nullable=False)
+    project_id = db.Column(db.String(100), nullable=False, index=True)
     date_published = db.Column(db.String(50), nullable=True)
     files = db.Column(db.JSON, nullable=True)
 
-    modpack_id = db.Column(db.Integer, db.ForeignKey('modpack.id'), nullable=False)
-    modpack = db.relationship('Modpack', backref=db.backref('mods', lazy=True))
+    modpack_id = db.Column(db.Integer, db.ForeignKey('modpack.id'), nullable=False, index=True)
+    modpack = db.relationship('Modpack', backref=db.backref('mods', lazy=True, cascade='all, delete-orphan'))
+
+    # Serves the default listing order of a modpack's mods straight from the index
+    __table_args__ = (db.Index('ix_mod_modpack_title', 'modpack_id', 'title'),)
 
     def __repr__(self):
         return f'<Mod {self.title}>'
@@ -30,6 +33,8 @@ class Modpack(db.Model):
     build_version = db.Column(db.String(20), nullable=False)
     mc_version = db.Column(db.String(10), nullable=False)
     mod_loader = db.Column(db.String(20), nullable=False)
+    loader_version = db.Column(db.String(50), nullable=False, default="")
+    overrides = db.Column(db.String(255), nullable=False, default="")
     client_side = db.Column(db.String(20), nullable=False)
     server_side = db.Column(db.String(20), nullable=False)
 
@@ -37,4 +42,13 @@ class Modpack(db.Model):
         return f'<Modpack {self.title}>'
 
 class Project(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
\ No newline at end of file
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.String(36), nullable=False, unique=True, index=True)
+    filename = db.Column(db.String(255), nullable=True)
+    # Incremented on every save, used to build ETags of API responses
+    revision = db.Column(db.Integer, nullable=False, default=0)
+    modpack_id = db.Column(db.Integer, db.ForeignKey('modpack.id'), nullable=False, index=True)
+    modpack = db.relationship('Modpack', backref=db.backref('project', uselist=False), cascade='all, delete')
+
+    def __repr__(self):
+        return f'<Project {self.project_id}>'
@@ -1,5 +1,9 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, g
+from flask import Blueprint, render_template, request, redirect, url_for, flash, g, session, current_app
+from mc_mp.modpack.project import Project
+from .storage import ProjectStorage
+from mc_mp.metrics import REGISTRY
 import mc_mp.standard as std
+import asyncio
 
 bp = Blueprint('main', __name__)
 
@@ -12,13 +16,14 @@ def index():
 
 @bp.route('/load_project', methods=['GET', 'POST'])
 async def load_project():
-    project = g.get('project', None)
     if request.method == 'POST':
         filename = request.form.get('filename')
         if filename:
-            # Run async function in event loop
-            success = await project.load_project(filename)
-            if success:
+            # Reuses the pooled project if another session already loaded this file
+            project = await g.pool.load(filename)
+            if project:
+                session['project_id'] = project.metadata['project_id']
+                await asyncio.to_thread(ProjectStorage.save_project, project)
                 flash('Project loaded successfully!', 'success')
                 return redirect(url_for('main.index'))
             else:
@@ -49,12 +54,15 @@ async def save_project():
     # db.session.add(modpack)
     # db.session.commit()
     # flash('Modpack saved successfully!', 'success')
+    project = g.get('project', None)
+    if project is not None and project.metadata['loaded']:
+        await project.save_project(None)
+        await asyncio.to_thread(ProjectStorage.save_project, project)
+        flash('Project saved successfully!', 'success')
     return redirect(url_for('main.index'))
 
 @bp.route('/create_project', methods=['GET', 'POST'])
 async def create_project():
-    project = g.get('project', None)
-    
     if request.method == 'POST':
         title = request.form.get('title')
         description = request.form.get('description')
@@ -66,11 +74,15 @@ async def create_project():
         server_side = request.form.get('server_side')
 
         if title and description:
-            # Run async function in event loop if needed
-            success = await project.create_project(title=title, description=description, build_date=build_date,
-                                                   build_version=build_version, mc_version=mc_version,
-                                                   mod_loader=mod_loader, client_side=client_side, server_side=server_side)
-            if success:
+            project = Project()
+            project.create_project(title=title, description=description, build_date=build_date,
+                                   build_version=build_version, mc_version=mc_version,
+                                   mod_loader=mod_loader, client_side=client_side, server_side=server_side)
+            # Name the file after the project ID so sessions never overwrite each other's files
+            project.metadata['filename'] = project.metadata['project_id']
+            session['project_id'] = await g.pool.add(project)
+            await asyncio.to_thread(ProjectStorage.save_project, project)
+            if project.metadata['loaded']:
                 flash('Modpack created successfully!', 'success')
                 return redirect(url_for('main.index'))
             else:
@@ -84,11 +96,30 @@ async def create_project():
 
 @bp.route('/list_mods')
 async def list_mods():
-    # Run async function if needed
-    # loop = asyncio.get_event_loop()
-    # mods = await loop.run_in_executor(None, lambda: Mod.query.all())
-    return render_template('list_mods.html')
+    project = g.get('project', None)
+    if project is None or not project.metadata['loaded']:
+        flash('No project loaded!', 'error')
+        return redirect(url_for('main.index'))
+    project_id = project.metadata['project_id']
+    # Database work runs in a thread, views share the job queue's loop with every other request and job
+    if not await asyncio.to_thread(ProjectStorage.has_project, project_id):
+        await asyncio.to_thread(ProjectStorage.save_project, project)
+
+    # Filter and page in SQL so only the visible mods are loaded
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    limit = min(max(request.args.get('limit', current_app.config['MODS_PAGE_SIZE'], type=int), 1), 500)
+    mods, total = await asyncio.to_thread(ProjectStorage.query_mods, project_id, query=request.args.get('q'),
+                                          loader=request.args.get('loader'),
+                                          sort=request.args.get('sort', 'title'),
+                                          offset=offset, limit=limit)
+    return render_template('list_mods.html', mods=mods, total=total, offset=offset, limit=limit,
+                           args={k: v for k, v in request.args.items() if k != 'offset'})
 
 @bp.route('/error')
 def error_page():
     return render_template('error.html')
+
+@bp.route('/metrics')
+def metrics():
+    # Prometheus text exposition format
+    return current_app.response_class(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,259 @@
+from sqlalchemy import String, cast, event, func, insert, inspect, or_, text
+from sqlalchemy.engine import Engine
+from typing import Optional, Tuple, List
+from mc_mp.modpack.project import Project
+from mc_mp.modpack.modpack import Modpack
+from . import db
+from .models import Mod as ModModel, Modpack as ModpackModel, Project as ProjectModel
+
+# Modpack fields stored in the modpack table
+MODPACK_FIELDS = ("title", "description", "build_date", "build_version", "mc_version",
+                  "mod_loader", "loader_version", "overrides", "client_side", "server_side")
+# Columns mods can be sorted on, prefix with '-' for descending order
+MOD_SORT_COLUMNS = {
+    "title": ModModel.title,
+    "project_id": ModModel.project_id,
+    "version_number": ModModel.version_number,
+    "date_published": ModModel.date_published
+}
+
+def enable_sqlite_wal(engine: Engine) -> None:
+    """Switches every new SQLite connection of the engine to WAL mode."""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+def upgrade_schema(engine: Engine) -> List[str]:
+    """
+    Creates missing tables and brings the tables of an older database up to the models.
+
+    create_all never alters existing tables, so columns the models gained are added with ALTER TABLE
+    and their indexes created. Added columns are nullable with the model's default, as SQLite cannot
+    add NOT NULL columns without one.
+
+    Args:
+        engine (Engine): The engine of the database.
+
+    Returns:
+        List[str]: The added columns, as table.column.
+    """
+    db.metadata.create_all(engine)
+    added = []
+    with engine.begin() as connection:
+        inspector = inspect(connection)
+        for table in db.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                statement = f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column.type.compile(engine.dialect)}'
+                if column.default is not None and column.default.is_scalar:
+                    statement += f" DEFAULT {column.default.arg!r}"
+                connection.execute(text(statement))
+                added.append(f"{table.name}.{column.name}")
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+    return added
+
+
+class ProjectStorage:
+    """Stores projects in the SQLAlchemy models so mods can be listed and paged with SQL."""
+
+    @staticmethod
+    def save_project(project: Project) -> int:
+        """
+        Inserts or replaces a project, its modpack and all of its mods.
+
+        Args:
+            project (Project): The loaded project to store.
+
+        Returns:
+            int: The database ID of the stored modpack.
+        """
+        row = ProjectModel.query.filter_by(project_id=project.metadata["project_id"]).one_or_none()
+        modpack_values = {field: str(getattr(project.modpack, field)) for field in MODPACK_FIELDS}
+        if row is None:
+            modpack_row = ModpackModel(**modpack_values)
+            row = ProjectModel(project_id=project.metadata["project_id"], modpack=modpack_row)
+            db.session.add(row)
+        else:
+            modpack_row = row.modpack
+            for field, value in modpack_values.items():
+                setattr(modpack_row, field, value)
+        row.filename = project.metadata.get("filename")
+        row.revision = (row.revision or 0) + 1
+        db.session.flush()
+
+        # Replace the mods with one bulk insert instead of diffing rows
+        db.session.query(ModModel).filter_by(modpack_id=modpack_row.id).delete(synchronize_session=False)
+        mods = [{
+            "title": m.title,
+            "description": m.description,
+            "name": m.name,
+            "changelog": m.changelog,
+            "version_number": m.version_number,
+            "dependencies": m.dependencies,
+            "mc_versions": m.mc_versions,
+            "version_type": m.version_type,
+            "mod_loaders": m.mod_loaders,
+            "mod_id": m.id,
+            "project_id": m.project_id,
+            "date_published": m.date_published,
+            "files": m.files,
+            "modpack_id": modpack_row.id
+        } for m in project.modpack.mod_data]
+        if mods:
+            db.session.execute(insert(ModModel), mods)
+        db.session.commit()
+        return modpack_row.id
+
+    @staticmethod
+    def load_project(project_id: str) -> Optional[Project]:
+        """
+        Builds a Project from the database.
+
+        Args:
+            project_id (str): The project's UUID.
+
+        Returns:
+            Optional[Project]: The project, or None if it is not stored.
+        """
+        row = ProjectModel.query.filter_by(project_id=project_id).one_or_none()
+        if row is None:
+            return None
+        mods = ModModel.query.filter_by(modpack_id=row.modpack_id).order_by(ModModel.project_id).all()
+        project = Project()
+        project.modpack = Modpack(
+            **{field: getattr(row.modpack, field) for field in MODPACK_FIELDS},
+            mod_data=[ProjectStorage.mod_to_json(m) for m in mods]
+        )
+        project.metadata.update({
+            "loaded": True,
+            "saved": True,
+            "filename": row.filename,
+            "project_id": row.project_id
+        })
+        return project
+
+    @staticmethod
+    def delete_project(project_id: str) -> bool:
+        """
+        Removes a project, its modpack and its mods.
+
+        Args:
+            project_id (str): The project's UUID.
+
+        Returns:
+            bool: True if the project existed, otherwise False.
+        """
+        row = ProjectModel.query.filter_by(project_id=project_id).one_or_none()
+        if row is None:
+            return False
+        db.session.query(ModModel).filter_by(modpack_id=row.modpack_id).delete(synchronize_session=False)
+        db.session.delete(row)
+        db.session.commit()
+        return True
+
+    @staticmethod
+    def has_project(project_id: str) -> bool:
+        """Checks if a project is stored in the database."""
+        return db.session.query(ProjectModel.id).filter_by(project_id=project_id).first() is not None
+
+    @staticmethod
+    def get_revision(project_id: str) -> Optional[int]:
+        """Returns the save counter of a stored project, or None if it is not stored."""
+        return db.session.query(ProjectModel.revision).filter_by(project_id=project_id).scalar()
+
+    @staticmethod
+    def list_projects() -> List[ProjectModel]:
+        """Returns all stored projects."""
+        return ProjectModel.query.order_by(ProjectModel.id).all()
+
+    @staticmethod
+    def list_project_summaries(project_ids: Optional[List[str]] = None) -> List[dict]:
+        """
+        Returns the stored projects with their modpack settings and mod count in a single query.
+
+        Args:
+            project_ids (Optional[List[str]]): Only return these projects, all projects if None.
+
+        Returns:
+            List[dict]: One summary dictionary per project.
+        """
+        mod_counts = (db.session.query(ModModel.modpack_id, func.count(ModModel.id).label("mods"))
+                      .group_by(ModModel.modpack_id).subquery())
+        rows = (db.session.query(ProjectModel, ModpackModel, func.coalesce(mod_counts.c.mods, 0))
+                .join(ModpackModel, ModpackModel.id == ProjectModel.modpack_id)
+                .outerjoin(mod_counts, mod_counts.c.modpack_id == ProjectModel.modpack_id))
+        if project_ids is not None:
+            rows = rows.filter(ProjectModel.project_id.in_(project_ids))
+        rows = rows.order_by(ProjectModel.id).all()
+        return [{
+            "project_id": project.project_id,
+            "filename": project.filename,
+            "revision": project.revision,
+            "title": modpack.title,
+            "description": modpack.description,
+            "mc_version": modpack.mc_version,
+            "mod_loader": modpack.mod_loader,
+            "build_version": modpack.build_version,
+            "mods": mods
+        } for project, modpack, mods in rows]
+
+    @staticmethod
+    def query_mods(project_id: str, query: Optional[str] = None, loader: Optional[str] = None,
+                   sort: str = "title", offset: int = 0, limit: int = 50) -> Tuple[List[ModModel], int]:
+        """
+        Filters, sorts and pages the mods of a stored project.
+
+        Args:
+            project_id (str): The project's UUID.
+            query (Optional[str]): Case-insensitive text matched against title and description.
+            loader (Optional[str]): Only return mods supporting this loader.
+            sort (str): Column from MOD_SORT_COLUMNS, prefixed with '-' for descending order.
+            offset (int): Number of mods to skip.
+            limit (int): Maximum number of mods to return.
+
+        Returns:
+            Tuple[List[ModModel], int]: The page of mods and the total number of matching mods.
+        """
+        statement = (ModModel.query
+                     .join(ProjectModel, ProjectModel.modpack_id == ModModel.modpack_id)
+                     .filter(ProjectModel.project_id == project_id))
+        if query:
+            pattern = f"%{query}%"
+            statement = statement.filter(or_(ModModel.title.ilike(pattern), ModModel.description.ilike(pattern)))
+        if loader:
+            # Loaders are stored as a JSON list, match the quoted name inside it
+            statement = statement.filter(cast(ModModel.mod_loaders, String).like(f'%"{loader}"%'))
+
+        column = MOD_SORT_COLUMNS.get(sort.lstrip("-"), ModModel.title)
+        order = column.desc() if sort.startswith("-") else column.asc()
+        total = statement.order_by(None).count()
+        mods = statement.order_by(order, ModModel.id).offset(offset).limit(limit).all()
+        return mods, total
+
+    @staticmethod
+    def mod_to_json(mod: ModModel) -> dict:
+        """Converts a mod row into the dictionary format of `mc_mp.modpack.mod.Mod`."""
+        return {
+            "title": mod.title,
+            "description": mod.description,
+            "name": mod.name,
+            "changelog": mod.changelog,
+            "version_number": mod.version_number,
+            "dependencies": mod.dependencies or [],
+            "mc_versions": mod.mc_versions or [],
+            "version_type": mod.version_type,
+            "mod_loaders": mod.mod_loaders or [],
+            "id": mod.mod_id,
+            "project_id": mod.project_id,
+            "date_published": mod.date_published,
+            "files": mod.files or []
+        }